@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark response serialization.
+
+Encodes realistic tool and resource payloads with the previous encoding
+(``json.dumps(indent=2)``, given a default hook so pandas timestamps encode)
+and with each serializer in ``mcp_server.serialization``, reporting the
+median time per response and the encoded size.
+
+Usage:
+    python3 benchmarks/serialization_benchmark.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Project root, so mcp_server can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server.resources import DocumentResource  # noqa: E402
+from mcp_server.serialization import SERIALIZERS, orjson, to_json_compatible  # noqa: E402
+from mcp_server.tools import DataAnalysisTool, KnowledgeBaseTool, get_sample_data  # noqa: E402
+
+
+def build_payloads():
+    """
+    Build the payloads to encode.
+
+    Returns:
+        List of (name, payload) pairs
+    """
+    records = get_sample_data().to_dict(orient="records")
+    return [
+        ("filter_data result", DataAnalysisTool.filter_data(
+            where={"column": "temperature", "operator": "gt", "value": 10}
+        )),
+        ("dataset records (365 rows)", {"records": records}),
+        ("summary statistics", DataAnalysisTool.get_summary_statistics()),
+        ("correlation matrix", DataAnalysisTool.get_correlation_matrix()),
+        ("document list", DocumentResource().list_documents()),
+        ("knowledge base search", KnowledgeBaseTool.search("framework")),
+    ]
+
+
+def build_encoders():
+    """
+    Build the encoders to compare.
+
+    Returns:
+        List of (name, function returning bytes) pairs
+    """
+    encoders = [(
+        "json indent=2 (previous)",
+        lambda value: json.dumps(value, indent=2, default=to_json_compatible).encode("utf-8")
+    )]
+    for name, serializer_class in SERIALIZERS.items():
+        if name == "orjson" and orjson is None:
+            continue
+        serializer = serializer_class()
+        encoders.append((f"{name} compact", serializer.dumpb))
+    return encoders
+
+
+def measure(encode, payload, repeat):
+    """
+    Time one encoder on one payload.
+
+    Args:
+        encode: Function encoding the payload to bytes
+        payload: Value to encode
+        repeat: Number of timed encodings
+
+    Returns:
+        (median seconds per encoding, encoded size in bytes)
+    """
+    encoded = encode(payload)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(payload)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(encoded)
+
+
+def main():
+    """Run the serialization benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Encodings timed per payload and encoder")
+    args = parser.parse_args()
+
+    encoders = build_encoders()
+    print(f"{'payload':<28} {'encoder':<26} {'time us':>10} {'bytes':>10}")
+    for payload_name, payload in build_payloads():
+        for encoder_name, encode in encoders:
+            seconds, size = measure(encode, payload, args.repeat)
+            print(f"{payload_name:<28} {encoder_name:<26} {seconds * 1e6:>10.1f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark MCP server cold start.
+
+Each scenario runs in a fresh interpreter, the way a spawn-per-session stdio
+client starts the server: import the server, build it, answer ListTools and
+serve one tool call. The "eager" scenario loads pandas and the sample dataset
+up front, as the server did before heavy dependencies were deferred.
+
+Usage:
+    python3 benchmarks/startup_benchmark.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Project root, so the child interpreters can import mcp_server
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = """
+import asyncio
+import json
+import logging
+import sys
+import time
+
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+if {eager!r}:
+    from mcp_server.tools import SAMPLE_DATA
+from mcp_server.server import MCPServer
+server = MCPServer()
+asyncio.run(server._handle_list_tools())
+ready = time.perf_counter()
+asyncio.run(server._handle_call_tool({tool!r}, {arguments!r}))
+done = time.perf_counter()
+print(json.dumps({{
+    "startup": ready - start,
+    "first_call": done - ready,
+    "pandas_loaded": "pandas" in sys.modules
+}}))
+"""
+
+SCENARIOS = [
+    ("knowledge base (lazy)", False, "knowledge_base_list_topics", {}),
+    ("document processing (lazy)", False, "document_processing_summarize", {"text": "MCP servers start fast."}),
+    ("data analysis (lazy)", False, "data_analysis_get_summary_statistics", {}),
+    ("knowledge base (eager)", True, "knowledge_base_list_topics", {}),
+]
+
+
+def run_scenario(eager, tool, arguments, runs):
+    """
+    Run one scenario in fresh interpreters.
+
+    Args:
+        eager: Whether to load pandas and the sample data before the server
+        tool: Tool to call after startup
+        arguments: Tool arguments
+        runs: Number of interpreters to start
+
+    Returns:
+        List of per-run measurements
+    """
+    script = CHILD_SCRIPT.format(eager=eager, tool=tool, arguments=arguments)
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters started per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<30} {'startup ms':>12} {'first call ms':>14} {'pandas loaded':>14}")
+    for name, eager, tool, arguments in SCENARIOS:
+        results = run_scenario(eager, tool, arguments, args.runs)
+        startup = statistics.median(r["startup"] for r in results) * 1000
+        first_call = statistics.median(r["first_call"] for r in results) * 1000
+        pandas_loaded = all(r["pandas_loaded"] for r in results)
+        print(f"{name:<30} {startup:>12.1f} {first_call:>14.1f} {str(pandas_loaded):>14}")
+
+
+if __name__ == "__main__":
+    main()
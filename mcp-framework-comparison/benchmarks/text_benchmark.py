@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the document processing tools.
+
+Runs each document processing tool on the built-in document collection
+repeated to several input sizes, reporting the median time per call.
+
+Usage:
+    python3 benchmarks/text_benchmark.py [--repeat N] [--sizes 0.01,0.1,1]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Project root, so mcp_server can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_server.resources import DOCUMENTS  # noqa: E402
+from mcp_server.tools import DocumentProcessingTool  # noqa: E402
+
+
+def build_text(megabytes):
+    """
+    Build an input text of about the given size from the built-in documents.
+
+    Args:
+        megabytes: Size of the text in megabytes
+
+    Returns:
+        The text
+    """
+    corpus = "\n\n".join(document["content"] for document in DOCUMENTS.values())
+    size = int(megabytes * 1_000_000)
+    return (corpus * (size // len(corpus) + 1))[:size]
+
+
+def build_calls():
+    """
+    Build the tool calls to time.
+
+    Returns:
+        List of (name, function of the text) pairs
+    """
+    return [
+        ("extract_keywords", lambda text: DocumentProcessingTool.extract_keywords(text, max_keywords=10)),
+        ("extract_keywords tfidf", lambda text: DocumentProcessingTool.extract_keywords(
+            text, max_keywords=10, mode="tfidf"
+        )),
+        ("extract_entities", DocumentProcessingTool.extract_entities),
+        ("summarize", lambda text: DocumentProcessingTool.summarize(text, max_length=100)),
+    ]
+
+
+def measure(call, text, repeat):
+    """
+    Time one call on one text.
+
+    Args:
+        call: Function of the text
+        text: Input text
+        repeat: Number of timed calls
+
+    Returns:
+        Median seconds per call
+    """
+    call(text)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call(text)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    """Run the text processing benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Calls timed per tool and size")
+    parser.add_argument("--sizes", default="0.01,0.1,1", help="Comma-separated input sizes in megabytes")
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.sizes.split(",")]
+    print(f"{'tool':<28} {'input MB':>10} {'time ms':>10}")
+    for call_name, call in build_calls():
+        for size in sizes:
+            seconds = measure(call, build_text(size), args.repeat)
+            print(f"{call_name:<28} {size:>10g} {seconds * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
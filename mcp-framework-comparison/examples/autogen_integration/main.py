@@ -219,6 +219,8 @@ class UserProxyAgent(ConversableAgent):
 # Add parent directory to path to import mcp_client
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from mcp_client import MCPClient  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -227,90 +229,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class MCPClient:
-    """Simple MCP client for demonstration purposes."""
-    
-    def __init__(self, server_url: str = "http://localhost:8000"):
-        """Initialize the MCP client."""
-        self.server_url = server_url
-    
-    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Call an MCP tool.
-        
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Arguments to pass to the tool
-            
-        Returns:
-            Tool response
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
-        
-        # Simulate calling the MCP server
-        if tool_name == "knowledge_base_get_info":
-            from mcp_server.tools import KnowledgeBaseTool
-            return KnowledgeBaseTool.get_info(
-                topic=arguments.get("topic"),
-                subtopic=arguments.get("subtopic")
-            )
-        elif tool_name == "knowledge_base_search":
-            from mcp_server.tools import KnowledgeBaseTool
-            return KnowledgeBaseTool.search(
-                query=arguments.get("query")
-            )
-        elif tool_name == "data_analysis_get_summary_statistics":
-            from mcp_server.tools import DataAnalysisTool
-            return DataAnalysisTool.get_summary_statistics(
-                column=arguments.get("column")
-            )
-        elif tool_name == "data_analysis_filter_data":
-            from mcp_server.tools import DataAnalysisTool
-            return DataAnalysisTool.filter_data(
-                column=arguments.get("column"),
-                operator=arguments.get("operator"),
-                value=arguments.get("value")
-            )
-        elif tool_name == "document_processing_summarize":
-            from mcp_server.tools import DocumentProcessingTool
-            return DocumentProcessingTool.summarize(
-                text=arguments.get("text"),
-                max_length=arguments.get("max_length", 100)
-            )
-        else:
-            raise ValueError(f"Unknown tool: {tool_name}")
-    
-    def get_resource(self, uri: str) -> Dict[str, Any]:
-        """
-        Get an MCP resource.
-        
-        Args:
-            uri: URI of the resource to get
-            
-        Returns:
-            Resource content
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Getting MCP resource: {uri}")
-        
-        # Simulate getting the resource
-        if uri.startswith("mcp://documents/"):
-            from mcp_server.resources import DocumentResource
-            document_id = uri[len("mcp://documents/"):]
-            return DocumentResource.get_document(document_id)
-        elif uri.startswith("mcp://web-search/"):
-            from mcp_server.resources import WebSearchResource
-            query = uri[len("mcp://web-search/"):]
-            return WebSearchResource.search(query)
-        else:
-            raise ValueError(f"Unknown resource URI: {uri}")
-
-
 def mcp_knowledge_base(client: MCPClient, query: str = "", topic: str = "", subtopic: str = "") -> str:
     """
     Access the MCP knowledge base.
@@ -617,6 +535,9 @@ def run_autogen_example():
         role = message["role"]
         content = message["content"]
         print(f"{role.capitalize()}: {content}")
+    
+    # Close the session, stopping the server it started
+    client.close()
 
 
 if __name__ == "__main__":
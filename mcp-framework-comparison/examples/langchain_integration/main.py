@@ -23,6 +23,8 @@ from langchain_core.tools import Tool, BaseTool
 # Add parent directory to path to import mcp_client
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from mcp_client import MCPClient  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,83 +33,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class MCPClient:
-    """Simple MCP client for demonstration purposes."""
-    
-    def __init__(self, server_url: str = "http://localhost:8000"):
-        """Initialize the MCP client."""
-        self.server_url = server_url
-    
-    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Call an MCP tool.
-        
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Arguments to pass to the tool
-            
-        Returns:
-            Tool response
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
-        
-        # Simulate calling the MCP server
-        if tool_name == "knowledge_base_get_info":
-            from mcp_server.tools import KnowledgeBaseTool
-            return KnowledgeBaseTool.get_info(
-                topic=arguments.get("topic"),
-                subtopic=arguments.get("subtopic")
-            )
-        elif tool_name == "knowledge_base_search":
-            from mcp_server.tools import KnowledgeBaseTool
-            return KnowledgeBaseTool.search(
-                query=arguments.get("query")
-            )
-        elif tool_name == "data_analysis_get_summary_statistics":
-            from mcp_server.tools import DataAnalysisTool
-            return DataAnalysisTool.get_summary_statistics(
-                column=arguments.get("column")
-            )
-        elif tool_name == "document_processing_summarize":
-            from mcp_server.tools import DocumentProcessingTool
-            return DocumentProcessingTool.summarize(
-                text=arguments.get("text"),
-                max_length=arguments.get("max_length", 100)
-            )
-        else:
-            raise ValueError(f"Unknown tool: {tool_name}")
-    
-    def get_resource(self, uri: str) -> Dict[str, Any]:
-        """
-        Get an MCP resource.
-        
-        Args:
-            uri: URI of the resource to get
-            
-        Returns:
-            Resource content
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Getting MCP resource: {uri}")
-        
-        # Simulate getting the resource
-        if uri.startswith("mcp://documents/"):
-            from mcp_server.resources import DocumentResource
-            document_id = uri[len("mcp://documents/"):]
-            return DocumentResource.get_document(document_id)
-        elif uri.startswith("mcp://web-search/"):
-            from mcp_server.resources import WebSearchResource
-            query = uri[len("mcp://web-search/"):]
-            return WebSearchResource.search(query)
-        else:
-            raise ValueError(f"Unknown resource URI: {uri}")
-
-
 def create_mcp_knowledge_tool(client: MCPClient) -> Tool:
     """Create a LangChain tool for accessing MCP knowledge base."""
     
@@ -174,11 +99,9 @@ def create_mcp_document_tool(client: MCPClient) -> Tool:
             result = client.get_resource(uri)
             
             if "content" in result and isinstance(result["content"], str):
-                summary = client.call_tool(
-                    "document_processing_summarize",
-                    {"text": result["content"]}
-                )
-                result["summary"] = summary
+                # The summary is computed once by the server, not per request
+                derivatives = client.get_resource(f"mcp://documents/{input_str}/derivatives")
+                result["summary"] = {"summary": derivatives.get("summary", "")}
         
         return json.dumps(result, indent=2)
     
@@ -363,6 +286,9 @@ def run_mcp_examples():
         print(f"\nQuery: {query}")
         response = chain.run(input=query)
         print(f"Response:\n{response}")
+    
+    # Close the session, stopping the server it started
+    client.close()
 
 
 if __name__ == "__main__":
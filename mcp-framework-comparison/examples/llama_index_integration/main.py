@@ -21,6 +21,8 @@ from llama_index.core.response_synthesizers import ResponseMode
 # Add parent directory to path to import mcp_client
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from mcp_client import MCPClient  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,94 +31,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class MCPClient:
-    """Simple MCP client for demonstration purposes."""
-    
-    def __init__(self, server_url: str = "http://localhost:8000"):
-        """Initialize the MCP client."""
-        self.server_url = server_url
-    
-    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Call an MCP tool.
-        
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Arguments to pass to the tool
-            
-        Returns:
-            Tool response
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
-        
-        # Import tools here to ensure they're loaded after server initialization
-        from mcp_server.tools import KnowledgeBaseTool, DocumentProcessingTool
-        
-        logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
-        
-        try:
-            if tool_name == "knowledge_base_get_info":
-                return KnowledgeBaseTool().get_info(
-                    topic=arguments.get("topic"),
-                    subtopic=arguments.get("subtopic")
-                )
-            elif tool_name == "knowledge_base_search":
-                return KnowledgeBaseTool().search(
-                    query=arguments.get("query")
-                )
-            elif tool_name == "document_processing_summarize":
-                return DocumentProcessingTool().summarize(
-                    text=arguments.get("text"),
-                    max_length=arguments.get("max_length", 100)
-                )
-            else:
-                raise ValueError(f"Unknown tool: {tool_name}")
-        except Exception as e:
-            logger.error(f"Error calling tool {tool_name}: {str(e)}")
-            return {"error": str(e)}
-    
-    def get_resource(self, uri: str) -> Dict[str, Any]:
-        """
-        Get an MCP resource.
-        
-        Args:
-            uri: URI of the resource to get
-            
-        Returns:
-            Resource content
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Getting MCP resource: {uri}")
-        
-        # Import resources here to ensure they're loaded after server initialization
-        from mcp_server.resources import DocumentResource, WebSearchResource
-        
-        logger.info(f"Getting MCP resource: {uri}")
-        
-        try:
-            if uri == "mcp://documents/list":
-                return DocumentResource().list_documents()
-            elif uri.startswith("mcp://documents/search/"):
-                query = uri[len("mcp://documents/search/"):]
-                return DocumentResource().search_documents(query)
-            elif uri.startswith("mcp://documents/"):
-                document_id = uri[len("mcp://documents/"):]
-                return DocumentResource().get_document(document_id)
-            elif uri.startswith("mcp://web-search/"):
-                query = uri[len("mcp://web-search/"):]
-                return WebSearchResource().search(query)
-            else:
-                raise ValueError(f"Unknown resource URI: {uri}")
-        except Exception as e:
-            logger.error(f"Error getting resource {uri}: {str(e)}")
-            return {"error": str(e)}
-
-
 class MCPRetriever(BaseRetriever):
     """LlamaIndex retriever that uses MCP for retrieval."""
     
@@ -230,10 +144,11 @@ class MCPDocumentRetriever(BaseRetriever):
         search_results = self.client.get_resource(f"mcp://documents/search/{search_query}")
         nodes = []
         
-        # Process search results
-        if "results" in search_results:
+        # Process search results, fetching all hits in one round trip
+        if search_results.get("results"):
+            docs = self._get_documents([result["id"] for result in search_results["results"]])
             for result in search_results["results"]:
-                doc = self.client.get_resource(f"mcp://documents/{result['id']}")
+                doc = docs.get(result["id"], {})
                 if "content" in doc:
                     node = TextNode(
                         text=doc["content"],
@@ -253,9 +168,10 @@ class MCPDocumentRetriever(BaseRetriever):
         # If no search results, try getting all documents and filtering
         if not nodes:
             docs = self.client.get_resource("mcp://documents/list")
-            if "documents" in docs:
+            if docs.get("documents"):
+                full_docs = self._get_documents([doc_info["id"] for doc_info in docs["documents"]])
                 for doc_info in docs["documents"]:
-                    doc = self.client.get_resource(f"mcp://documents/{doc_info['id']}")
+                    doc = full_docs.get(doc_info["id"], {})
                     if "content" in doc:
                         # Check if this document is relevant to the query
                         query_terms = search_query.lower().split()
@@ -285,6 +201,19 @@ class MCPDocumentRetriever(BaseRetriever):
                             )
                             nodes.append(NodeWithScore(node=node, score=score))
         return nodes
+    
+    def _get_documents(self, document_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch several documents in one request.
+        
+        Args:
+            document_ids: IDs of the documents
+            
+        Returns:
+            Mapping from document ID to document
+        """
+        batch = self.client.get_resource(f"mcp://documents/batch/{','.join(document_ids)}")
+        return {doc["id"]: doc for doc in batch.get("documents", [])}
 
 
 def run_llama_index_example():
@@ -351,18 +280,19 @@ def run_llama_index_example():
     
     # Create documents
     documents = []
-    if "documents" in documents_resource:
-        for doc_info in documents_resource["documents"]:
-            # Get the full document
-            doc = client.get_resource(f"mcp://documents/{doc_info['id']}")
-            
+    if documents_resource.get("documents"):
+        # Get the full documents in one request
+        document_ids = ",".join(doc_info["id"] for doc_info in documents_resource["documents"])
+        full_documents = client.get_resource(f"mcp://documents/batch/{document_ids}")
+        
+        for doc in full_documents.get("documents", []):
             if "content" in doc:
                 # Create a Document object
                 document = Document(
                     text=doc["content"],
                     metadata={
                         "title": doc.get("title", ""),
-                        "id": doc_info["id"]
+                        "id": doc["id"]
                     }
                 )
                 documents.append(document)
@@ -377,6 +307,9 @@ def run_llama_index_example():
         print(f"Document {i+1}: {doc.metadata.get('title', 'Untitled')}")
         print(f"Content preview: {doc.text[:100]}...")
         print()
+    
+    # Close the session, stopping the server it started
+    client.close()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ import json
 import logging
 import os
 import sys
-from typing import Any, Dict, List, Optional, Callable
+from typing import List, Callable
 
 # Note: This is a simulated implementation of SmolaGents for demonstration purposes
 # In a real implementation, you would import from the actual smolagents package
@@ -114,6 +114,8 @@ class Agent:
 # Add parent directory to path to import mcp_client
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from mcp_client import MCPClient  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -122,88 +124,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class MCPClient:
-    """Simple MCP client for demonstration purposes."""
-    
-    def __init__(self, server_url: str = "http://localhost:8000"):
-        """Initialize the MCP client."""
-        self.server_url = server_url
-    
-    def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Call an MCP tool.
-        
-        Args:
-            tool_name: Name of the tool to call
-            arguments: Arguments to pass to the tool
-            
-        Returns:
-            Tool response
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
-        
-        # Simulate calling the MCP server
-        if tool_name == "knowledge_base_get_info":
-            from mcp_server.tools import KnowledgeBaseTool
-            return KnowledgeBaseTool.get_info(
-                topic=arguments.get("topic"),
-                subtopic=arguments.get("subtopic")
-            )
-        elif tool_name == "knowledge_base_search":
-            from mcp_server.tools import KnowledgeBaseTool
-            return KnowledgeBaseTool.search(
-                query=arguments.get("query")
-            )
-        elif tool_name == "data_analysis_get_summary_statistics":
-            from mcp_server.tools import DataAnalysisTool
-            return DataAnalysisTool.get_summary_statistics(
-                column=arguments.get("column")
-            )
-        elif tool_name == "document_processing_summarize":
-            from mcp_server.tools import DocumentProcessingTool
-            return DocumentProcessingTool.summarize(
-                text=arguments.get("text"),
-                max_length=arguments.get("max_length", 100)
-            )
-        elif tool_name == "document_processing_extract_entities":
-            from mcp_server.tools import DocumentProcessingTool
-            return DocumentProcessingTool.extract_entities(
-                text=arguments.get("text")
-            )
-        else:
-            raise ValueError(f"Unknown tool: {tool_name}")
-    
-    def get_resource(self, uri: str) -> Dict[str, Any]:
-        """
-        Get an MCP resource.
-        
-        Args:
-            uri: URI of the resource to get
-            
-        Returns:
-            Resource content
-        """
-        # In a real implementation, this would use the MCP protocol
-        # For demonstration, we'll simulate the response
-        
-        logger.info(f"Getting MCP resource: {uri}")
-        
-        # Simulate getting the resource
-        if uri.startswith("mcp://documents/"):
-            from mcp_server.resources import DocumentResource
-            document_id = uri[len("mcp://documents/"):]
-            return DocumentResource.get_document(document_id)
-        elif uri.startswith("mcp://web-search/"):
-            from mcp_server.resources import WebSearchResource
-            query = uri[len("mcp://web-search/"):]
-            return WebSearchResource.search(query)
-        else:
-            raise ValueError(f"Unknown resource URI: {uri}")
-
-
 def create_mcp_knowledge_tool(client: MCPClient) -> Tool:
     """
     Create a SmolaGents tool for accessing the MCP knowledge base.
@@ -362,15 +282,10 @@ def create_mcp_document_tool(client: MCPClient) -> Tool:
             # Extract document ID
             for doc_id in ["mcp_overview", "llama_index_guide", "langchain_guide", "smolagents_guide", "autogen_guide"]:
                 if doc_id in query_lower:
-                    # Get the document
-                    document = client.get_resource(f"mcp://documents/{doc_id}")
-                    
-                    # Summarize the content
-                    if "content" in document:
-                        result = client.call_tool("document_processing_summarize", {
-                            "text": document["content"]
-                        })
-                        return json.dumps(result, indent=2)
+                    # The summary is computed once by the server, not per request
+                    derivatives = client.get_resource(f"mcp://documents/{doc_id}/derivatives")
+                    if "summary" in derivatives:
+                        return json.dumps({"summary": derivatives["summary"]}, indent=2)
             
             # If no specific document ID found, return an error
             return json.dumps({"error": "Please specify a valid document ID"}, indent=2)
@@ -379,15 +294,10 @@ def create_mcp_document_tool(client: MCPClient) -> Tool:
             # Extract document ID
             for doc_id in ["mcp_overview", "llama_index_guide", "langchain_guide", "smolagents_guide", "autogen_guide"]:
                 if doc_id in query_lower:
-                    # Get the document
-                    document = client.get_resource(f"mcp://documents/{doc_id}")
-                    
-                    # Extract entities from the content
-                    if "content" in document:
-                        result = client.call_tool("document_processing_extract_entities", {
-                            "text": document["content"]
-                        })
-                        return json.dumps(result, indent=2)
+                    # The entities are extracted once by the server, not per request
+                    derivatives = client.get_resource(f"mcp://documents/{doc_id}/derivatives")
+                    if "entities" in derivatives:
+                        return json.dumps(derivatives["entities"], indent=2)
             
             # If no specific document ID found, return an error
             return json.dumps({"error": "Please specify a valid document ID"}, indent=2)
@@ -494,33 +404,37 @@ def run_smolagents_example():
     
     # Create a chain tool that combines knowledge base and document search
     def chain_tools_fn(query: str) -> str:
-        """Chain knowledge base and document search."""
+        """Chain knowledge base and document search in one server-side pipeline."""
         query_lower = query.lower()
         
-        # Get knowledge base info
+        # Knowledge base info and the document list (with the summaries the
+        # server precomputed) are independent, so the server runs them
+        # concurrently and both come back in a single round trip
         if "mcp" in query_lower:
-            knowledge_result = json.loads(knowledge_tool("Tell me about MCP"))
+            knowledge_step = {"id": "knowledge", "tool": "knowledge_base_get_info", "arguments": {"topic": "mcp"}}
         else:
-            knowledge_result = json.loads(knowledge_tool(query))
-        
-        # Get relevant documents
-        doc_list = json.loads(document_tool(""))  # Empty query lists all documents
-        if isinstance(doc_list, dict) and "documents" in doc_list:
-            # Filter documents by relevance to query
-            relevant_docs = []
-            query_terms = query_lower.split()
-            for doc in doc_list["documents"]:
-                if any(term in doc["title"].lower() for term in query_terms):
-                    # Get document summary
-                    summary_result = json.loads(document_tool(f"summarize document {doc['id']}"))
-                    if isinstance(summary_result, dict) and "summary" in summary_result:
-                        relevant_docs.append({
-                            "title": doc["title"],
-                            "summary": summary_result["summary"]
-                        })
-            doc_result = {"documents": relevant_docs}
-        else:
-            doc_result = {"documents": []}
+            knowledge_step = {"id": "knowledge", "tool": "knowledge_base_search", "arguments": {"query": query}}
+        pipeline = client.call_tool("execute_pipeline", {
+            "steps": [
+                knowledge_step,
+                {"id": "documents", "resource": "mcp://documents/list?fields=title,summary"}
+            ]
+        })
+        if "error" in pipeline:
+            return json.dumps(pipeline, indent=2)
+        knowledge_result = pipeline["results"]["knowledge"]
+        doc_list = pipeline["results"]["documents"]
+        
+        # Filter documents by relevance to query
+        relevant_docs = []
+        query_terms = query_lower.split()
+        for doc in doc_list.get("documents", []):
+            if any(term in doc["title"].lower() for term in query_terms):
+                relevant_docs.append({
+                    "title": doc["title"],
+                    "summary": doc["summary"]
+                })
+        doc_result = {"documents": relevant_docs}
         
         return json.dumps({
             "knowledge": knowledge_result,
@@ -541,6 +455,9 @@ def run_smolagents_example():
     print(f"\nQuery: {query}")
     response = chain_agent.run(query)
     print(f"Response:\n{response}")
+    
+    # Close the session, stopping the server it started
+    client.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,15 @@
+"""
+MCP client package for framework comparison.
+
+This package provides the client the framework integrations use to talk to
+the MCP server: ``AsyncMCPClient`` for asyncio code and ``MCPClient``, a
+synchronous facade over it, both holding one reused session over stdio or
+streamable HTTP.
+"""
+
+from mcp_client.client import AsyncMCPClient
+from mcp_client.sync import MCPClient
+
+__version__ = "0.1.0"
+
+__all__ = ["AsyncMCPClient", "MCPClient"]
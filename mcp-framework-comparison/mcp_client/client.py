@@ -0,0 +1,262 @@
+"""
+Asynchronous MCP client.
+
+``AsyncMCPClient`` opens one MCP session, over stdio (spawning the bundled
+server) or streamable HTTP, and reuses it for every call until it is closed.
+Calls made concurrently share the session: each is a JSON-RPC request
+matched to its response by id, so they are pipelined over the connection
+instead of waiting for one another, up to ``max_in_flight`` at once.
+
+Tool results and JSON resources are decoded to Python values. Failures the
+server reports as text come back as ``{"error": ...}``, like the errors the
+tools return themselves.
+"""
+
+import json
+import logging
+import os
+import sys
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.types import CallToolResult, ReadResourceResult, Tool
+
+logger = logging.getLogger(__name__)
+
+# Environment variable with the URL of an HTTP server to connect to; when
+# unset, clients spawn the bundled server and talk to it over stdio
+SERVER_URL_ENV = "MCP_SERVER_URL"
+
+# Script started for stdio sessions
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run_server.py")
+
+# Endpoint of the server's HTTP transport, used when a URL has no path
+MCP_PATH = "/mcp"
+
+# Requests of one client outstanding at once, matching the server's default
+# per-session limit
+DEFAULT_MAX_IN_FLIGHT = 16
+
+# Seconds to wait for a response
+DEFAULT_TIMEOUT = 60.0
+
+# Prefix of the text the server answers a failed tool call with
+ERROR_PREFIX = "Error: "
+
+
+def _open_http(url: str) -> Any:
+    """Open the streamable HTTP transport with the API of the installed SDK."""
+    from mcp.client import streamable_http
+
+    if hasattr(streamable_http, "streamable_http_client"):
+        return streamable_http.streamable_http_client(url)
+    return streamable_http.streamablehttp_client(url)
+
+
+def decode_tool_result(result: CallToolResult) -> Any:
+    """
+    Decode the result of a tool call.
+
+    Args:
+        result: Result returned by the server
+
+    Returns:
+        The decoded JSON value; ``{"error": ...}`` for a failed call
+    """
+    text = "".join(getattr(content, "text", "") for content in result.content)
+    if result.isError:
+        return {"error": text}
+    try:
+        return json.loads(text)
+    except ValueError:
+        # Unknown tools and handler failures are reported as plain text
+        return {"error": text[len(ERROR_PREFIX):] if text.startswith(ERROR_PREFIX) else text}
+
+
+def decode_resource(result: ReadResourceResult) -> Any:
+    """
+    Decode the first contents of a resource.
+
+    Args:
+        result: Result returned by the server
+
+    Returns:
+        The decoded JSON value for JSON resources, the text otherwise;
+        ``{"error": ...}`` for unknown URIs and read failures
+    """
+    if not result.contents:
+        return None
+    contents = result.contents[0]
+    text = getattr(contents, "text", None)
+    if text is None:
+        return contents.blob
+    if contents.mimeType == "application/json":
+        return json.loads(text)
+    if contents.mimeType == "text/plain":
+        return {"error": text}
+    return text
+
+
+class AsyncMCPClient:
+    """MCP client holding one session open for many concurrent calls."""
+
+    def __init__(
+        self,
+        server_url: Optional[str] = None,
+        command: Optional[Sequence[str]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        """
+        Initialize the client; the session opens on ``async with``.
+
+        Args:
+            server_url: URL of an HTTP server (``http://localhost:8000`` is
+                served at ``/mcp``); defaults to ``MCP_SERVER_URL``, and to a
+                stdio session with a spawned server if that is unset
+            command: Command starting the server for stdio sessions; defaults
+                to the bundled server run with the current interpreter
+            max_in_flight: Maximum number of requests outstanding at once
+            timeout: Seconds to wait for each response
+        """
+        server_url = server_url or os.environ.get(SERVER_URL_ENV)
+        if server_url and not urlsplit(server_url).path.strip("/"):
+            server_url = server_url.rstrip("/") + MCP_PATH
+        self.server_url = server_url
+        self.command = list(command or [sys.executable, SERVER_SCRIPT])
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+
+        self.tools: Dict[str, Tool] = {}
+        self._session: Optional[ClientSession] = None
+        self._stack: Optional[AsyncExitStack] = None
+        self._limit: Optional[anyio.Semaphore] = None
+
+    @property
+    def transport(self) -> str:
+        """Transport of the session: "http" or "stdio"."""
+        return "http" if self.server_url else "stdio"
+
+    async def __aenter__(self) -> "AsyncMCPClient":
+        """Open the session and list the server's tools."""
+        stack = AsyncExitStack()
+        await stack.__aenter__()
+        try:
+            if self.server_url:
+                read_stream, write_stream, *_ = await stack.enter_async_context(_open_http(self.server_url))
+            else:
+                # The server inherits the environment, so MCP_* settings apply
+                parameters = StdioServerParameters(
+                    command=self.command[0],
+                    args=self.command[1:],
+                    env=dict(os.environ)
+                )
+                read_stream, write_stream = await stack.enter_async_context(stdio_client(parameters))
+
+            session = await stack.enter_async_context(
+                ClientSession(read_stream, write_stream, read_timeout_seconds=timedelta(seconds=self.timeout))
+            )
+            await session.initialize()
+            self.tools = {tool.name: tool for tool in (await session.list_tools()).tools}
+        except BaseException:
+            await stack.aclose()
+            raise
+
+        logger.info(f"Connected to MCP server over {self.transport} ({len(self.tools)} tools)")
+        self._stack = stack
+        self._session = session
+        self._limit = anyio.Semaphore(self.max_in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info) -> Optional[bool]:
+        """Close the session (and stop a spawned server)."""
+        stack, self._stack, self._session = self._stack, None, None
+        if stack is not None:
+            return await stack.__aexit__(*exc_info)
+        return None
+
+    def _active_session(self) -> ClientSession:
+        """Return the open session."""
+        if self._session is None:
+            raise RuntimeError("The client is not connected; use it as 'async with AsyncMCPClient() as client'")
+        return self._session
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call an MCP tool.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+
+        Returns:
+            The decoded tool response
+        """
+        session = self._active_session()
+        logger.debug(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
+        async with self._limit:
+            result = await session.call_tool(tool_name, arguments or {})
+        return decode_tool_result(result)
+
+    async def get_resource(self, uri: str) -> Any:
+        """
+        Read an MCP resource.
+
+        Args:
+            uri: URI of the resource to read
+
+        Returns:
+            The decoded resource content
+        """
+        session = self._active_session()
+        logger.debug(f"Getting MCP resource: {uri}")
+        async with self._limit:
+            result = await session.read_resource(uri)
+        return decode_resource(result)
+
+    async def call_tools(self, calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """
+        Make several tool calls concurrently over the session.
+
+        Args:
+            calls: (tool name, arguments) pairs
+
+        Returns:
+            The decoded responses, in the order of the calls
+        """
+        calls = list(calls)
+        results: List[Any] = [None] * len(calls)
+
+        async def call(index: int, tool_name: str, arguments: Optional[Dict[str, Any]]) -> None:
+            results[index] = await self.call_tool(tool_name, arguments)
+
+        async with anyio.create_task_group() as tg:
+            for index, (tool_name, arguments) in enumerate(calls):
+                tg.start_soon(call, index, tool_name, arguments)
+        return results
+
+    async def get_resources(self, uris: Iterable[str]) -> List[Any]:
+        """
+        Read several MCP resources concurrently over the session.
+
+        Args:
+            uris: URIs of the resources
+
+        Returns:
+            The decoded resource contents, in the order of the URIs
+        """
+        uris = list(uris)
+        results: List[Any] = [None] * len(uris)
+
+        async def read(index: int, uri: str) -> None:
+            results[index] = await self.get_resource(uri)
+
+        async with anyio.create_task_group() as tg:
+            for index, uri in enumerate(uris):
+                tg.start_soon(read, index, uri)
+        return results
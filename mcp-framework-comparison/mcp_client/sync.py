@@ -0,0 +1,174 @@
+"""
+Synchronous facade over the asynchronous MCP client.
+
+Framework integrations call tools from synchronous code. ``MCPClient`` runs
+an ``AsyncMCPClient`` on an event loop in a background thread: the session
+opens on the first call and stays open, owned by one task on that loop,
+until ``close``. Calls from any thread are submitted to the loop, so calls
+made from several threads at once are pipelined over the same session.
+
+The loop thread is a daemon thread, so a client that is never closed does
+not keep the interpreter alive; a spawned stdio server exits when its input
+closes with the process.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mcp_client.client import DEFAULT_MAX_IN_FLIGHT, DEFAULT_TIMEOUT, AsyncMCPClient
+
+logger = logging.getLogger(__name__)
+
+
+class MCPClient:
+    """Blocking MCP client reusing one session for every call."""
+
+    def __init__(
+        self,
+        server_url: Optional[str] = None,
+        command: Optional[Sequence[str]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        timeout: float = DEFAULT_TIMEOUT
+    ):
+        """
+        Initialize the client; the session opens on the first call.
+
+        Args:
+            server_url: URL of an HTTP server; defaults to ``MCP_SERVER_URL``,
+                and to a stdio session with a spawned server if that is unset
+            command: Command starting the server for stdio sessions
+            max_in_flight: Maximum number of requests outstanding at once
+            timeout: Seconds to wait for each response
+        """
+        self.client = AsyncMCPClient(server_url, command, max_in_flight=max_in_flight, timeout=timeout)
+        self.server_url = self.client.server_url
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session_task: Optional[concurrent.futures.Future] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def __enter__(self) -> "MCPClient":
+        self.connect()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        """Open the session, unless it is already open."""
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="mcp-client", daemon=True)
+            thread.start()
+            connected: concurrent.futures.Future = concurrent.futures.Future()
+
+            async def hold_session() -> None:
+                # The session's task groups must be entered and exited by the
+                # same task, so one task owns it for its whole lifetime
+                self._stop = asyncio.Event()
+                try:
+                    async with self.client:
+                        connected.set_result(None)
+                        await self._stop.wait()
+                except BaseException as e:
+                    if connected.done():
+                        raise
+                    connected.set_exception(e)
+
+            session_task = asyncio.run_coroutine_threadsafe(hold_session(), loop)
+            try:
+                connected.result()
+            except BaseException:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+
+            self._loop, self._thread, self._session_task = loop, thread, session_task
+
+    def close(self) -> None:
+        """Close the session and stop the loop thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+
+            loop.call_soon_threadsafe(self._stop.set)
+            try:
+                self._session_task.result()
+            except Exception:
+                logger.exception("Error closing the MCP session")
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                self._thread.join()
+                loop.close()
+
+    def _run(self, coroutine: Awaitable[Any]) -> Any:
+        """Run a coroutine of the async client on the loop thread."""
+        self.connect()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    @property
+    def tools(self) -> List[str]:
+        """Names of the tools the server offers."""
+        self.connect()
+        return list(self.client.tools)
+
+    def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call an MCP tool.
+
+        Args:
+            tool_name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+
+        Returns:
+            The decoded tool response
+        """
+        logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
+        return self._run(self.client.call_tool(tool_name, arguments))
+
+    def get_resource(self, uri: str) -> Any:
+        """
+        Get an MCP resource.
+
+        Args:
+            uri: URI of the resource to get
+
+        Returns:
+            The decoded resource content
+        """
+        logger.info(f"Getting MCP resource: {uri}")
+        return self._run(self.client.get_resource(uri))
+
+    def call_tools(self, calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """
+        Make several tool calls concurrently in one blocking call.
+
+        Args:
+            calls: (tool name, arguments) pairs
+
+        Returns:
+            The decoded responses, in the order of the calls
+        """
+        return self._run(self.client.call_tools(calls))
+
+    def get_resources(self, uris: Iterable[str]) -> List[Any]:
+        """
+        Get several MCP resources concurrently in one blocking call.
+
+        Args:
+            uris: URIs of the resources
+
+        Returns:
+            The decoded resource contents, in the order of the URIs
+        """
+        return self._run(self.client.get_resources(uris))
@@ -0,0 +1,216 @@
+"""
+Response cache for idempotent tool calls.
+
+Tools declared with a ``cache_ttl`` are pure functions of their arguments and
+of a data version. Their encoded responses are kept in a memory-bounded LRU
+cache keyed on a canonical hash of the tool name, the bound arguments and
+that version, so a repeated call skips both the handler and serialization.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Default memory bound of the cache, in bytes of encoded responses
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def make_cache_key(tool_name: str, arguments: Dict[str, Any], version: Hashable = None) -> str:
+    """
+    Build the cache key of a tool call.
+
+    Arguments are encoded canonically (sorted keys, no whitespace), so calls
+    that differ only in argument order share a key.
+
+    Args:
+        tool_name: Tool name
+        arguments: Bound tool arguments
+        version: Version of the data the tool reads
+
+    Returns:
+        Hex digest identifying the call
+    """
+    canonical = json.dumps(
+        [tool_name, arguments, version],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=repr
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters of one tool, or of the whole cache."""
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counters and hit rate as a dictionary."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+@dataclass
+class _Entry:
+    """A cached response."""
+
+    tool_name: str
+    payload: str
+    size: int
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded tool responses with per-entry expiry.
+
+    The cache is bounded by the total size of the cached payloads; the least
+    recently used entries are evicted first. It is safe to use from several
+    threads.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached responses
+            clock: Monotonic time source, in seconds
+        """
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._size = 0
+        self._stats: Dict[str, CacheStats] = {}
+        self._lock = threading.Lock()
+
+    def _tool_stats(self, tool_name: str) -> CacheStats:
+        """Return the counters of a tool; the caller holds the lock."""
+        stats = self._stats.get(tool_name)
+        if stats is None:
+            stats = self._stats[tool_name] = CacheStats()
+        return stats
+
+    def _remove(self, key: str) -> _Entry:
+        """Remove an entry; the caller holds the lock."""
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        return entry
+
+    def get(self, key: str, tool_name: str) -> Optional[str]:
+        """
+        Look up an encoded response.
+
+        Args:
+            key: Cache key from ``make_cache_key``
+            tool_name: Tool name, for the metrics
+
+        Returns:
+            The encoded response, or None on a miss
+        """
+        with self._lock:
+            stats = self._tool_stats(tool_name)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self.clock():
+                self._remove(key)
+                stats.expirations += 1
+                entry = None
+
+            if entry is None:
+                stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            stats.hits += 1
+            return entry.payload
+
+    def put(self, key: str, tool_name: str, payload: str, ttl: float) -> None:
+        """
+        Cache an encoded response.
+
+        Responses larger than the whole cache are not stored.
+
+        Args:
+            key: Cache key from ``make_cache_key``
+            tool_name: Tool name, for the metrics
+            payload: Encoded response
+            ttl: Seconds the response stays valid
+        """
+        # Encoded responses are mostly ASCII; the length is a close estimate
+        size = len(payload)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(tool_name, payload, size, self.clock() + ttl)
+            self._size += size
+            self._tool_stats(tool_name).stores += 1
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self._tool_stats(evicted.tool_name).evictions += 1
+
+    def invalidate(self, tool_name: Optional[str] = None) -> None:
+        """
+        Drop cached responses.
+
+        Args:
+            tool_name: Only drop responses of this tool; all if None
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if tool_name is None or entry.tool_name == tool_name
+            ]
+            for key in keys:
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache metrics.
+
+        Returns:
+            Dictionary with the totals, the per-tool counters and the current
+            number of entries and bytes
+        """
+        with self._lock:
+            total = CacheStats()
+            tools = {}
+            for tool_name, stats in self._stats.items():
+                tools[tool_name] = stats.to_dict()
+                total.hits += stats.hits
+                total.misses += stats.misses
+                total.stores += stats.stores
+                total.evictions += stats.evictions
+                total.expirations += stats.expirations
+
+            return {
+                **total.to_dict(),
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "tools": tools
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,340 @@
+"""
+Server-side composition of tool calls.
+
+A pipeline is a small DAG of steps, each a tool call or a resource read,
+sent in a single ``execute_pipeline`` request. Step arguments may reference
+the results of earlier steps with ``{"$ref": "<step>.<path>"}``, where the
+path is a sequence of dictionary keys and list indices and ``*`` maps the
+rest of the path over a list (``"hits.results.*.id"``). Resource steps give
+a URI template whose ``{name}`` placeholders are filled from their arguments,
+lists being joined with commas.
+
+Steps run as soon as the steps they reference have finished, so independent
+steps run concurrently. A step that fails, or that depends on one that
+failed, gets an ``{"error": ...}`` result; the other steps still run.
+"""
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import quote
+
+from mcp.types import Tool
+
+logger = logging.getLogger(__name__)
+
+# Name of the pipeline tool
+PIPELINE_TOOL_NAME = "execute_pipeline"
+
+# Maximum number of steps in one pipeline
+MAX_PIPELINE_STEPS = 64
+
+# Key of an argument value referencing the result of another step
+REFERENCE_KEY = "$ref"
+
+# Placeholders of resource URI templates
+URI_PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+PIPELINE_TOOL = Tool(
+    name=PIPELINE_TOOL_NAME,
+    description=(
+        "Run several tool calls and resource reads in one request. Arguments may "
+        "reference the results of other steps with {\"$ref\": \"<step>.<path>\"}; "
+        "independent steps run concurrently."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "steps": {
+                "type": "array",
+                "maxItems": MAX_PIPELINE_STEPS,
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string", "description": "Name other steps reference the result by"},
+                        "tool": {"type": "string", "description": "Tool to call"},
+                        "resource": {
+                            "type": "string",
+                            "description": "URI (template) of the resource to read, instead of a tool"
+                        },
+                        "arguments": {
+                            "type": "object",
+                            "description": "Tool arguments, or values of the URI placeholders"
+                        }
+                    },
+                    "required": ["id"]
+                },
+                "description": "The steps of the pipeline"
+            },
+            "outputs": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Steps whose results are returned; all steps if omitted"
+            }
+        },
+        "required": ["steps"]
+    }
+)
+
+
+class PipelineError(ValueError):
+    """Raised for an invalid pipeline or an unresolvable reference."""
+
+
+@dataclass(frozen=True)
+class Step:
+    """One validated pipeline step."""
+
+    id: str
+    tool: Optional[str]
+    resource: Optional[str]
+    arguments: Dict[str, Any]
+    dependencies: frozenset
+
+
+def find_references(value: Any, found: Set[str]) -> Set[str]:
+    """
+    Collect the steps referenced in an argument value.
+
+    Args:
+        value: Argument value, possibly nested
+        found: Set the referenced step IDs are added to
+
+    Returns:
+        The set of referenced step IDs
+    """
+    if isinstance(value, dict):
+        if set(value) == {REFERENCE_KEY}:
+            reference = value[REFERENCE_KEY]
+            if not isinstance(reference, str) or not reference:
+                raise PipelineError(f"Invalid reference: {reference!r}")
+            found.add(reference.split(".", 1)[0])
+        else:
+            for item in value.values():
+                find_references(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            find_references(item, found)
+    return found
+
+
+def parse_steps(steps: Any, outputs: Any = None) -> List[Step]:
+    """
+    Validate a pipeline and order its steps.
+
+    Args:
+        steps: Step dictionaries sent by the client
+        outputs: Step IDs whose results are returned, or None
+
+    Returns:
+        The steps, each after the steps it references
+
+    Raises:
+        PipelineError: If a step or the outputs are malformed, a step
+            references an unknown step or the references form a cycle
+    """
+    if not isinstance(steps, list) or not steps:
+        raise PipelineError("steps must be a non-empty list")
+    if len(steps) > MAX_PIPELINE_STEPS:
+        raise PipelineError(f"At most {MAX_PIPELINE_STEPS} steps can run in one pipeline, got {len(steps)}")
+
+    parsed: Dict[str, Step] = {}
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict):
+            raise PipelineError(f"Step {index} must be an object")
+        step_id = step.get("id")
+        if not isinstance(step_id, str) or not step_id or "." in step_id:
+            raise PipelineError(f"Step {index} needs an id without dots")
+        if step_id in parsed:
+            raise PipelineError(f"Duplicate step id '{step_id}'")
+
+        tool_name, resource = step.get("tool"), step.get("resource")
+        if (tool_name is None) == (resource is None):
+            raise PipelineError(f"Step '{step_id}' needs exactly one of tool and resource")
+        if tool_name == PIPELINE_TOOL_NAME:
+            raise PipelineError(f"Step '{step_id}' cannot run a nested pipeline")
+        arguments = step.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            raise PipelineError(f"Arguments of step '{step_id}' must be an object")
+
+        parsed[step_id] = Step(
+            id=step_id,
+            tool=tool_name,
+            resource=resource,
+            arguments=arguments,
+            dependencies=frozenset(find_references(arguments, set()))
+        )
+
+    for step in parsed.values():
+        for dependency in step.dependencies:
+            if dependency not in parsed:
+                raise PipelineError(f"Step '{step.id}' references unknown step '{dependency}'")
+    if outputs is not None and not (
+        isinstance(outputs, list) and all(isinstance(output, str) for output in outputs)
+    ):
+        raise PipelineError("outputs must be a list of step IDs")
+    for output in outputs or ():
+        if output not in parsed:
+            raise PipelineError(f"Unknown output step '{output}'")
+
+    # Order the steps so each follows its dependencies (Kahn's algorithm)
+    remaining = {step_id: set(step.dependencies) for step_id, step in parsed.items()}
+    ordered: List[Step] = []
+    ready = [step_id for step_id, dependencies in remaining.items() if not dependencies]
+    while ready:
+        step_id = ready.pop()
+        ordered.append(parsed[step_id])
+        del remaining[step_id]
+        for other, dependencies in remaining.items():
+            if step_id in dependencies:
+                dependencies.discard(step_id)
+                if not dependencies:
+                    ready.append(other)
+    if remaining:
+        raise PipelineError(f"Steps {', '.join(sorted(remaining))} reference each other in a cycle")
+    return ordered
+
+
+def lookup(value: Any, path: List[str], reference: str) -> Any:
+    """
+    Follow a reference path into a step result.
+
+    Args:
+        value: Result (or part of a result) the path starts at
+        path: Remaining path segments
+        reference: Full reference, for error messages
+
+    Returns:
+        The referenced value; a list if the path contains ``*``
+
+    Raises:
+        PipelineError: If the path does not exist in the result
+    """
+    for position, segment in enumerate(path):
+        if segment == "*":
+            if not isinstance(value, list):
+                raise PipelineError(f"Reference '{reference}' maps over a value that is not a list")
+            return [lookup(item, path[position + 1:], reference) for item in value]
+        if isinstance(value, dict) and segment in value:
+            value = value[segment]
+        elif isinstance(value, list) and segment.lstrip("-").isdigit() and -len(value) <= int(segment) < len(value):
+            value = value[int(segment)]
+        else:
+            raise PipelineError(f"Reference '{reference}' not found in the result")
+    return value
+
+
+def resolve(value: Any, results: Dict[str, Any]) -> Any:
+    """
+    Replace the references in an argument value by the values they point to.
+
+    Args:
+        value: Argument value, possibly nested
+        results: Results of the finished steps
+
+    Returns:
+        The value with every reference resolved
+    """
+    if isinstance(value, dict):
+        if set(value) == {REFERENCE_KEY}:
+            step_id, *path = value[REFERENCE_KEY].split(".")
+            return lookup(results[step_id], path, value[REFERENCE_KEY])
+        return {key: resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, results) for item in value]
+    return value
+
+
+def expand_uri(template: str, arguments: Dict[str, Any]) -> str:
+    """
+    Fill the placeholders of a resource URI template.
+
+    Args:
+        template: URI with ``{name}`` placeholders
+        arguments: Placeholder values; lists are joined with commas
+
+    Returns:
+        The URI, with the values percent-encoded
+
+    Raises:
+        PipelineError: If a placeholder has no value
+    """
+    def replace(match: "re.Match") -> str:
+        name = match.group(1)
+        if name not in arguments:
+            raise PipelineError(f"No value for '{{{name}}}' in resource '{template}'")
+        value = arguments[name]
+        values = value if isinstance(value, list) else [value]
+        return ",".join(quote(str(item), safe="") for item in values)
+
+    return URI_PLACEHOLDER_PATTERN.sub(replace, template)
+
+
+def is_error(result: Any) -> bool:
+    """Whether a step result is an error."""
+    return isinstance(result, dict) and "error" in result
+
+
+async def execute_steps(
+    steps: Any,
+    outputs: Any,
+    call_tool: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+    read_resource: Callable[[str], Awaitable[Any]]
+) -> Dict[str, Any]:
+    """
+    Run a pipeline.
+
+    Args:
+        steps: Step dictionaries sent by the client
+        outputs: Step IDs whose results are returned; all steps if None
+        call_tool: Coroutine function calling a tool with arguments
+        read_resource: Coroutine function reading a resource URI
+
+    Returns:
+        Dictionary with the result of each output step and the IDs of the
+        steps that failed
+
+    Raises:
+        PipelineError: If the pipeline is invalid
+    """
+    ordered = parse_steps(steps, outputs)
+    results: Dict[str, Any] = {}
+    tasks: Dict[str, "asyncio.Task"] = {}
+
+    async def run(step: Step) -> None:
+        for dependency in step.dependencies:
+            await tasks[dependency]
+        failed = sorted(dependency for dependency in step.dependencies if is_error(results[dependency]))
+        if failed:
+            results[step.id] = {"error": f"Skipped because step '{failed[0]}' failed"}
+            return
+
+        try:
+            arguments = resolve(step.arguments, results)
+            if step.tool is not None:
+                results[step.id] = await call_tool(step.tool, arguments)
+            else:
+                results[step.id] = await read_resource(expand_uri(step.resource, arguments))
+        except PipelineError as e:
+            results[step.id] = {"error": str(e)}
+        except Exception as e:
+            logger.exception(f"Error running pipeline step {step.id}")
+            results[step.id] = {"error": str(e)}
+
+    # Tasks are created in dependency order, so each can await the tasks of
+    # the steps it references
+    for step in ordered:
+        tasks[step.id] = asyncio.ensure_future(run(step))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+    returned = outputs or [step["id"] for step in steps]
+    return {
+        "results": {step_id: results[step_id] for step_id in returned},
+        "failed": [step["id"] for step in steps if is_error(results[step["id"]])]
+    }
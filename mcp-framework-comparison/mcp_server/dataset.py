@@ -0,0 +1,600 @@
+"""
+Dataset handling for the data analysis tool.
+
+This module wraps the tabular data used by ``DataAnalysisTool`` in a
+``Dataset`` that carries a version token. Derived results such as column
+statistics are memoized against that token, so they are recomputed only after
+the data changes.
+
+``InMemoryDataset`` holds a DataFrame and computes results in single
+vectorized passes. ``ChunkedDataset`` reads CSV or Parquet files chunk by
+chunk and computes the same results with streaming accumulators, so data
+larger than memory can be analyzed.
+"""
+
+import logging
+import os
+import threading
+import warnings
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.filters import Filter, SortedIndex, text_values
+from mcp_server.streaming import CorrelationAccumulator, MomentAccumulator, TDigest
+
+logger = logging.getLogger(__name__)
+
+# Quantiles reported by the summary statistics
+QUANTILES = (0.25, 0.5, 0.75)
+
+# Supported correlation methods
+CORRELATION_METHODS = ("pearson", "spearman")
+
+# Row predicate used to filter a dataset, applied to one chunk at a time;
+# usually a compiled Filter
+Predicate = Callable[[pd.DataFrame], Any]
+
+
+def compute_column_statistics(frame: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Compute summary statistics for every numeric column in one pass.
+
+    Args:
+        frame: Data to summarize
+
+    Returns:
+        Mapping from column name to count, mean, std, min, quartiles and max
+    """
+    numeric = frame.select_dtypes(include=["number"])
+    if numeric.shape[1] == 0:
+        return {}
+
+    values = numeric.to_numpy(dtype=np.float64)
+    counts = (~np.isnan(values)).sum(axis=0)
+
+    if values.shape[0] == 0:
+        empty = np.full(values.shape[1], np.nan)
+        means = stds = minimums = maximums = empty
+        quantiles = np.full((len(QUANTILES), values.shape[1]), np.nan)
+    else:
+        # All-NaN columns yield NaN statistics; silence the warnings about them
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            means = np.nanmean(values, axis=0)
+            stds = np.nanstd(values, axis=0, ddof=1)
+            minimums = np.nanmin(values, axis=0)
+            maximums = np.nanmax(values, axis=0)
+            quantiles = np.nanquantile(values, QUANTILES, axis=0)
+
+    statistics = {}
+    for i, column in enumerate(numeric.columns):
+        statistics[column] = {
+            "count": int(counts[i]),
+            "mean": float(means[i]),
+            "std": float(stds[i]),
+            "min": float(minimums[i]),
+            "25%": float(quantiles[0, i]),
+            "50%": float(quantiles[1, i]),
+            "75%": float(quantiles[2, i]),
+            "max": float(maximums[i])
+        }
+    return statistics
+
+
+@dataclass
+class FilterResult:
+    """Outcome of filtering a dataset."""
+
+    count: int
+    columns: List[str]
+    sample: pd.DataFrame
+    summary: Dict[str, Dict[str, Optional[float]]]
+
+
+def _moment_summary(accumulator: MomentAccumulator) -> Dict[str, float]:
+    """Mean, minimum and maximum of an accumulator, NaN when it is empty."""
+    if not accumulator.count:
+        return {"mean": float("nan"), "min": float("nan"), "max": float("nan")}
+    return {"mean": accumulator.mean, "min": accumulator.minimum, "max": accumulator.maximum}
+
+
+class CorrelationMatrix:
+    """Pairwise correlations of a set of columns."""
+
+    def __init__(self, columns: Sequence[str], matrix: np.ndarray):
+        """
+        Initialize the matrix.
+
+        Args:
+            columns: Column names, in matrix order
+            matrix: Square matrix of correlation coefficients
+        """
+        self.columns = list(columns)
+        self.matrix = matrix
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._positions
+
+    def get(self, column1: str, column2: str) -> float:
+        """
+        Look up the correlation of two columns.
+
+        Args:
+            column1: First column name
+            column2: Second column name
+
+        Returns:
+            Correlation coefficient, NaN where undefined
+        """
+        return float(self.matrix[self._positions[column1], self._positions[column2]])
+
+    def to_dict(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Convert the matrix to nested dictionaries.
+
+        Returns:
+            Mapping from column to column to coefficient; None where undefined
+        """
+        return {
+            row: {
+                column: None if np.isnan(value) else float(value)
+                for column, value in zip(self.columns, self.matrix[i])
+            }
+            for i, row in enumerate(self.columns)
+        }
+
+
+class Dataset:
+    """
+    Tabular data behind the data analysis tool.
+
+    Subclasses provide the data as chunks and a version token; the default
+    operations stream over the chunks in a single pass.
+    """
+
+    def __init__(self):
+        """Initialize the derived result cache."""
+        self._lock = threading.Lock()
+        self._derived: Dict[str, Tuple[Hashable, Any]] = {}
+
+    @property
+    def version(self) -> Hashable:
+        """Token that changes whenever the data changes."""
+        raise NotImplementedError
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names."""
+        raise NotImplementedError
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the data in chunks.
+
+        Args:
+            columns: Columns to read; all columns if omitted
+
+        Returns:
+            Iterator over DataFrames
+        """
+        raise NotImplementedError
+
+    def cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return a derived result, computing it once per data version.
+
+        Args:
+            name: Cache key of the derived result
+            compute: Function computing the result
+
+        Returns:
+            The derived result
+        """
+        version = self.version
+        with self._lock:
+            entry = self._derived.get(name)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+
+        value = compute()
+
+        with self._lock:
+            # Drop results computed from data that changed in the meantime
+            if self.version == version:
+                self._derived = {
+                    key: entry for key, entry in self._derived.items() if entry[0] == version
+                }
+                self._derived[name] = (version, value)
+        return value
+
+    def numeric_columns(self) -> List[str]:
+        """
+        Return the names of the numeric columns.
+
+        Returns:
+            List of column names
+        """
+        def compute():
+            for chunk in self.iter_chunks():
+                return list(chunk.select_dtypes(include=["number"]).columns)
+            return []
+
+        return self.cached("numeric_columns", compute)
+
+    def column_statistics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Return summary statistics for every numeric column.
+
+        Counts, means, deviations and extremes are exact; quartiles are
+        t-digest estimates.
+
+        Returns:
+            Mapping from column name to its statistics
+        """
+        return self.cached("column_statistics", self._stream_column_statistics)
+
+    def _stream_column_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Compute column statistics in one pass over the chunks."""
+        columns = self.numeric_columns()
+        moments = {column: MomentAccumulator() for column in columns}
+        digests = {column: TDigest() for column in columns}
+
+        for chunk in self.iter_chunks(columns):
+            for column in columns:
+                values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                moments[column].update(values)
+                digests[column].update(values)
+
+        statistics = {}
+        for column in columns:
+            moment = moments[column]
+            empty = not moment.count
+            quartiles = digests[column].quantiles(QUANTILES)
+            statistics[column] = {
+                "count": moment.count,
+                "mean": float("nan") if empty else moment.mean,
+                "std": moment.std,
+                "min": float("nan") if empty else moment.minimum,
+                "25%": quartiles[0.25],
+                "50%": quartiles[0.5],
+                "75%": quartiles[0.75],
+                "max": float("nan") if empty else moment.maximum
+            }
+        return statistics
+
+    def filter(self, predicate: Predicate, sample_size: int = 5) -> FilterResult:
+        """
+        Filter the data, streaming over the chunks.
+
+        Args:
+            predicate: Function returning a boolean mask for a chunk
+            sample_size: Number of matching rows to keep as a sample
+
+        Returns:
+            Count, sample and numeric summary of the matching rows
+        """
+        numeric = self.numeric_columns()
+        moments = {column: MomentAccumulator() for column in numeric}
+        samples = []
+        sampled = 0
+        count = 0
+
+        for chunk in self.iter_chunks():
+            matched = chunk[predicate(chunk)]
+            if matched.empty:
+                continue
+
+            count += len(matched)
+            if sampled < sample_size:
+                samples.append(matched.head(sample_size - sampled))
+                sampled += len(samples[-1])
+            for column in numeric:
+                moments[column].update(matched[column].to_numpy(dtype=np.float64, na_value=np.nan))
+
+        sample = pd.concat(samples) if samples else pd.DataFrame(columns=self.columns)
+        return FilterResult(
+            count=count,
+            columns=list(self.columns),
+            sample=sample,
+            summary={column: _moment_summary(moments[column]) for column in numeric}
+        )
+
+    def correlation_matrix(self, method: str = "pearson") -> CorrelationMatrix:
+        """
+        Return the correlation matrix of the numeric columns.
+
+        The matrix is computed in one pass and cached until the data changes.
+
+        Args:
+            method: 'pearson' or 'spearman'
+
+        Returns:
+            The correlation matrix
+
+        Raises:
+            ValueError: If the method is not supported
+        """
+        if method not in CORRELATION_METHODS:
+            raise ValueError(f"Correlation method '{method}' not supported")
+        return self.cached(f"correlation_matrix:{method}", lambda: self._compute_correlation_matrix(method))
+
+    def _compute_correlation_matrix(self, method: str) -> CorrelationMatrix:
+        """Compute a correlation matrix in one pass over the chunks."""
+        if method != "pearson":
+            raise ValueError(f"Correlation method '{method}' requires an in-memory dataset")
+
+        columns = self.numeric_columns()
+        accumulator = CorrelationAccumulator(columns)
+        for chunk in self.iter_chunks(columns):
+            accumulator.update(chunk[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        return CorrelationMatrix(columns, accumulator.matrix())
+
+    def correlation(self, column1: str, column2: str) -> float:
+        """
+        Compute the Pearson correlation of two columns.
+
+        Numeric pairs are looked up in the cached correlation matrix; other
+        columns are correlated in a pass of their own.
+
+        Args:
+            column1: First column name
+            column2: Second column name
+
+        Returns:
+            Correlation coefficient, NaN where undefined
+        """
+        matrix = self.correlation_matrix()
+        if column1 in matrix and column2 in matrix:
+            return matrix.get(column1, column2)
+
+        def compute():
+            accumulator = CorrelationAccumulator([column1, column2])
+            for chunk in self.iter_chunks([column1, column2]):
+                accumulator.update(chunk[[column1, column2]].to_numpy(dtype=np.float64, na_value=np.nan))
+            return accumulator.correlation(column1, column2)
+
+        return self.cached(f"correlation:{column1}:{column2}", compute)
+
+
+class InMemoryDataset(Dataset):
+    """Dataset held in a DataFrame."""
+
+    def __init__(self, frame: pd.DataFrame):
+        """
+        Initialize the dataset.
+
+        Args:
+            frame: The data
+        """
+        super().__init__()
+        self._frame = frame
+        self._version = 0
+
+        # Running co-moments of the numeric columns and the data version they
+        # describe; appended rows are folded in instead of recomputing
+        self._comoments: Optional[Tuple[int, CorrelationAccumulator]] = None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The data as a DataFrame."""
+        return self._frame
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._frame.columns)
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        yield self._frame if columns is None else self._frame[list(columns)]
+
+    def touch(self) -> None:
+        """Mark the data as changed after an in-place modification."""
+        with self._lock:
+            self._version += 1
+            self._derived.clear()
+
+    def replace(self, frame: pd.DataFrame) -> None:
+        """
+        Replace the data.
+
+        Args:
+            frame: The new data
+        """
+        with self._lock:
+            self._frame = frame
+            self._version += 1
+            self._derived.clear()
+
+    def append(self, rows: pd.DataFrame) -> None:
+        """
+        Append rows to the data.
+
+        Running co-moments are updated with the new rows, so the Pearson
+        correlation matrix is refreshed without a pass over the old data.
+
+        Args:
+            rows: Rows with the same columns as the dataset
+        """
+        with self._lock:
+            comoments = self._comoments
+            if comoments is not None and comoments[0] == self._version:
+                accumulator = comoments[1]
+                accumulator.update(rows[accumulator.columns].to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                accumulator = None
+
+            self._frame = pd.concat([self._frame, rows], ignore_index=True)
+            self._version += 1
+            self._derived.clear()
+            if accumulator is not None and self.numeric_columns() == accumulator.columns:
+                self._comoments = (self._version, accumulator)
+
+    def numeric_columns(self) -> List[str]:
+        return list(self._frame.select_dtypes(include=["number"]).columns)
+
+    def column_statistics(self) -> Dict[str, Dict[str, float]]:
+        frame = self._frame
+        return self.cached("column_statistics", lambda: compute_column_statistics(frame))
+
+    def sorted_index(self, column: str) -> Optional[SortedIndex]:
+        """
+        Return the sorted index of a column, building it on first use.
+
+        Args:
+            column: Column name
+
+        Returns:
+            The index, or None if the column is not numeric or a date
+        """
+        frame = self._frame
+
+        def compute():
+            values = frame[column].to_numpy()
+            return SortedIndex(values) if SortedIndex.supports(values) else None
+
+        return self.cached(f"index:{column}", compute)
+
+    def text_column(self, column: str) -> pd.Series:
+        """
+        Return the values of a column as strings, formatting them on first use.
+
+        Args:
+            column: Column name
+
+        Returns:
+            The column itself for string columns, its formatted values otherwise
+        """
+        frame = self._frame
+        return self.cached(f"text:{column}", lambda: text_values(frame[column]))
+
+    def filter(self, predicate: Predicate, sample_size: int = 5) -> FilterResult:
+        frame = self._frame
+
+        # Answer range conditions from sorted indexes, and substring matches
+        # from cached string forms, where possible
+        positions = (
+            predicate.select(frame, self.sorted_index, self.text_column)
+            if isinstance(predicate, Filter) else None
+        )
+        filtered = frame.iloc[positions] if positions is not None else frame[predicate(frame)]
+        numeric = filtered.select_dtypes(include=["number"])
+        return FilterResult(
+            count=len(filtered),
+            columns=list(filtered.columns),
+            sample=filtered.head(sample_size),
+            summary={
+                column: {
+                    "mean": float(numeric[column].mean()),
+                    "min": float(numeric[column].min()),
+                    "max": float(numeric[column].max())
+                } for column in numeric.columns
+            }
+        )
+
+    def _compute_correlation_matrix(self, method: str) -> CorrelationMatrix:
+        frame = self._frame
+        columns = self.numeric_columns()
+
+        if method == "spearman":
+            # Pearson correlation of the column ranks
+            accumulator = CorrelationAccumulator(columns)
+            accumulator.update(frame[columns].rank().to_numpy(dtype=np.float64, na_value=np.nan))
+            return CorrelationMatrix(columns, accumulator.matrix())
+
+        with self._lock:
+            version = self._version
+            comoments = self._comoments
+        if comoments is None or comoments[0] != version:
+            accumulator = CorrelationAccumulator(columns)
+            accumulator.update(frame[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+            comoments = (version, accumulator)
+            with self._lock:
+                if self._version == version:
+                    self._comoments = comoments
+        with self._lock:
+            return CorrelationMatrix(columns, comoments[1].matrix())
+
+    def correlation(self, column1: str, column2: str) -> float:
+        matrix = self.correlation_matrix()
+        if column1 in matrix and column2 in matrix:
+            return matrix.get(column1, column2)
+        return float(self._frame[column1].corr(self._frame[column2]))
+
+
+class ChunkedDataset(Dataset):
+    """
+    Dataset read from a CSV or Parquet file one chunk at a time.
+
+    Only one chunk is held in memory at once. The version token is derived
+    from the file's modification time and size, so cached results are
+    discarded when the file is rewritten.
+    """
+
+    PARQUET_SUFFIXES = (".parquet", ".pq")
+
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 100_000,
+        parse_dates: Optional[Sequence[str]] = None
+    ):
+        """
+        Initialize the dataset.
+
+        Args:
+            path: Path of a CSV or Parquet file
+            chunk_size: Number of rows per chunk
+            parse_dates: CSV columns to parse as dates
+        """
+        super().__init__()
+        self.path = path
+        self.chunk_size = chunk_size
+        self.parse_dates = list(parse_dates or [])
+        self.is_parquet = path.lower().endswith(self.PARQUET_SUFFIXES)
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @property
+    def columns(self) -> List[str]:
+        def compute():
+            if self.is_parquet:
+                import pyarrow.parquet as pq
+                return list(pq.ParquetFile(self.path).schema_arrow.names)
+            return list(pd.read_csv(self.path, nrows=0).columns)
+
+        return self.cached("columns", compute)
+
+    def iter_chunks(self, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        columns = list(columns) if columns is not None else None
+
+        if self.is_parquet:
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Reading Parquet datasets requires pyarrow") from e
+
+            parquet_file = pq.ParquetFile(self.path)
+            for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=columns):
+                yield batch.to_pandas()
+            return
+
+        parse_dates = [column for column in self.parse_dates if columns is None or column in columns]
+        reader = pd.read_csv(
+            self.path,
+            usecols=columns,
+            parse_dates=parse_dates or None,
+            chunksize=self.chunk_size
+        )
+        with reader:
+            for chunk in reader:
+                yield chunk
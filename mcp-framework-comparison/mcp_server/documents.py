@@ -0,0 +1,532 @@
+"""
+Document collection behind the document resources.
+
+``DocumentCollection`` holds documents by ID and keeps an inverted index over
+their title, content and metadata in step with them. A search looks up the
+query terms in the index instead of scanning every document, ranks the
+matches with BM25 (titles and tags weigh more than body text) and extracts a
+highlighted snippet for each result.
+
+Listings are paginated by document ID: a page starts after the ID encoded in
+an opaque cursor, so pages stay consistent while documents are added or
+removed, and each listed document carries only the requested fields.
+
+Document content is also split into chunks when a document is added: at
+Markdown headings where possible and never longer than ``chunk_size``
+characters. Readers fetch one chunk, or any character range, instead of the
+whole body, and stream large documents by reading the chunks in turn.
+
+Finally, derivatives of the content (such as a summary, keywords and
+entities) are computed once when a document is added or its content changes,
+and stored by content hash: documents with the same content share them and a
+metadata-only change does not recompute them. Derivatives that also depend on
+other data, such as entities on the entity dictionaries, are recomputed when
+they are next read after that data changes.
+"""
+
+import base64
+import binascii
+import hashlib
+import logging
+import re
+from bisect import bisect_right, insort
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from mcp_server.search import InvertedIndex, flatten_text, make_snippet, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Weight of each searchable field; other fields have weight 1.0
+DOCUMENT_FIELD_WEIGHTS = {"title": 3.0, "metadata.tags": 2.0}
+
+# Number of tokens in a search result snippet
+SNIPPET_TOKENS = 30
+
+# Fields a listing can project; "content_length" is the length of the content
+# and the last three are precomputed derivatives
+LIST_FIELDS = ("title", "metadata", "content", "content_length", "summary", "keywords", "entities")
+DEFAULT_LIST_FIELDS = ("title", "metadata")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Maximum number of documents fetched in one batch
+MAX_BATCH_SIZE = 100
+
+# Maximum length of a content chunk, in characters
+DEFAULT_CHUNK_SIZE = 8192
+
+# Maximum length of a content range read at once, in characters
+MAX_RANGE_LENGTH = 1024 * 1024
+
+# Start of a Markdown heading line
+_HEADING_PATTERN = re.compile(r"^[ \t]*#{1,6}[ \t]+(.*)$", re.MULTILINE)
+
+
+def split_chunks(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    Split text into chunks aligned to Markdown headings.
+
+    Consecutive sections are packed into one chunk while they fit; a section
+    longer than ``chunk_size`` is cut at the last line break (or whitespace)
+    in the second half of the chunk.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum chunk length in characters
+
+    Returns:
+        List of (start, end) character offsets covering the text
+    """
+    if len(text) <= chunk_size:
+        return [(0, len(text))]
+
+    boundaries = [match.start() for match in _HEADING_PATTERN.finditer(text) if match.start() > 0]
+    sections = list(zip([0] + boundaries, boundaries + [len(text)]))
+
+    chunks: List[Tuple[int, int]] = []
+    start = end = 0
+    for section_start, section_end in sections:
+        if section_end - start <= chunk_size:
+            end = section_end
+            continue
+        if end > start:
+            chunks.append((start, end))
+            start = end = section_start
+        # Cut sections that do not fit into a chunk of their own
+        while section_end - start > chunk_size:
+            limit = start + chunk_size
+            floor = start + chunk_size // 2
+            cut = text.rfind("\n", floor, limit)
+            if cut < 0:
+                cut = max(text.rfind(" ", floor, limit), text.rfind("\t", floor, limit))
+            cut = cut + 1 if cut >= 0 else limit
+            chunks.append((start, cut))
+            start = cut
+        end = section_end
+    chunks.append((start, end))
+    return chunks
+
+
+def encode_cursor(document_id: str) -> str:
+    """Encode the ID of the last listed document as a page cursor."""
+    return base64.urlsafe_b64encode(document_id.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decode a page cursor into the ID of the last listed document.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded, altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
+
+def content_hash(content: str) -> str:
+    """Return the hash identifying a document body."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def document_fields(document: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Return the searchable text of a document, by field.
+
+    Args:
+        document: Document with a title, content and metadata
+
+    Returns:
+        Mapping from field name ("title", "content" or "metadata.<key>") to
+        its text, in the order matches are reported
+    """
+    fields = {
+        "title": document.get("title", ""),
+        "content": document.get("content", "")
+    }
+    for key, value in document.get("metadata", {}).items():
+        fields[f"metadata.{key}"] = " ".join(flatten_text(value))
+    return fields
+
+
+class DocumentCollection:
+    """Documents by ID with an incrementally maintained search index."""
+
+    def __init__(
+        self,
+        documents: Optional[Dict[str, Dict[str, Any]]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        derive: Optional[Callable[[str], Dict[str, Any]]] = None,
+        derive_version: Optional[Callable[[], Hashable]] = None
+    ):
+        """
+        Initialize the collection.
+
+        Args:
+            documents: Mapping from document ID to document; used in place,
+                not copied
+            chunk_size: Maximum length of a content chunk, in characters
+            derive: Function computing the derivatives of a document body,
+                as a dictionary; None stores no derivatives
+            derive_version: Function returning the version of the data
+                ``derive`` depends on besides the body (such as the entity
+                dictionaries); derivatives of an older version are
+                recomputed when they are read
+        """
+        self._documents = documents if documents is not None else {}
+        self.chunk_size = chunk_size
+        self.derive = derive
+        self.derive_version = derive_version
+        self._index = InvertedIndex(field_weights=DOCUMENT_FIELD_WEIGHTS)
+
+        # document ID -> field -> terms of the field
+        self._field_terms: Dict[str, Dict[str, Set[str]]] = {}
+
+        # document ID -> (start, end) offsets of the content chunks
+        self._chunks: Dict[str, List[Tuple[int, int]]] = {}
+
+        # document ID -> content hash, and content hash -> (derive version,
+        # derivatives) and number of documents with that content
+        self._hashes: Dict[str, str] = {}
+        self._derivatives: Dict[str, Tuple[Hashable, Dict[str, Any]]] = {}
+        self._hash_references: Dict[str, int] = {}
+
+        # Document IDs in listing order
+        self._ids = sorted(self._documents)
+
+        # Incremented on every change
+        self.version = 0
+
+        for document_id in self._documents:
+            self._index_document(document_id)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._documents
+
+    def _index_document(self, document_id: str) -> None:
+        """Rebuild the index entries of one document."""
+        document = self._documents.get(document_id)
+        if document is None:
+            self._index.remove(document_id)
+            self._field_terms.pop(document_id, None)
+            self._chunks.pop(document_id, None)
+            self._release_hash(document_id)
+            return
+
+        fields = document_fields(document)
+        self._index.add(document_id, fields)
+        self._field_terms[document_id] = {field: set(tokenize(text)) for field, text in fields.items()}
+        self._chunks[document_id] = split_chunks(fields["content"], self.chunk_size)
+        self._derive(document_id, fields["content"])
+
+    def _derive(self, document_id: str, content: str) -> None:
+        """Compute the derivatives of a document body unless already known."""
+        digest = content_hash(content)
+        if self._hashes.get(document_id) == digest:
+            return
+        self._release_hash(document_id)
+
+        self._hashes[document_id] = digest
+        self._hash_references[digest] = self._hash_references.get(digest, 0) + 1
+        if digest in self._derivatives or self.derive is None:
+            return
+        self._compute_derivatives(document_id, digest, content)
+
+    def _compute_derivatives(self, document_id: str, digest: str, content: str) -> None:
+        """Compute and store the derivatives of a document body."""
+        version = self.derive_version() if self.derive_version is not None else None
+        try:
+            self._derivatives[digest] = (version, self.derive(content))
+        except Exception:
+            # The document stays readable; it just has no derivatives
+            self._derivatives.pop(digest, None)
+            logger.exception(f"Could not compute derivatives of document '{document_id}'")
+
+    def _current_derivatives(self, document_id: str) -> Dict[str, Any]:
+        """Return the derivatives of a document, recomputing outdated ones."""
+        digest = self._hashes[document_id]
+        entry = self._derivatives.get(digest)
+        if entry is not None and self.derive_version is not None and entry[0] != self.derive_version():
+            content = document_fields(self._documents[document_id])["content"]
+            self._compute_derivatives(document_id, digest, content)
+            entry = self._derivatives.get(digest)
+        return entry[1] if entry is not None else {}
+
+    def _release_hash(self, document_id: str) -> None:
+        """Drop the content hash of a document, and unshared derivatives."""
+        digest = self._hashes.pop(document_id, None)
+        if digest is None:
+            return
+        self._hash_references[digest] -= 1
+        if not self._hash_references[digest]:
+            del self._hash_references[digest]
+            self._derivatives.pop(digest, None)
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Return a document, or None if it does not exist."""
+        return self._documents.get(document_id)
+
+    def get_many(self, document_ids: Iterable[str]) -> Dict[str, Any]:
+        """
+        Fetch several documents at once.
+
+        Args:
+            document_ids: IDs of the documents, at most ``MAX_BATCH_SIZE``
+                distinct ones; repeated IDs are fetched once
+
+        Returns:
+            Dictionary with the found documents, in request order and each
+            with its ID, and the IDs that were not found
+
+        Raises:
+            ValueError: If too many documents are requested
+        """
+        document_ids = list(dict.fromkeys(document_ids))
+        if len(document_ids) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} documents can be fetched at once, got {len(document_ids)}")
+
+        documents = []
+        missing = []
+        for document_id in document_ids:
+            document = self._documents.get(document_id)
+            if document is None:
+                missing.append(document_id)
+            else:
+                documents.append({"id": document_id, **document})
+        return {"documents": documents, "missing": missing}
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over (document ID, document) pairs in insertion order."""
+        return iter(self._documents.items())
+
+    def put(self, document_id: str, document: Dict[str, Any]) -> None:
+        """
+        Add or replace a document.
+
+        Args:
+            document_id: Document ID
+            document: Document with a title, content and metadata
+        """
+        if document_id not in self._documents:
+            insort(self._ids, document_id)
+        self._documents[document_id] = document
+        self._index_document(document_id)
+        self.version += 1
+
+    def delete(self, document_id: str) -> None:
+        """
+        Remove a document if it exists.
+
+        Args:
+            document_id: Document ID
+        """
+        if self._documents.pop(document_id, None) is not None:
+            del self._ids[bisect_right(self._ids, document_id) - 1]
+        self._index_document(document_id)
+        self.version += 1
+
+    def derivatives(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the precomputed derivatives of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Dictionary with the content hash and the derivatives (empty if
+            they could not be computed); None if the document does not exist
+        """
+        digest = self._hashes.get(document_id)
+        if digest is None:
+            return None
+        return {"id": document_id, "content_hash": digest, **self._current_derivatives(document_id)}
+
+    def chunks(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Describe the content chunks of a document.
+
+        Args:
+            document_id: Document ID
+
+        Returns:
+            Dictionary with the content length and, for every chunk, its
+            offsets and the first heading in it; None if the document does
+            not exist
+        """
+        document = self._documents.get(document_id)
+        if document is None:
+            return None
+
+        content = document.get("content", "")
+        chunks = []
+        for start, end in self._chunks[document_id]:
+            heading = _HEADING_PATTERN.search(content, start, end)
+            chunks.append({
+                "start": start,
+                "end": end,
+                "heading": heading.group(1).strip() if heading else None
+            })
+        return {"id": document_id, "content_length": len(content), "chunks": chunks}
+
+    def get_chunk(self, document_id: str, number: int) -> Optional[Dict[str, Any]]:
+        """
+        Read one content chunk of a document.
+
+        Args:
+            document_id: Document ID
+            number: Chunk number, from 0
+
+        Returns:
+            Dictionary with the chunk number, the number of chunks, the chunk
+            offsets and its content; None if the document does not exist
+
+        Raises:
+            ValueError: If the chunk number is out of range
+        """
+        document = self._documents.get(document_id)
+        if document is None:
+            return None
+
+        chunks = self._chunks[document_id]
+        if not 0 <= number < len(chunks):
+            raise ValueError(f"Chunk {number} out of range; document '{document_id}' has {len(chunks)} chunks")
+        start, end = chunks[number]
+        return {
+            "id": document_id,
+            "chunk": number,
+            "chunks": len(chunks),
+            "start": start,
+            "end": end,
+            "content": document.get("content", "")[start:end]
+        }
+
+    def get_range(self, document_id: str, start: int, end: int) -> Optional[Dict[str, Any]]:
+        """
+        Read a character range of the content of a document.
+
+        Args:
+            document_id: Document ID
+            start: Offset of the first character
+            end: Offset after the last character; clipped to the content
+                length
+
+        Returns:
+            Dictionary with the range offsets, the content length and the
+            content of the range; None if the document does not exist
+
+        Raises:
+            ValueError: If the range is invalid or longer than
+                ``MAX_RANGE_LENGTH``
+        """
+        document = self._documents.get(document_id)
+        if document is None:
+            return None
+
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid range {start}-{end}")
+        if end - start > MAX_RANGE_LENGTH:
+            raise ValueError(f"Ranges are limited to {MAX_RANGE_LENGTH} characters")
+
+        content = document.get("content", "")
+        end = min(end, len(content))
+        start = min(start, end)
+        return {
+            "id": document_id,
+            "start": start,
+            "end": end,
+            "content_length": len(content),
+            "content": content[start:end]
+        }
+
+    def list(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        List one page of documents, ordered by ID.
+
+        Args:
+            cursor: Cursor returned with the previous page; None for the first
+            limit: Maximum number of documents on the page, up to
+                ``MAX_PAGE_SIZE``
+            fields: Fields to include besides the ID, from ``LIST_FIELDS``;
+                defaults to ``DEFAULT_LIST_FIELDS``
+
+        Returns:
+            Dictionary with the documents of the page, the cursor of the next
+            page (None on the last page) and the total number of documents
+
+        Raises:
+            ValueError: If the cursor, limit or fields are invalid
+        """
+        fields = tuple(DEFAULT_LIST_FIELDS if fields is None else fields)
+        unknown = [field for field in fields if field not in LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}; expected any of {', '.join(LIST_FIELDS)}")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        limit = min(limit, MAX_PAGE_SIZE)
+
+        start = bisect_right(self._ids, decode_cursor(cursor)) if cursor else 0
+        page_ids = self._ids[start:start + limit]
+
+        documents = []
+        for document_id in page_ids:
+            document = self._documents[document_id]
+            entry: Dict[str, Any] = {"id": document_id}
+            for field in fields:
+                if field == "content_length":
+                    entry[field] = len(document.get("content", ""))
+                elif field in ("summary", "keywords", "entities"):
+                    entry[field] = self._current_derivatives(document_id).get(field)
+                else:
+                    entry[field] = document.get(field, {} if field == "metadata" else "")
+            documents.append(entry)
+
+        has_more = start + limit < len(self._ids)
+        return {
+            "documents": documents,
+            "next_cursor": encode_cursor(page_ids[-1]) if has_more else None,
+            "total": len(self._ids)
+        }
+
+    def search(self, query: str, top_k: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Search query
+            top_k: Maximum number of results; None returns every match
+
+        Returns:
+            List of results, best first, each with the document ID, title,
+            metadata, score, the first matching field ("title", "content" or
+            "metadata.<key>") and a highlighted snippet
+        """
+        terms = self._index.matching_terms(query)
+        results = []
+        for document_id, score in self._index.search(query, top_k=top_k):
+            document = self._documents[document_id]
+            matched = [field for field, field_terms in self._field_terms[document_id].items() if field_terms & terms]
+
+            # Prefer a passage of the body; fall back to the field that matched
+            snippet_field = "content" if "content" in matched else matched[0]
+            snippet = make_snippet(document_fields(document)[snippet_field], terms, max_tokens=SNIPPET_TOKENS)
+
+            results.append({
+                "id": document_id,
+                "title": document.get("title", ""),
+                "metadata": document.get("metadata", {}),
+                "score": round(score, 4),
+                "match": matched[0],
+                "snippet": snippet
+            })
+        return results
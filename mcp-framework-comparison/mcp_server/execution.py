@@ -0,0 +1,362 @@
+"""
+Execution policies for tool handlers.
+
+Tool handlers are synchronous functions, while the server answers requests on
+an asyncio event loop. Each tool declares how its handler runs:
+
+- ``inline``: on the event loop, for handlers that return in microseconds
+- ``thread``: in a bounded thread pool, for NumPy/pandas work and I/O that
+  release the GIL
+- ``process``: in a bounded process pool, for pure-Python CPU work
+
+A tool may also cap how many of its calls run at once, so a burst of one
+expensive tool cannot occupy every worker while cheap calls wait behind it.
+Process-policy calls whose text arguments are small run in the thread pool:
+they finish faster than a round trip to a worker process, and never wait for
+the process pool to start or for a busy worker.
+
+Cancelling a call (for example when the client cancels the request) releases
+its slot and drops it from the pool queue if it has not started yet; a
+handler that is already running finishes and its result is discarded.
+
+The list argument of a batch tool is split into contiguous chunks of similar
+total size, which run concurrently in the pool; their results are
+concatenated in order. The chunks of all batches share one worker less than
+the pool has, so single calls find a free worker, except in a pool of one
+worker, which batches and single calls share. Module state a handler builds
+on first use (such as a compiled tokenizer) stays loaded in each worker, so
+it is shared by every chunk that worker runs.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from mcp_server.registry import ToolBinding
+
+logger = logging.getLogger(__name__)
+
+# Execution policies
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+POLICIES = (INLINE, THREAD, PROCESS)
+
+# Environment variables sizing the worker pools; 0 process workers runs
+# process-policy tools in the thread pool instead
+THREAD_WORKERS_ENV = "MCP_THREAD_WORKERS"
+PROCESS_WORKERS_ENV = "MCP_PROCESS_WORKERS"
+
+# Batches are split into up to this many chunks per worker, so uneven items
+# still spread over every worker; chunks hold at least this many characters
+# (or items, for non-text items) so small batches are not split at all
+BATCH_CHUNKS_PER_WORKER = 4
+MIN_BATCH_CHUNK_SIZE = 64_000
+
+# Process-policy calls whose string arguments total fewer characters than
+# this run in the thread pool
+PROCESS_MIN_INPUT_SIZE = 50_000
+
+
+def _default_thread_workers() -> int:
+    """Thread pool size used when none is configured."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def _default_process_workers() -> int:
+    """Process pool size used when none is configured."""
+    return min(4, os.cpu_count() or 1)
+
+
+def split_batch(items: List[Any], workers: int) -> List[List[Any]]:
+    """
+    Split the items of a batch into contiguous chunks of similar size.
+
+    Args:
+        items: Batch items; strings are weighted by their length, other
+            items count as one
+        workers: Number of workers the chunks will run on
+
+    Returns:
+        Non-empty chunks that concatenate to the items
+    """
+    sizes = [len(item) if isinstance(item, str) else 1 for item in items]
+    total = sum(sizes)
+    target = max(total / max(1, workers * BATCH_CHUNKS_PER_WORKER), MIN_BATCH_CHUNK_SIZE)
+
+    chunks = []
+    start = 0
+    filled = 0
+    for index, size in enumerate(sizes):
+        filled += size
+        if filled >= target:
+            chunks.append(items[start:index + 1])
+            start = index + 1
+            filled = 0
+    if start < len(items):
+        chunks.append(items[start:])
+    return chunks
+
+
+def input_size(arguments: Dict[str, Any]) -> int:
+    """
+    Measure the text in the arguments of a call.
+
+    Args:
+        arguments: Bound handler arguments
+
+    Returns:
+        Total length of the string arguments and of the strings in list
+        arguments
+    """
+    size = 0
+    for value in arguments.values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, list):
+            size += sum(len(item) for item in value if isinstance(item, str))
+    return size
+
+
+def merge_batch(results: List[Any]) -> Any:
+    """
+    Concatenate the results of the chunks of a batch.
+
+    Args:
+        results: Result of each chunk, in order
+
+    Returns:
+        ``{"results": [...]}`` with the results of every item, or the first
+        chunk result that is not a list of results (such as an error)
+    """
+    merged = []
+    for result in results:
+        if not isinstance(result, dict) or not isinstance(result.get("results"), list):
+            return result
+        merged.extend(result["results"])
+    return {"results": merged}
+
+
+class ToolExecutor:
+    """Runs tool handlers according to their execution policy."""
+
+    def __init__(self, thread_workers: Optional[int] = None, process_workers: Optional[int] = None):
+        """
+        Initialize the executor; pools are started on first use.
+
+        Args:
+            thread_workers: Maximum number of worker threads; defaults to
+                ``MCP_THREAD_WORKERS``
+            process_workers: Maximum number of worker processes; defaults to
+                ``MCP_PROCESS_WORKERS``
+        """
+        if thread_workers is None:
+            thread_workers = int(os.environ.get(THREAD_WORKERS_ENV, _default_thread_workers()))
+        if process_workers is None:
+            process_workers = int(os.environ.get(PROCESS_WORKERS_ENV, _default_process_workers()))
+
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Per-tool concurrency limits, and the lanes batch chunks share in
+        # each pool
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._lanes: Dict[str, asyncio.Semaphore] = {}
+        self._limits_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # tool name -> number of calls waiting, running, completed, failed
+        # and cancelled
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        """Return the thread pool, starting it on first use."""
+        with self._pool_lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.thread_workers,
+                    thread_name_prefix="mcp-tool"
+                )
+            return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting it on first use."""
+        with self._pool_lock:
+            if self._processes is None:
+                logger.info(f"Starting process pool with {self.process_workers} workers")
+                # Forking once the thread pool is running is unsafe, so
+                # workers are started from a clean interpreter
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._processes = ProcessPoolExecutor(max_workers=self.process_workers, mp_context=context)
+                # Workers are otherwise spawned one per submitted call, so a
+                # call arriving while the others are busy would wait for a
+                # worker to start; start them all now, in the background
+                for _ in range(self.process_workers):
+                    self._processes.submit(int)
+            return self._processes
+
+    def _check_loop(self) -> None:
+        """Drop the semaphores of a previous event loop."""
+        # Semaphores belong to one event loop; start over on a new loop
+        loop = asyncio.get_running_loop()
+        if loop is not self._limits_loop:
+            self._limits = {}
+            self._lanes = {}
+            self._limits_loop = loop
+
+    def _limit(self, binding: "ToolBinding") -> Optional[asyncio.Semaphore]:
+        """Return the concurrency limit of a tool, if it has one."""
+        max_concurrency = binding.definition.max_concurrency
+        if max_concurrency is None:
+            return None
+
+        self._check_loop()
+
+        semaphore = self._limits.get(binding.name)
+        if semaphore is None:
+            semaphore = self._limits[binding.name] = asyncio.Semaphore(max_concurrency)
+        return semaphore
+
+    def _batch_lanes(self, pool_name: str, workers: int) -> asyncio.Semaphore:
+        """Return the semaphore bounding the batch chunks running in a pool."""
+        self._check_loop()
+        lanes = self._lanes.get(pool_name)
+        if lanes is None:
+            lanes = self._lanes[pool_name] = asyncio.Semaphore(max(1, workers - 1))
+        return lanes
+
+    def _count(self, tool_name: str, counter: str, delta: int = 1) -> None:
+        """Adjust a per-tool counter."""
+        counters = self._counters.get(tool_name)
+        if counters is None:
+            counters = self._counters[tool_name] = dict.fromkeys(
+                ("waiting", "running", "completed", "failed", "cancelled"), 0
+            )
+        counters[counter] += delta
+
+    async def run(self, binding: "ToolBinding", arguments: Optional[Dict[str, Any]]) -> Any:
+        """
+        Run a tool call.
+
+        Args:
+            binding: The tool
+            arguments: Arguments sent by the client
+
+        Returns:
+            The handler result; for a batch tool, the concatenated results
+            of its chunks
+
+        Raises:
+            asyncio.CancelledError: If the call is cancelled
+        """
+        policy = binding.definition.execution
+        if policy == INLINE:
+            return binding(arguments)
+
+        arguments = binding.bind(arguments)
+        if policy == PROCESS and self.process_workers and input_size(arguments) >= PROCESS_MIN_INPUT_SIZE:
+            pool, pool_name, workers = self._process_pool(), PROCESS, self.process_workers
+        else:
+            pool, pool_name, workers = self._thread_pool(), THREAD, self.thread_workers
+
+        # Batches over the schema's maxItems are passed whole, for the handler
+        # to reject
+        batch = binding.definition.batch
+        items = arguments.get(batch) if batch is not None else None
+        max_items = binding.definition.input_schema["properties"].get(batch, {}).get("maxItems")
+        if isinstance(items, list) and len(items) > 1 and (max_items is None or len(items) <= max_items):
+            calls = [
+                functools.partial(binding.handler, **{**arguments, batch: chunk})
+                for chunk in split_batch(items, max(1, workers - 1))
+            ]
+        else:
+            calls = [functools.partial(binding.handler, **arguments)]
+
+        name = binding.name
+        limit = self._limit(binding)
+        self._count(name, "waiting")
+        try:
+            if limit is not None:
+                await limit.acquire()
+        except asyncio.CancelledError:
+            self._count(name, "waiting", -1)
+            self._count(name, "cancelled")
+            raise
+        self._count(name, "waiting", -1)
+
+        self._count(name, "running")
+        try:
+            # Awaiting the wrapped futures cancels them if the call is
+            # cancelled before a worker picks them up
+            loop = asyncio.get_running_loop()
+            if len(calls) == 1:
+                result = await loop.run_in_executor(pool, calls[0])
+            else:
+                lanes = self._batch_lanes(pool_name, workers)
+
+                async def run_chunk(call: Callable[[], Any]) -> Any:
+                    async with lanes:
+                        return await loop.run_in_executor(pool, call)
+
+                result = merge_batch(await asyncio.gather(*(run_chunk(call) for call in calls)))
+        except asyncio.CancelledError:
+            self._count(name, "cancelled")
+            raise
+        except Exception:
+            self._count(name, "failed")
+            raise
+        finally:
+            self._count(name, "running", -1)
+            if limit is not None:
+                limit.release()
+
+        self._count(name, "completed")
+        return result
+
+    async def run_in_thread(self, func: Callable[[], Any]) -> Any:
+        """
+        Run a blocking function in the thread pool.
+
+        Args:
+            func: Function to call without arguments
+
+        Returns:
+            The function result
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._thread_pool(), func)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report executor metrics.
+
+        Returns:
+            Dictionary with the pool sizes and the per-tool counters
+        """
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "tools": {name: dict(counters) for name, counters in self._counters.items()}
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker pools.
+
+        Args:
+            wait: Whether to wait for running handlers to finish
+        """
+        with self._pool_lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=wait, cancel_futures=True)
+            self._threads = None
+            self._processes = None
@@ -0,0 +1,362 @@
+"""
+Filter expressions for the data analysis tool.
+
+A filter is written as a small JSON expression and compiled once into a tree
+of predicate nodes that evaluate to vectorized NumPy masks. Expressions are
+either a comparison or a combination of expressions::
+
+    {"column": "air_quality_index", "operator": "between", "value": [50, 100]}
+    {"and": [expression, ...]}
+    {"or": [expression, ...]}
+    {"not": expression}
+
+Range comparisons on numeric and date columns can also be answered from a
+``SortedIndex`` with binary searches instead of a full column scan, and
+``contains`` on numeric and date columns from their values formatted as
+strings once per dataset version.
+"""
+
+import json
+from datetime import date
+from functools import lru_cache, reduce
+from numbers import Number
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Supported comparison operators
+OPERATORS = ("eq", "ne", "gt", "lt", "gte", "lte", "between", "in", "contains")
+
+# Operators that a sorted index can answer
+INDEXED_OPERATORS = frozenset({"eq", "gt", "lt", "gte", "lte", "between", "in"})
+
+# Returns the sorted index of a column, or None if the column is not indexable
+IndexLookup = Callable[[str], Optional["SortedIndex"]]
+
+# Returns the values of a column as strings
+TextLookup = Callable[[str], pd.Series]
+
+
+class SortedIndex:
+    """Secondary index over a numeric or date column."""
+
+    def __init__(self, values: np.ndarray):
+        """
+        Build the index.
+
+        Args:
+            values: Column values; missing values are left out of the index
+        """
+        valid = ~pd.isna(values)
+        positions = np.flatnonzero(valid)
+        keys = values[valid]
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.positions = positions[order]
+
+    @staticmethod
+    def supports(values: np.ndarray) -> bool:
+        """Whether a column with these values can be indexed."""
+        return values.dtype.kind in "iufM"
+
+    def range(
+        self,
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True
+    ) -> np.ndarray:
+        """
+        Find the rows whose value lies in a range.
+
+        Args:
+            low: Lower bound, or None for no lower bound
+            high: Upper bound, or None for no upper bound
+            include_low: Whether the lower bound is inclusive
+            include_high: Whether the upper bound is inclusive
+
+        Returns:
+            Sorted row positions
+        """
+        if self.keys.dtype.kind == "M":
+            low = None if low is None else np.datetime64(pd.Timestamp(low))
+            high = None if high is None else np.datetime64(pd.Timestamp(high))
+
+        start = 0 if low is None else np.searchsorted(self.keys, low, side="left" if include_low else "right")
+        stop = len(self.keys) if high is None else np.searchsorted(self.keys, high, side="right" if include_high else "left")
+        return np.sort(self.positions[start:max(start, stop)])
+
+
+def _coerce(series: pd.Series, value: Any) -> Any:
+    """
+    Convert a JSON value to the type of a column.
+
+    Raises:
+        ValueError: If the value cannot be compared with the column
+    """
+    if isinstance(value, (list, tuple)):
+        return [_coerce(series, item) for item in value]
+
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        if isinstance(value, str):
+            return pd.Timestamp(value)
+        if not isinstance(value, (date, np.datetime64)):
+            raise ValueError(f"Value {value!r} cannot be compared with date column '{series.name}'")
+    elif series.dtype.kind in "iuf":
+        if isinstance(value, (bool, np.bool_)) or not isinstance(value, (Number, np.number)):
+            raise ValueError(f"Value {value!r} cannot be compared with numeric column '{series.name}'")
+    return value
+
+
+def text_values(series: pd.Series) -> pd.Series:
+    """Return the values of a column as strings, for ``contains``."""
+    return series if pd.api.types.is_string_dtype(series.dtype) else series.astype(str)
+
+
+class Filter:
+    """Compiled filter expression."""
+
+    columns: FrozenSet[str] = frozenset()
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the filter on every row.
+
+        Args:
+            frame: Rows to filter
+
+        Returns:
+            Boolean mask of matching rows
+        """
+        raise NotImplementedError
+
+    def select(
+        self,
+        frame: pd.DataFrame,
+        index_for: IndexLookup,
+        text_for: Optional[TextLookup] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Find matching rows using sorted indexes.
+
+        Args:
+            frame: Rows to filter
+            index_for: Function returning the sorted index of a column
+            text_for: Function returning the (cached) values of a column as
+                strings, or None to scan ``contains`` conditions row by row
+
+        Returns:
+            Sorted positions of matching rows, or None if the filter cannot
+            use an index
+        """
+        return None
+
+    def __call__(self, frame: pd.DataFrame) -> np.ndarray:
+        return self.mask(frame)
+
+
+class Comparison(Filter):
+    """Comparison of one column against a value."""
+
+    def __init__(self, column: str, operator: str, value: Any):
+        if operator not in OPERATORS:
+            raise ValueError(f"Operator '{operator}' not supported")
+        if operator == "between" and not (isinstance(value, (list, tuple)) and len(value) == 2):
+            raise ValueError("Operator 'between' requires a [low, high] value")
+        if operator == "in" and not isinstance(value, (list, tuple)):
+            raise ValueError("Operator 'in' requires a list value")
+        # Missing values match no row, but a sorted index would read them as
+        # open bounds, so they are rejected before either path is chosen
+        values = value if operator in ("between", "in") else [value]
+        if operator != "contains" and any(item is None for item in values):
+            raise ValueError(f"Operator '{operator}' requires a value")
+
+        self.column = column
+        self.operator = operator
+        self.value = value
+        self.columns = frozenset({column})
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        series = frame[self.column]
+        operator = self.operator
+
+        if operator == "contains":
+            return self._contains(text_values(series))
+
+        value = _coerce(series, self.value)
+        if operator == "in":
+            result = series.isin(value)
+        elif operator == "between":
+            result = (series >= value[0]) & (series <= value[1])
+        elif operator == "eq":
+            result = series == value
+        elif operator == "ne":
+            result = series != value
+        elif operator == "gt":
+            result = series > value
+        elif operator == "lt":
+            result = series < value
+        elif operator == "gte":
+            result = series >= value
+        else:
+            result = series <= value
+
+        return result.to_numpy(dtype=bool, na_value=False)
+
+    def _contains(self, text: pd.Series) -> np.ndarray:
+        """Mask of the rows whose text contains the value."""
+        return text.str.contains(str(self.value), regex=False, na=False).to_numpy(dtype=bool)
+
+    def select(
+        self,
+        frame: pd.DataFrame,
+        index_for: IndexLookup,
+        text_for: Optional[TextLookup] = None
+    ) -> Optional[np.ndarray]:
+        if self.operator == "contains" and text_for is not None:
+            return np.flatnonzero(self._contains(text_for(self.column)))
+        if self.operator not in INDEXED_OPERATORS:
+            return None
+        index = index_for(self.column)
+        if index is None:
+            return None
+
+        value = _coerce(frame[self.column], self.value)
+        operator = self.operator
+        if operator == "eq":
+            return index.range(value, value)
+        if operator == "gt":
+            return index.range(low=value, include_low=False)
+        if operator == "gte":
+            return index.range(low=value)
+        if operator == "lt":
+            return index.range(high=value, include_high=False)
+        if operator == "lte":
+            return index.range(high=value)
+        if operator == "between":
+            return index.range(value[0], value[1])
+        return reduce(np.union1d, [index.range(item, item) for item in value], np.empty(0, dtype=np.int64))
+
+
+class And(Filter):
+    """Rows matching every child filter."""
+
+    def __init__(self, children: List[Filter]):
+        self.children = children
+        self.columns = frozenset().union(*(child.columns for child in children))
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        return np.logical_and.reduce([child.mask(frame) for child in self.children])
+
+    def select(
+        self,
+        frame: pd.DataFrame,
+        index_for: IndexLookup,
+        text_for: Optional[TextLookup] = None
+    ) -> Optional[np.ndarray]:
+        indexed = []
+        residual = []
+        for child in self.children:
+            positions = child.select(frame, index_for, text_for)
+            if positions is None:
+                residual.append(child)
+            else:
+                indexed.append(positions)
+
+        if not indexed:
+            return None
+
+        # Intersect the index hits, then check the other conditions on the
+        # remaining candidate rows only
+        positions = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), indexed)
+        if residual and positions.size:
+            candidates = frame.iloc[positions]
+            keep = np.logical_and.reduce([child.mask(candidates) for child in residual])
+            positions = positions[keep]
+        return positions
+
+
+class Or(Filter):
+    """Rows matching any child filter."""
+
+    def __init__(self, children: List[Filter]):
+        self.children = children
+        self.columns = frozenset().union(*(child.columns for child in children))
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        return np.logical_or.reduce([child.mask(frame) for child in self.children])
+
+    def select(
+        self,
+        frame: pd.DataFrame,
+        index_for: IndexLookup,
+        text_for: Optional[TextLookup] = None
+    ) -> Optional[np.ndarray]:
+        selections = []
+        for child in self.children:
+            positions = child.select(frame, index_for, text_for)
+            if positions is None:
+                return None
+            selections.append(positions)
+        return reduce(np.union1d, selections)
+
+
+class Not(Filter):
+    """Rows not matching the child filter."""
+
+    def __init__(self, child: Filter):
+        self.child = child
+        self.columns = child.columns
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        return ~self.child.mask(frame)
+
+
+def _build(expression: Any) -> Filter:
+    """Build a filter tree from a parsed expression."""
+    if not isinstance(expression, dict):
+        raise ValueError(f"Invalid filter expression: {expression!r}")
+
+    if "and" in expression or "or" in expression:
+        key = "and" if "and" in expression else "or"
+        children = expression[key]
+        if not isinstance(children, list) or not children:
+            raise ValueError(f"'{key}' requires a non-empty list of expressions")
+        nodes = [_build(child) for child in children]
+        return And(nodes) if key == "and" else Or(nodes)
+
+    if "not" in expression:
+        return Not(_build(expression["not"]))
+
+    if "column" not in expression or "operator" not in expression:
+        raise ValueError(f"Invalid filter expression: {expression!r}")
+    return Comparison(expression["column"], expression["operator"], expression.get("value"))
+
+
+@lru_cache(maxsize=256)
+def _compile_cached(source: str) -> Filter:
+    """Compile a canonical JSON expression."""
+    return _build(json.loads(source))
+
+
+def compile_filter(expression: Dict[str, Any]) -> Filter:
+    """
+    Compile a filter expression.
+
+    Compiled filters are cached, so repeated queries skip compilation.
+
+    Args:
+        expression: Filter expression (see module docstring)
+
+    Returns:
+        The compiled filter
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    try:
+        source = json.dumps(expression, sort_keys=True)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid filter expression: {e}") from e
+    return _compile_cached(source)
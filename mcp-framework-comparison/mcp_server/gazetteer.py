@@ -0,0 +1,217 @@
+"""
+Dictionary-based entity matching.
+
+A ``Gazetteer`` compiles named entities (for example organizations or
+places, each with a category) into an Aho-Corasick automaton over word
+tokens. Matching walks the tokens of a text once, with amortized constant
+work per token, so it runs in time linear in the text whatever the size of
+the dictionaries, and finds multi-word names such as
+"Hugging Face" or "New York" along with single words. Overlapping matches
+resolve to the leftmost, then longest, name.
+
+Dictionaries can be loaded from files: JSON files mapping categories to
+lists of names, or text files named after their category with one name per
+line (``organizations.txt``).
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Word tokens; inner hyphens, apostrophes and ampersands stay in the token
+TOKEN_PATTERN = re.compile(r"\w+(?:['&-]\w+)*")
+
+# A match: (start offset, end offset, category)
+Match = Tuple[int, int, str]
+
+# A match in a token sequence: (first token, last token, category)
+TokenMatch = Tuple[int, int, str]
+
+# A compiled automaton: (transitions, failure links, outputs) of each node
+Automaton = Tuple[List[Dict[str, int]], List[int], List[List[Tuple[int, str]]]]
+
+
+class Gazetteer:
+    """
+    Aho-Corasick automaton over the word tokens of entity names.
+
+    Names may be added while other threads match: matching reads a compiled
+    snapshot of the automaton, which ``add`` discards and the next match
+    rebuilds under a lock.
+    """
+
+    def __init__(self, case_sensitive: bool = True):
+        """
+        Initialize an empty gazetteer.
+
+        Args:
+            case_sensitive: Whether names only match with the same case
+        """
+        self.case_sensitive = case_sensitive
+
+        # Trie of the names: node 0 is the root; each node has token
+        # transitions and the (token count, category) of the names ending there
+        self._goto: List[Dict[str, int]] = [{}]
+        self._names: List[List[Tuple[int, str]]] = [[]]
+
+        # Compiled automaton, rebuilt on first use after names are added
+        self._automaton: Optional[Automaton] = None
+        self._lock = threading.Lock()
+        self._size = 0
+        self._version = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def version(self) -> int:
+        """Number of names added so far; changes whenever matches may change."""
+        return self._version
+
+    def _normalize(self, token: str) -> str:
+        return token if self.case_sensitive else token.lower()
+
+    def add(self, name: str, category: str) -> None:
+        """
+        Add an entity name.
+
+        Args:
+            name: Name, of one or more words
+            category: Category reported for matches of the name
+        """
+        tokens = [self._normalize(token) for token in TOKEN_PATTERN.findall(name)]
+        if not tokens:
+            return
+
+        with self._lock:
+            node = 0
+            for token in tokens:
+                next_node = self._goto[node].get(token)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][token] = next_node
+                    self._goto.append({})
+                    self._names.append([])
+                node = next_node
+
+            self._names[node].append((len(tokens), category))
+            self._size += 1
+            self._version += 1
+            self._automaton = None
+
+    def add_names(self, names: Iterable[str], category: str) -> None:
+        """Add several names of one category."""
+        for name in names:
+            self.add(name, category)
+
+    def load(self, path: str) -> None:
+        """
+        Add the names in a dictionary file.
+
+        Args:
+            path: JSON file mapping categories to lists of names, or a text
+                file with one name per line whose file name (without
+                extension) is the category
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                for category, names in json.load(f).items():
+                    self.add_names(names, category)
+            else:
+                category = os.path.splitext(os.path.basename(path))[0]
+                self.add_names((line.strip() for line in f if line.strip()), category)
+        logger.info(f"Loaded gazetteer {path}; {self._size} names in total")
+
+    def _compile(self) -> Automaton:
+        """Compute the failure links and outputs, breadth first; the caller holds the lock."""
+        goto = [dict(transitions) for transitions in self._goto]
+        fail = [0] * len(goto)
+        output = [list(names) for names in self._names]
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for token, child in goto[node].items():
+                queue.append(child)
+                link = fail[node]
+                while link and token not in goto[link]:
+                    link = fail[link]
+                fail[child] = goto[link].get(token, 0) if node else 0
+                # Names ending at the failure node also end here
+                output[child] = output[child] + output[fail[child]]
+
+        return goto, fail, output
+
+    def _compiled_automaton(self) -> Automaton:
+        """Return the compiled automaton, compiling it if names were added."""
+        automaton = self._automaton
+        if automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    self._automaton = self._compile()
+                automaton = self._automaton
+        return automaton
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into the word tokens names are matched on."""
+        return TOKEN_PATTERN.findall(text)
+
+    def find_tokens(self, tokens: List[str]) -> List[TokenMatch]:
+        """
+        Find the names occurring in a sequence of tokens.
+
+        Args:
+            tokens: Word tokens of a text, as returned by ``tokenize``
+
+        Returns:
+            Non-overlapping matches in text order, as (first token, last
+            token, category)
+        """
+        goto, fail, output = self._compiled_automaton()
+        if not self.case_sensitive:
+            tokens = [token.lower() for token in tokens]
+
+        root = goto[0]
+        candidates: List[TokenMatch] = []
+
+        node = 0
+        for index, token in enumerate(tokens):
+            if not node and token not in root:
+                # Most tokens start no name; skip them without further lookups
+                continue
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            for length, category in output[node]:
+                candidates.append((index - length + 1, index, category))
+
+        # Leftmost, then longest, non-overlapping matches
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[0] - candidate[1]))
+        matches: List[TokenMatch] = []
+        next_token = 0
+        for first, last, category in candidates:
+            if first >= next_token:
+                matches.append((first, last, category))
+                next_token = last + 1
+        return matches
+
+    def find(self, text: str) -> List[Match]:
+        """
+        Find the names occurring in a text.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            Non-overlapping matches in text order, as (start, end, category)
+            with character offsets into the text
+        """
+        spans = [(match.start(), match.end()) for match in TOKEN_PATTERN.finditer(text)]
+        tokens = [text[start:end] for start, end in spans]
+        return [(spans[first][0], spans[last][1], category) for first, last, category in self.find_tokens(tokens)]
@@ -0,0 +1,169 @@
+"""
+Streamable HTTP transport for the MCP server.
+
+One long-lived server process serves many clients over the MCP streamable
+HTTP transport: requests are POSTed to a single endpoint and answered with a
+JSON body or a server-sent event stream. All sessions share the process, so
+the knowledge base, the dataset, the response cache and the worker pools are
+loaded once instead of once per client.
+
+Load is bounded at three levels:
+
+- connections: at most ``max_connections`` HTTP connections and requests are
+  served at once; beyond that clients get ``503 Service Unavailable``
+- sessions: each session handles at most ``MCP_MAX_IN_FLIGHT`` requests at
+  once and queues the rest (see ``mcp_server.pipeline``)
+- sockets: the server stops reading from a connection whose responses are
+  not being consumed
+
+Idle keep-alive connections are closed after ``keep_alive`` seconds, and
+sessions without any request for ``session_idle_timeout`` seconds end (with
+MCP SDK versions that support it).
+"""
+
+import contextlib
+import inspect
+import logging
+import socket
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
+
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+if TYPE_CHECKING:
+    from mcp_server.server import MCPServer
+
+logger = logging.getLogger(__name__)
+
+# Endpoint of the MCP transport
+MCP_PATH = "/mcp"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_MAX_CONNECTIONS = 256
+DEFAULT_KEEP_ALIVE = 30.0
+DEFAULT_SESSION_IDLE_TIMEOUT = 1800.0
+
+
+class _SessionRunner:
+    """Adapter letting the SDK session manager run sessions through MCPServer."""
+
+    def __init__(self, server: "MCPServer"):
+        self.server = server
+
+    def create_initialization_options(self, *args, **kwargs) -> Any:
+        return self.server.server.create_initialization_options(*args, **kwargs)
+
+    async def run(self, read_stream, write_stream, initialization_options, raise_exceptions=False, stateless=False):
+        await self.server.serve_session(read_stream, write_stream, stateless=stateless)
+
+
+def create_session_manager(
+    server: "MCPServer",
+    stateless: bool = False,
+    json_response: bool = False,
+    session_idle_timeout: Optional[float] = DEFAULT_SESSION_IDLE_TIMEOUT
+) -> StreamableHTTPSessionManager:
+    """
+    Create the manager of the HTTP sessions of a server.
+
+    Args:
+        server: The MCP server
+        stateless: Whether every request is served without a session
+        json_response: Whether to answer with JSON bodies instead of SSE streams
+        session_idle_timeout: Seconds without requests after which a session
+            ends; ignored by SDK versions without idle timeouts
+
+    Returns:
+        The session manager
+    """
+    options = {"stateless": stateless, "json_response": json_response}
+    if "session_idle_timeout" in inspect.signature(StreamableHTTPSessionManager).parameters:
+        options["session_idle_timeout"] = session_idle_timeout
+    return StreamableHTTPSessionManager(app=_SessionRunner(server), **options)
+
+
+def create_http_app(server: "MCPServer", session_manager: Optional[StreamableHTTPSessionManager] = None) -> Starlette:
+    """
+    Create the ASGI application serving a server over streamable HTTP.
+
+    Besides the MCP endpoint the application answers ``GET /health`` with the
+    server metrics, for load balancers and monitoring.
+
+    Args:
+        server: The MCP server
+        session_manager: Session manager; defaults to ``create_session_manager``
+
+    Returns:
+        The Starlette application
+    """
+    session_manager = session_manager or create_session_manager(server)
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "metrics": server.metrics()})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with session_manager.run():
+            logger.info(f"MCP server running on streamable HTTP at {MCP_PATH}")
+            try:
+                yield
+            finally:
+                server.executor.shutdown(wait=False)
+
+    return Starlette(
+        routes=[
+            Route("/health", health, methods=["GET"]),
+            Mount(MCP_PATH, app=session_manager.handle_request),
+        ],
+        lifespan=lifespan
+    )
+
+
+async def run_http(
+    server: "MCPServer",
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    keep_alive: float = DEFAULT_KEEP_ALIVE,
+    stateless: bool = False,
+    json_response: bool = False,
+    session_idle_timeout: Optional[float] = DEFAULT_SESSION_IDLE_TIMEOUT,
+    sock: Optional[socket.socket] = None
+) -> None:
+    """
+    Serve a server over streamable HTTP until interrupted.
+
+    Args:
+        server: The MCP server
+        host: Interface to listen on
+        port: Port to listen on
+        max_connections: Maximum number of connections and requests served at
+            once; further ones are answered with 503
+        keep_alive: Seconds an idle keep-alive connection stays open
+        stateless: Whether every request is served without a session
+        json_response: Whether to answer with JSON bodies instead of SSE streams
+        session_idle_timeout: Seconds without requests after which a session ends
+        sock: Listening socket to accept connections on instead of binding
+            ``host`` and ``port`` (used by pre-forked workers)
+    """
+    import uvicorn
+
+    session_manager = create_session_manager(
+        server,
+        stateless=stateless,
+        json_response=json_response,
+        session_idle_timeout=session_idle_timeout
+    )
+    config = uvicorn.Config(
+        create_http_app(server, session_manager),
+        host=host,
+        port=port,
+        limit_concurrency=max_connections,
+        timeout_keep_alive=int(keep_alive),
+        log_level="info"
+    )
+    await uvicorn.Server(config).serve(sockets=[sock] if sock is not None else None)
@@ -0,0 +1,168 @@
+"""
+Request pipelining for MCP sessions.
+
+The MCP server dispatches every incoming request of a session as its own
+task, so a client may have several requests outstanding and receives each
+response, matched by request id, as soon as it is ready. ``RequestPipeline``
+sits between the transport and the session and bounds how many requests are
+in flight at once: further requests wait in a queue and are released in
+arrival order as responses go out. Notifications (including cancellations)
+are never held back, and once the queue is also full the transport is no
+longer read, which pushes back on the client.
+"""
+
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, Optional, Tuple
+
+import anyio
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.shared.message import SessionMessage
+from mcp.types import JSONRPCError, JSONRPCNotification, JSONRPCRequest, JSONRPCResponse
+
+logger = logging.getLogger(__name__)
+
+# Method of the notification a client sends to cancel a request
+CANCELLED_METHOD = "notifications/cancelled"
+
+
+class RequestPipeline:
+    """Bounds the number of in-flight requests of one session."""
+
+    def __init__(self, max_in_flight: int = 16, max_pending: Optional[int] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            max_in_flight: Maximum number of requests handled at once
+            max_pending: Maximum number of requests queued behind them before
+                the transport stops being read; defaults to ``max_in_flight``
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_in_flight if max_pending is None else max_pending
+
+        self._in_flight: Dict[Hashable, None] = {}
+        self._pending: "OrderedDict[Hashable, SessionMessage]" = OrderedDict()
+        self._changed = anyio.Condition()
+        self._reading = True
+        self._dispatched = 0
+        self._dropped = 0
+
+    @asynccontextmanager
+    async def attach(
+        self,
+        read_stream: MemoryObjectReceiveStream,
+        write_stream: MemoryObjectSendStream
+    ) -> AsyncIterator[Tuple[MemoryObjectReceiveStream, MemoryObjectSendStream]]:
+        """
+        Insert the pipeline between a transport and a session.
+
+        Args:
+            read_stream: Messages received from the client
+            write_stream: Messages sent to the client
+
+        Returns:
+            Context manager yielding the (read, write) streams to run the
+            session on
+        """
+        session_send, session_read = anyio.create_memory_object_stream(0)
+        session_write, session_outgoing = anyio.create_memory_object_stream(0)
+
+        async with anyio.create_task_group() as tg:
+            # The session sees the end of the stream once both senders close
+            tg.start_soon(self._read, read_stream, session_send)
+            tg.start_soon(self._dispatch, session_send.clone())
+            tg.start_soon(self._write, session_outgoing, write_stream)
+            try:
+                yield session_read, session_write
+            finally:
+                tg.cancel_scope.cancel()
+
+    async def _read(self, read_stream: MemoryObjectReceiveStream, session_send: MemoryObjectSendStream) -> None:
+        """Forward client messages, queueing requests for dispatch."""
+        async with session_send:
+            try:
+                async for message in read_stream:
+                    await self._forward(message, session_send)
+            except anyio.ClosedResourceError:
+                # The transport closed the stream (e.g. a terminated HTTP session)
+                pass
+
+            async with self._changed:
+                self._reading = False
+                self._changed.notify_all()
+
+    async def _forward(self, message: Any, session_send: MemoryObjectSendStream) -> None:
+        """Queue a client request, or pass any other message to the session."""
+        root = getattr(getattr(message, "message", None), "root", None)
+
+        if isinstance(root, JSONRPCRequest):
+            async with self._changed:
+                while len(self._pending) >= self.max_pending:
+                    await self._changed.wait()
+                self._pending[root.id] = message
+                self._changed.notify_all()
+            return
+
+        if isinstance(root, JSONRPCNotification) and root.method == CANCELLED_METHOD:
+            request_id = (root.params or {}).get("requestId")
+            async with self._changed:
+                if self._pending.pop(request_id, None) is not None:
+                    # Never dispatched, so there is nothing to answer
+                    logger.debug(f"Dropped cancelled request {request_id} before dispatch")
+                    self._dropped += 1
+                    self._changed.notify_all()
+                    return
+
+        await session_send.send(message)
+
+    async def _dispatch(self, session_send: MemoryObjectSendStream) -> None:
+        """Release queued requests, oldest first, while slots are free."""
+        async with session_send:
+            while True:
+                async with self._changed:
+                    while not (self._pending and len(self._in_flight) < self.max_in_flight):
+                        if not self._reading and not self._pending:
+                            return
+                        await self._changed.wait()
+                    request_id, message = self._pending.popitem(last=False)
+                    self._in_flight[request_id] = None
+                    self._dispatched += 1
+                    self._changed.notify_all()
+                await session_send.send(message)
+
+    async def _write(self, session_outgoing: MemoryObjectReceiveStream, write_stream: MemoryObjectSendStream) -> None:
+        """Forward session messages, freeing a slot for every response."""
+        async with write_stream:
+            async for message in session_outgoing:
+                try:
+                    await write_stream.send(message)
+                except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    # The client is gone; keep draining so the session can finish
+                    pass
+
+                root = getattr(getattr(message, "message", None), "root", None)
+                if isinstance(root, (JSONRPCResponse, JSONRPCError)) and root.id in self._in_flight:
+                    async with self._changed:
+                        self._in_flight.pop(root.id, None)
+                        self._changed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pipeline metrics.
+
+        Returns:
+            Dictionary with the current in-flight and queued requests, the
+            limits and the number of dispatched and dropped requests
+        """
+        return {
+            "in_flight": len(self._in_flight),
+            "pending": len(self._pending),
+            "max_in_flight": self.max_in_flight,
+            "max_pending": self.max_pending,
+            "dispatched": self._dispatched,
+            "dropped": self._dropped
+        }
@@ -0,0 +1,255 @@
+"""
+Tool registry for the MCP server.
+
+Tools are declared with the ``tool`` decorator next to their implementation and
+collected into a ``ToolRegistry`` once, when the server starts. Listing tools
+and dispatching a call are then plain dictionary lookups.
+
+A tool declared with a ``cache_ttl`` is treated as a pure function of its
+arguments and of the version reported by its ``cache_version`` callable, and
+its responses may be served from the server's response cache. ``execution``
+and ``max_concurrency`` select how the handler is run (see
+``mcp_server.execution``). A tool declared with ``batch`` takes a list
+argument of that name and returns ``{"results": [...]}`` with one result per
+item, in order; the executor may split the list across workers and
+concatenate the results.
+"""
+
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from mcp.types import Tool
+
+from mcp_server.execution import INLINE, POLICIES
+
+logger = logging.getLogger(__name__)
+
+# Attribute used to attach a ToolDefinition to a decorated function
+TOOL_ATTRIBUTE = "__mcp_tool__"
+
+
+@dataclass(frozen=True)
+class ToolDefinition:
+    """Static description of an MCP tool."""
+
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    cache_ttl: Optional[float] = None
+    cache_version: Optional[Callable[[], Hashable]] = None
+    execution: str = INLINE
+    max_concurrency: Optional[int] = None
+    batch: Optional[str] = None
+
+
+def tool(
+    name: str,
+    description: str,
+    properties: Optional[Dict[str, Any]] = None,
+    required: Optional[Iterable[str]] = None,
+    cache_ttl: Optional[float] = None,
+    cache_version: Optional[Callable[[], Hashable]] = None,
+    execution: str = INLINE,
+    max_concurrency: Optional[int] = None,
+    batch: Optional[str] = None
+) -> Callable[[Callable], Callable]:
+    """
+    Declare a function as an MCP tool.
+
+    Args:
+        name: Tool name exposed to clients
+        description: Tool description exposed to clients
+        properties: JSON schema properties of the tool arguments
+        required: Names of the required arguments
+        cache_ttl: Seconds a response may be served from the response cache;
+            None if responses must not be cached
+        cache_version: Function returning the version of the data the tool
+            reads; cached responses of older versions are not served
+        execution: Where the handler runs: "inline" on the event loop,
+            "thread" in the thread pool or "process" in the process pool
+        max_concurrency: Maximum number of calls of this tool running at
+            once; None for no limit
+        batch: Name of the list argument of a batch tool, whose items may be
+            processed in parallel; None for a single-item tool
+
+    Returns:
+        Decorator that attaches the tool definition to the function
+
+    Raises:
+        ValueError: If the execution policy is unknown
+    """
+    if execution not in POLICIES:
+        raise ValueError(f"Unknown execution policy '{execution}'")
+
+    input_schema = {
+        "type": "object",
+        "properties": properties or {}
+    }
+    if required:
+        input_schema["required"] = list(required)
+
+    definition = ToolDefinition(
+        name=name,
+        description=description,
+        input_schema=input_schema,
+        cache_ttl=cache_ttl,
+        cache_version=cache_version,
+        execution=execution,
+        max_concurrency=max_concurrency,
+        batch=batch
+    )
+
+    def decorator(func: Callable) -> Callable:
+        setattr(func, TOOL_ATTRIBUTE, definition)
+        return func
+
+    return decorator
+
+
+class ToolBinding:
+    """A registered tool: its definition, handler and argument binder."""
+
+    def __init__(self, definition: ToolDefinition, handler: Callable[..., Any]):
+        """
+        Initialize the binding.
+
+        Args:
+            definition: Tool definition
+            handler: Callable implementing the tool
+        """
+        self.definition = definition
+        self.handler = handler
+        self.tool = Tool(
+            name=definition.name,
+            description=definition.description,
+            inputSchema=definition.input_schema
+        )
+
+        # Resolve the handler signature once; missing and null arguments fall
+        # back to the parameter default, or None when it has no default.
+        self._parameters = [
+            (parameter.name, None if parameter.default is parameter.empty else parameter.default)
+            for parameter in inspect.signature(handler).parameters.values()
+            if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)
+        ]
+
+    @property
+    def name(self) -> str:
+        """Tool name."""
+        return self.definition.name
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether responses of this tool may be cached."""
+        return self.definition.cache_ttl is not None
+
+    def data_version(self) -> Hashable:
+        """Version of the data the tool reads, or None if it reads none."""
+        version = self.definition.cache_version
+        return version() if version is not None else None
+
+    def bind(self, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Map request arguments onto handler keyword arguments.
+
+        Args:
+            arguments: Arguments sent by the client
+
+        Returns:
+            Keyword arguments for the handler
+        """
+        arguments = arguments or {}
+        bound = {}
+        for name, default in self._parameters:
+            value = arguments.get(name)
+            bound[name] = default if value is None else value
+        return bound
+
+    def __call__(self, arguments: Optional[Dict[str, Any]]) -> Any:
+        """Invoke the handler with bound arguments."""
+        return self.handler(**self.bind(arguments))
+
+
+class ToolRegistry:
+    """Map from tool name to tool binding."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._bindings: Dict[str, ToolBinding] = {}
+        self._tools: Optional[List[Tool]] = None
+
+    def register(self, handler: Callable[..., Any], definition: Optional[ToolDefinition] = None) -> ToolBinding:
+        """
+        Register a tool handler.
+
+        Args:
+            handler: Callable implementing the tool
+            definition: Tool definition; read from the handler if omitted
+
+        Returns:
+            The created binding
+        """
+        definition = definition or getattr(handler, TOOL_ATTRIBUTE, None)
+        if definition is None:
+            raise ValueError(f"{handler!r} is not declared as a tool")
+        if definition.name in self._bindings:
+            raise ValueError(f"Tool '{definition.name}' is already registered")
+
+        binding = ToolBinding(definition, handler)
+        self._bindings[definition.name] = binding
+        self._tools = None
+        return binding
+
+    def register_object(self, obj: Any) -> List[ToolBinding]:
+        """
+        Register every declared tool method of an object.
+
+        Methods are registered in definition order.
+
+        Args:
+            obj: Tool object
+
+        Returns:
+            The created bindings
+        """
+        attributes: Dict[str, Any] = {}
+        for cls in reversed(type(obj).__mro__):
+            attributes.update(vars(cls))
+
+        bindings = []
+        for attribute, value in attributes.items():
+            function = getattr(value, "__func__", value)
+            if getattr(function, TOOL_ATTRIBUTE, None) is not None:
+                bindings.append(self.register(getattr(obj, attribute)))
+        return bindings
+
+    def get(self, name: str) -> Optional[ToolBinding]:
+        """
+        Look up a tool by name.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            The binding, or None if no such tool is registered
+        """
+        return self._bindings.get(name)
+
+    def list_tools(self) -> List[Tool]:
+        """
+        List all registered tools.
+
+        Returns:
+            Prebuilt Tool objects in registration order
+        """
+        if self._tools is None:
+            self._tools = [binding.tool for binding in self._bindings.values()]
+        return self._tools
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._bindings
+
+    def __len__(self) -> int:
+        return len(self._bindings)
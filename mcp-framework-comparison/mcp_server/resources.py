@@ -8,9 +8,11 @@ Each resource represents a specific data source that can be accessed by clients.
 import json
 import logging
 from typing import Any, Dict, List, Optional
-import requests
 from datetime import datetime
 
+from mcp_server.documents import DEFAULT_PAGE_SIZE, DocumentCollection
+from mcp_server.tools import DocumentProcessingTool, entity_gazetteer_version
+
 logger = logging.getLogger(__name__)
 
 # Mock web search results for demonstration purposes
@@ -355,6 +357,58 @@ class WebSearchResource:
         }
 
 
+# Number of keywords precomputed for every document
+DOCUMENT_KEYWORDS = 10
+
+
+def derive_document(content: str) -> Dict[str, Any]:
+    """
+    Compute the derivatives stored with a document body.
+    
+    Args:
+        content: The document content
+        
+    Returns:
+        Dictionary containing the summary, keywords and entities of the content
+    """
+    return {
+        "summary": DocumentProcessingTool.summarize(content)["summary"],
+        "keywords": DocumentProcessingTool.extract_keywords(content, max_keywords=DOCUMENT_KEYWORDS)["keywords"],
+        "entities": DocumentProcessingTool.extract_entities(content)
+    }
+
+
+_document_collection: Optional[DocumentCollection] = None
+
+
+def get_document_collection() -> DocumentCollection:
+    """Return the active document collection, creating it on first use."""
+    global _document_collection
+    
+    if _document_collection is None:
+        # The entities derivative follows the entity gazetteer, like the
+        # entity extraction tool
+        _document_collection = DocumentCollection(
+            DOCUMENTS,
+            derive=derive_document,
+            derive_version=entity_gazetteer_version
+        )
+    
+    return _document_collection
+
+
+def set_document_collection(collection: Optional[DocumentCollection]) -> None:
+    """
+    Replace the active document collection.
+    
+    Args:
+        collection: The collection to use, or None to recreate the default on
+            next use
+    """
+    global _document_collection
+    _document_collection = collection
+
+
 class DocumentResource:
     """Resource for accessing documents."""
     
@@ -369,88 +423,173 @@ class DocumentResource:
         Returns:
             Dictionary containing the document
         """
-        if document_id not in DOCUMENTS:
+        document = get_document_collection().get(document_id)
+        if document is None:
             return {"error": f"Document '{document_id}' not found"}
         
-        return DOCUMENTS[document_id]
+        return document
     
     @staticmethod
-    def list_documents() -> Dict[str, Any]:
+    def get_documents(document_ids: List[str]) -> Dict[str, Any]:
         """
-        List all available documents.
+        Get several documents by ID in one call.
         
+        Args:
+            document_ids: The document IDs
+            
         Returns:
-            Dictionary containing document metadata
+            Dictionary containing the found documents, each with its ID, and
+            the IDs that were not found
         """
-        documents = []
-        for doc_id, doc in DOCUMENTS.items():
-            documents.append({
-                "id": doc_id,
-                "title": doc["title"],
-                "content": doc["content"],
-                "metadata": doc["metadata"]
-            })
-        return {
-            "documents": documents
-        }
+        try:
+            return get_document_collection().get_many(document_ids)
+        except ValueError as e:
+            return {"error": str(e)}
     
     @staticmethod
-    def search_documents(query: str) -> Dict[str, Any]:
+    def get_document_content(document_id: str) -> Dict[str, Any]:
+        """
+        Get the body of a document by ID.
+        
+        Args:
+            document_id: The document ID
+            
+        Returns:
+            Dictionary containing the document ID and content
+        """
+        document = get_document_collection().get(document_id)
+        if document is None:
+            return {"error": f"Document '{document_id}' not found"}
+        
+        return {"id": document_id, "content": document.get("content", "")}
+    
+    @staticmethod
+    def get_document_derivatives(document_id: str) -> Dict[str, Any]:
+        """
+        Get the summary, keywords and entities of a document.
+        
+        They are computed once when the document is added or its content
+        changes, so reading them costs no processing.
+        
+        Args:
+            document_id: The document ID
+            
+        Returns:
+            Dictionary containing the content hash, summary, keywords and
+            entities
+        """
+        result = get_document_collection().derivatives(document_id)
+        if result is None:
+            return {"error": f"Document '{document_id}' not found"}
+        
+        return result
+    
+    @staticmethod
+    def get_document_chunks(document_id: str) -> Dict[str, Any]:
+        """
+        Describe how the body of a document is chunked.
+        
+        Args:
+            document_id: The document ID
+            
+        Returns:
+            Dictionary containing the content length and the offsets and
+            first heading of every chunk
+        """
+        result = get_document_collection().chunks(document_id)
+        if result is None:
+            return {"error": f"Document '{document_id}' not found"}
+        
+        return result
+    
+    @staticmethod
+    def get_document_chunk(document_id: str, number: int) -> Dict[str, Any]:
+        """
+        Get one chunk of the body of a document.
+        
+        Args:
+            document_id: The document ID
+            number: The chunk number, from 0
+            
+        Returns:
+            Dictionary containing the chunk content and position
+        """
+        try:
+            result = get_document_collection().get_chunk(document_id, number)
+        except ValueError as e:
+            return {"error": str(e)}
+        if result is None:
+            return {"error": f"Document '{document_id}' not found"}
+        
+        return result
+    
+    @staticmethod
+    def get_document_range(document_id: str, start: int, end: int) -> Dict[str, Any]:
+        """
+        Get a character range of the body of a document.
+        
+        Args:
+            document_id: The document ID
+            start: Offset of the first character
+            end: Offset after the last character
+            
+        Returns:
+            Dictionary containing the range content and offsets
+        """
+        try:
+            result = get_document_collection().get_range(document_id, start, end)
+        except ValueError as e:
+            return {"error": str(e)}
+        if result is None:
+            return {"error": f"Document '{document_id}' not found"}
+        
+        return result
+    
+    @staticmethod
+    def list_documents(
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        List available documents, one page at a time.
+        
+        Bodies are not listed by default; request the "content" field or read
+        each document's content resource.
+        
+        Args:
+            cursor: Cursor of the page to list, from the previous page
+            limit: Maximum number of documents on the page
+            fields: Fields to include besides the ID (title, metadata,
+                content, content_length, summary, keywords, entities);
+                defaults to title and metadata
+            
+        Returns:
+            Dictionary containing the documents of the page and the cursor of
+            the next page
+        """
+        try:
+            return get_document_collection().list(cursor=cursor, limit=limit, fields=fields)
+        except ValueError as e:
+            return {"error": str(e)}
+    
+    @staticmethod
+    def search_documents(query: str, top_k: int = 10) -> Dict[str, Any]:
         """
         Search documents for a query.
         
+        Titles, content and metadata (tags in particular) are searched through
+        an inverted index; each document appears at most once, ranked by
+        relevance and with a highlighted snippet of the matching text.
+        
         Args:
             query: The search query
+            top_k: Maximum number of results
             
         Returns:
             Dictionary containing search results
         """
-        query_lower = query.lower()
-        results = []
-        
-        for doc_id, doc in DOCUMENTS.items():
-            # Check title
-            if query_lower in doc["title"].lower():
-                results.append({
-                    "id": doc_id,
-                    "title": doc["title"],
-                    "metadata": doc["metadata"],
-                    "match": "title"
-                })
-                continue
-                
-            # Check content
-            if query_lower in doc["content"].lower():
-                results.append({
-                    "id": doc_id,
-                    "title": doc["title"],
-                    "metadata": doc["metadata"],
-                    "match": "content"
-                })
-                continue
-                
-            # Check metadata
-            for key, value in doc["metadata"].items():
-                if isinstance(value, str) and query_lower in value.lower():
-                    results.append({
-                        "id": doc_id,
-                        "title": doc["title"],
-                        "metadata": doc["metadata"],
-                        "match": f"metadata.{key}"
-                    })
-                    break
-                elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, str) and query_lower in item.lower():
-                            results.append({
-                                "id": doc_id,
-                                "title": doc["title"],
-                                "metadata": doc["metadata"],
-                                "match": f"metadata.{key}"
-                            })
-                            break
-        
         return {
             "query": query,
-            "results": results
-        }
\ No newline at end of file
+            "results": get_document_collection().search(query, top_k=top_k)
+        }
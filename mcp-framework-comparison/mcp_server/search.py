@@ -0,0 +1,302 @@
+"""
+Full-text search utilities for the MCP server.
+
+This module provides a small in-memory inverted index with BM25 ranking that
+backs the knowledge base and document searches. Documents are added, replaced
+and removed incrementally, so the index stays in step with the data it covers.
+It also extracts highlighted snippets of matching text for search results.
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+# Tokens are runs of lowercase letters and digits
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words ignored in queries and documents
+STOPWORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "for", "from",
+    "how", "i", "in", "is", "it", "me", "of", "on", "or", "tell", "that",
+    "the", "this", "to", "what", "with"
+})
+
+# Query tokens shorter than this are matched exactly, never as a prefix
+MIN_PREFIX_LENGTH = 3
+
+# Case-insensitive token pattern, for locating tokens in the original text
+_TOKEN_SPAN_PATTERN = re.compile(TOKEN_PATTERN.pattern, re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase index terms.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms with stopwords removed
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def flatten_text(value: Any) -> Iterator[str]:
+    """
+    Yield every string nested inside a value.
+
+    Args:
+        value: A string, list or dictionary
+
+    Returns:
+        Iterator over the nested strings
+    """
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from flatten_text(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from flatten_text(item)
+
+
+class InvertedIndex:
+    """Inverted index with BM25 ranking and optional field weights."""
+
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None, k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            field_weights: Weight applied to term frequencies of each field;
+                fields not listed have weight 1.0
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.field_weights = field_weights or {}
+        self.k1 = k1
+        self.b = b
+
+        # term -> {doc_id: weighted term frequency}
+        self._postings: Dict[str, Dict[Hashable, float]] = {}
+        self._doc_lengths: Dict[Hashable, float] = {}
+        self._doc_terms: Dict[Hashable, Set[str]] = {}
+        self._total_length = 0.0
+
+        # Sorted vocabulary for prefix lookups, rebuilt lazily
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_lengths
+
+    def add(self, doc_id: Hashable, fields: Dict[str, str]) -> None:
+        """
+        Add or replace a document.
+
+        Args:
+            doc_id: Document identifier
+            fields: Mapping from field name to field text
+        """
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+
+        frequencies: Dict[str, float] = {}
+        length = 0.0
+        for field, text in fields.items():
+            weight = self.field_weights.get(field, 1.0)
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary = None
+            postings[doc_id] = frequency
+
+        self._doc_lengths[doc_id] = length
+        self._doc_terms[doc_id] = set(frequencies)
+        self._total_length += length
+
+    def remove(self, doc_id: Hashable) -> None:
+        """
+        Remove a document if it is indexed.
+
+        Args:
+            doc_id: Document identifier
+        """
+        if doc_id not in self._doc_lengths:
+            return
+
+        for term in self._doc_terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def clear(self) -> None:
+        """Remove every document."""
+        self._postings.clear()
+        self._doc_lengths.clear()
+        self._doc_terms.clear()
+        self._total_length = 0.0
+        self._vocabulary = None
+
+    def _expand(self, token: str) -> List[str]:
+        """Return the indexed terms matched by a query token."""
+        if len(token) < MIN_PREFIX_LENGTH:
+            return [token] if token in self._postings else []
+
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+
+        terms = []
+        position = bisect_left(self._vocabulary, token)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(token):
+            terms.append(self._vocabulary[position])
+            position += 1
+        return terms
+
+    def matching_terms(self, query: str) -> Set[str]:
+        """
+        Return the indexed terms matched by a query.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Set of terms, including those matched by prefix
+        """
+        terms: Set[str] = set()
+        for token in set(tokenize(query)):
+            terms.update(self._expand(token))
+        return terms
+
+    def score(self, query: str) -> Dict[Hashable, float]:
+        """
+        Score every document matching a query.
+
+        Each query token matches indexed terms it is a prefix of; a document
+        scores the best BM25 weight among those terms for every token.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Mapping from document identifier to BM25 score
+        """
+        document_count = len(self._doc_lengths)
+        if not document_count:
+            return {}
+
+        average_length = self._total_length / document_count or 1.0
+        scores: Dict[Hashable, float] = {}
+
+        for token in set(tokenize(query)):
+            token_scores: Dict[Hashable, float] = {}
+            for term in self._expand(token):
+                postings = self._postings[term]
+                idf = math.log(1.0 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    weight = idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+                    if weight > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = weight
+            for doc_id, weight in token_scores.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        return scores
+
+    def search(self, query: str, top_k: Optional[int] = 10) -> List[Tuple[Hashable, float]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Search query
+            top_k: Maximum number of results; None returns every match
+
+        Returns:
+            List of (document identifier, score) pairs, best first
+        """
+        scores = self.score(query)
+        if top_k is None:
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+
+def make_snippet(
+    text: str,
+    terms: Set[str],
+    max_tokens: int = 30,
+    highlight: Tuple[str, str] = ("<mark>", "</mark>")
+) -> Optional[str]:
+    """
+    Extract the passage of a text that best matches a set of terms.
+
+    The passage is the window of ``max_tokens`` tokens containing the most
+    distinct terms (ties go to the earliest window). Matching tokens are
+    wrapped in the highlight markers and whitespace is collapsed.
+
+    Args:
+        text: Text to extract the passage from
+        terms: Index terms to look for, as returned by
+            ``InvertedIndex.matching_terms``
+        max_tokens: Length of the passage in tokens
+        highlight: Strings inserted before and after every matching token
+
+    Returns:
+        The highlighted passage, or None if no term occurs in the text
+    """
+    spans = [(match.start(), match.end(), match.group().lower()) for match in _TOKEN_SPAN_PATTERN.finditer(text)]
+    hits = [position for position, span in enumerate(spans) if span[2] in terms]
+    if not hits:
+        return None
+
+    # Slide a window over the matching tokens only
+    best_start, best_count = hits[0], 0
+    window: Dict[str, int] = {}
+    left = 0
+    for right, position in enumerate(hits):
+        term = spans[position][2]
+        window[term] = window.get(term, 0) + 1
+        while position - hits[left] >= max_tokens:
+            left_term = spans[hits[left]][2]
+            window[left_term] -= 1
+            if not window[left_term]:
+                del window[left_term]
+            left += 1
+        if len(window) > best_count:
+            best_start, best_count = hits[left], len(window)
+
+    # Center the matches in the window when they do not fill it
+    last_hit = max(position for position in hits if best_start <= position < best_start + max_tokens)
+    slack = max_tokens - (last_hit - best_start + 1)
+    first = max(0, min(best_start - slack // 2, len(spans) - max_tokens))
+    last = min(len(spans), first + max_tokens) - 1
+
+    opening, closing = highlight
+    parts = []
+    cursor = spans[first][0]
+    for start, end, term in spans[first:last + 1]:
+        if term in terms:
+            parts.append(text[cursor:start])
+            parts.append(f"{opening}{text[start:end]}{closing}")
+            cursor = end
+    parts.append(text[cursor:spans[last][1]])
+
+    snippet = " ".join("".join(parts).split())
+    if first > 0:
+        snippet = "..." + snippet
+    if last < len(spans) - 1:
+        snippet += "..."
+    return snippet
@@ -0,0 +1,192 @@
+"""
+JSON serialization of tool and resource responses.
+
+Responses are encoded compactly by default, with orjson when it is installed
+and the standard library otherwise. NumPy and pandas values (scalars, arrays,
+timestamps, missing values) and datetimes are converted natively, and
+non-finite floats become ``null`` with either backend so that every response
+is valid JSON. Indented output is meant for debugging only and is enabled
+with the ``MCP_JSON_PRETTY`` environment variable.
+"""
+
+import json
+import math
+import os
+import sys
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Environment variable enabling indented output for debugging
+PRETTY_ENV = "MCP_JSON_PRETTY"
+
+# Environment variable selecting a backend ("orjson" or "json")
+BACKEND_ENV = "MCP_JSON_BACKEND"
+
+
+def _replace_non_finite(value: Any) -> Any:
+    """Replace NaN and infinite floats nested in lists and dicts with None."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_replace_non_finite(item) for item in value]
+    return value
+
+
+def to_json_compatible(value: Any) -> Any:
+    """
+    Convert a value the JSON encoders do not handle natively.
+
+    NumPy and pandas are only consulted if they are already imported, so
+    serializing plain responses never loads them.
+
+    Args:
+        value: Value to convert
+
+    Returns:
+        An equivalent value built from JSON types
+
+    Raises:
+        TypeError: If the value cannot be converted
+    """
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if value is pd.NaT:
+            return None
+        if isinstance(value, pd.DataFrame):
+            return _replace_non_finite(value.to_dict(orient="records"))
+        if isinstance(value, (pd.Series, pd.Index)):
+            return _replace_non_finite(value.tolist())
+
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(value, np.datetime64):
+            return None if np.isnat(value) else str(value)
+        if isinstance(value, np.ndarray):
+            return _replace_non_finite(value.tolist())
+        if isinstance(value, np.generic):
+            return _replace_non_finite(value.item())
+
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Decimal):
+        return _replace_non_finite(float(value))
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class Serializer:
+    """Encoder for response payloads."""
+
+    name = "serializer"
+
+    def __init__(self, pretty: bool = False):
+        """
+        Initialize the serializer.
+
+        Args:
+            pretty: Whether to indent the output (for debugging)
+        """
+        self.pretty = pretty
+
+    def dumpb(self, value: Any) -> bytes:
+        """Encode a value as UTF-8 JSON."""
+        raise NotImplementedError
+
+    def dumps(self, value: Any) -> str:
+        """Encode a value as a JSON string."""
+        return self.dumpb(value).decode("utf-8")
+
+
+class StdlibSerializer(Serializer):
+    """Serializer built on the standard library ``json`` module."""
+
+    name = "json"
+
+    def __init__(self, pretty: bool = False):
+        super().__init__(pretty)
+        if pretty:
+            options = {"indent": 2}
+        else:
+            options = {"separators": (",", ":")}
+        self._encoder = json.JSONEncoder(
+            default=to_json_compatible,
+            ensure_ascii=False,
+            allow_nan=False,
+            **options
+        )
+
+    def dumps(self, value: Any) -> str:
+        try:
+            return self._encoder.encode(value)
+        except ValueError:
+            # Out-of-range floats; rare, so only then walk the payload
+            return self._encoder.encode(_replace_non_finite(value))
+
+    def dumpb(self, value: Any) -> bytes:
+        return self.dumps(value).encode("utf-8")
+
+
+class OrjsonSerializer(Serializer):
+    """Serializer built on orjson."""
+
+    name = "orjson"
+
+    def __init__(self, pretty: bool = False):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        super().__init__(pretty)
+        self._options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            self._options |= orjson.OPT_INDENT_2
+        self._fallback = StdlibSerializer(pretty)
+
+    def dumpb(self, value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, default=to_json_compatible, option=self._options)
+        except orjson.JSONEncodeError:
+            # orjson rejects some NumPy values (such as NaT datetimes) without
+            # consulting the default hook; the standard library handles them
+            return self._fallback.dumpb(value)
+
+
+SERIALIZERS = {
+    StdlibSerializer.name: StdlibSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+}
+
+
+def create_serializer(backend: Optional[str] = None, pretty: Optional[bool] = None) -> Serializer:
+    """
+    Create a serializer.
+
+    Args:
+        backend: "orjson" or "json"; defaults to ``MCP_JSON_BACKEND``, then
+            to orjson if it is installed
+        pretty: Whether to indent the output; defaults to ``MCP_JSON_PRETTY``
+
+    Returns:
+        The serializer
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend is None:
+        backend = os.environ.get(BACKEND_ENV) or ("orjson" if orjson is not None else "json")
+    if pretty is None:
+        pretty = os.environ.get(PRETTY_ENV, "").lower() in ("1", "true", "yes")
+
+    if backend not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer backend '{backend}'")
+    return SERIALIZERS[backend](pretty=pretty)
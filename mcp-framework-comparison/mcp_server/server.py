@@ -8,10 +8,14 @@ tools and resources for AI frameworks to interact with.
 import json
 import logging
 import os
+import re
 import sys
-from typing import Any, Dict, List, Optional, Union
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import parse_qs, unquote
 
 from mcp.server import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.stdio import stdio_server
 from mcp.types import (
     TextContent,
@@ -20,8 +24,15 @@ from mcp.types import (
     ResourceTemplate,
 )
 
+from mcp_server.cache import DEFAULT_MAX_BYTES, ResponseCache, make_cache_key
+from mcp_server.composition import PIPELINE_TOOL, PIPELINE_TOOL_NAME, PipelineError, execute_steps
+from mcp_server.execution import INLINE, ToolExecutor
+from mcp_server.pipeline import RequestPipeline
+from mcp_server.registry import ToolBinding, ToolRegistry
 from mcp_server.tools import KnowledgeBaseTool, DataAnalysisTool, DocumentProcessingTool
+from mcp_server.documents import DEFAULT_PAGE_SIZE
 from mcp_server.resources import WebSearchResource, DocumentResource
+from mcp_server.serialization import Serializer, create_serializer
 
 # Configure logging
 logging.basicConfig(
@@ -31,22 +42,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Environment variable bounding the response cache, in bytes; 0 disables it
+RESPONSE_CACHE_BYTES_ENV = "MCP_RESPONSE_CACHE_BYTES"
+
+# Environment variable bounding the requests handled at once per session;
+# 0 removes the limit
+MAX_IN_FLIGHT_ENV = "MCP_MAX_IN_FLIGHT"
+DEFAULT_MAX_IN_FLIGHT = 16
+
+# Resources addressing part of a document: its content, its derivatives, its
+# chunk list, one chunk or a character range
+DOCUMENT_PART_PATTERN = re.compile(
+    r"^mcp://documents/(?P<id>[^/]+)/"
+    r"(?:(?P<content>content)|(?P<derivatives>derivatives)|chunks(?:/(?P<chunk>\d+))?"
+    r"|range/(?P<start>\d+)-(?P<end>\d+))$"
+)
+
 
 class MCPServer:
     """MCP Server implementation for framework comparison."""
     
-    def __init__(self):
-        """Initialize the MCP server."""
+    def __init__(
+        self,
+        serializer: Optional[Serializer] = None,
+        response_cache: Optional[ResponseCache] = None,
+        executor: Optional[ToolExecutor] = None,
+        max_in_flight: Optional[int] = None
+    ):
+        """
+        Initialize the MCP server.
+        
+        Args:
+            serializer: Encoder for responses; defaults to ``create_serializer()``
+            response_cache: Cache of responses of pure tools; defaults to a
+                cache bounded by ``MCP_RESPONSE_CACHE_BYTES``
+            executor: Runs tool handlers according to their execution
+                policy; defaults to pools sized from the environment
+            max_in_flight: Maximum number of requests of a session handled
+                at once; defaults to ``MCP_MAX_IN_FLIGHT``, 0 for no limit
+        """
         self.server = Server(
             name="mcp-framework-comparison",
             version="0.1.0",
         )
         
+        # Responses are compact JSON unless pretty printing is enabled
+        self.serializer = serializer or create_serializer()
+        
+        # Repeated calls of pure tools are answered from encoded responses
+        if response_cache is None:
+            max_bytes = int(os.environ.get(RESPONSE_CACHE_BYTES_ENV, DEFAULT_MAX_BYTES))
+            response_cache = ResponseCache(max_bytes) if max_bytes > 0 else None
+        self.response_cache = response_cache
+        
+        # Slow handlers run in worker pools so they do not block the event loop
+        self.executor = executor or ToolExecutor()
+        
+        # Requests of a session are handled concurrently, up to this many at once
+        if max_in_flight is None:
+            max_in_flight = int(os.environ.get(MAX_IN_FLIGHT_ENV, DEFAULT_MAX_IN_FLIGHT))
+        self.max_in_flight = max_in_flight
+        self.pipelines: Set[RequestPipeline] = set()
+        
         # Initialize tools
         self.knowledge_base_tool = KnowledgeBaseTool()
         self.data_analysis_tool = DataAnalysisTool()
         self.document_processing_tool = DocumentProcessingTool()
         
+        # Build the tool registry once; dispatch is a dictionary lookup
+        self.tool_registry = ToolRegistry()
+        self.tool_registry.register_object(self.knowledge_base_tool)
+        self.tool_registry.register_object(self.data_analysis_tool)
+        self.tool_registry.register_object(self.document_processing_tool)
+        self.tools = self.tool_registry.list_tools() + [PIPELINE_TOOL]
+        
         # Initialize resources
         self.web_search_resource = WebSearchResource()
         self.document_resource = DocumentResource()
@@ -76,222 +145,142 @@ class MCPServer:
         
         @self.server.read_resource()
         async def handle_read_resource(uri):
-            return await self._handle_read_resource(uri)
+            contents = await self._handle_read_resource(str(uri))
+            return [
+                ReadResourceContents(content=item["content"], mime_type=item["mime_type"])
+                for item in contents
+            ]
     
     async def _handle_list_tools(self):
         """Handle ListTools request."""
-        from mcp.types import Tool
-        
-        return [
-            Tool(
-                name="knowledge_base_get_info",
-                description="Get information from the knowledge base",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "topic": {
-                            "type": "string",
-                            "description": "The main topic to retrieve information about"
-                        },
-                        "subtopic": {
-                            "type": "string",
-                            "description": "Optional subtopic for more specific information"
-                        }
-                    },
-                    "required": ["topic"]
-                }
-            ),
-            Tool(
-                name="knowledge_base_list_topics",
-                description="List all available topics in the knowledge base",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            Tool(
-                name="knowledge_base_search",
-                description="Search the knowledge base for a query",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "The search query"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            ),
-            Tool(
-                name="data_analysis_get_summary_statistics",
-                description="Get summary statistics for the dataset",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "column": {
-                            "type": "string",
-                            "description": "Optional column name to get statistics for"
-                        }
-                    }
-                }
-            ),
-            Tool(
-                name="data_analysis_filter_data",
-                description="Filter the dataset based on a condition",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "column": {
-                            "type": "string",
-                            "description": "Column name to filter on"
-                        },
-                        "operator": {
-                            "type": "string",
-                            "description": "Comparison operator ('eq', 'gt', 'lt', 'gte', 'lte', 'contains')"
-                        },
-                        "value": {
-                            "oneOf": [
-                                {"type": "string"},
-                                {"type": "number"}
-                            ],
-                            "description": "Value to compare against"
-                        }
-                    },
-                    "required": ["column", "operator", "value"]
-                }
-            ),
-            Tool(
-                name="data_analysis_get_correlation",
-                description="Calculate correlation between two columns",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "column1": {
-                            "type": "string",
-                            "description": "First column name"
-                        },
-                        "column2": {
-                            "type": "string",
-                            "description": "Second column name"
-                        }
-                    },
-                    "required": ["column1", "column2"]
-                }
-            ),
-            Tool(
-                name="document_processing_extract_entities",
-                description="Extract entities from text",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "text": {
-                            "type": "string",
-                            "description": "The text to extract entities from"
-                        }
-                    },
-                    "required": ["text"]
-                }
-            ),
-            Tool(
-                name="document_processing_summarize",
-                description="Generate a summary of the text",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "text": {
-                            "type": "string",
-                            "description": "The text to summarize"
-                        },
-                        "max_length": {
-                            "type": "integer",
-                            "description": "Maximum length of the summary"
-                        }
-                    },
-                    "required": ["text"]
-                }
-            ),
-            Tool(
-                name="document_processing_extract_keywords",
-                description="Extract keywords from text",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "text": {
-                            "type": "string",
-                            "description": "The text to extract keywords from"
-                        },
-                        "max_keywords": {
-                            "type": "integer",
-                            "description": "Maximum number of keywords to extract"
-                        }
-                    },
-                    "required": ["text"]
-                }
-            )
-        ]
+        return self.tools
     
     async def _handle_call_tool(self, tool_name, arguments):
         """Handle CallTool request."""
-        from mcp.types import TextContent
+        if tool_name == PIPELINE_TOOL_NAME:
+            arguments = arguments or {}
+            result = await self.execute_pipeline(arguments.get("steps"), arguments.get("outputs"))
+            return [TextContent(type="text", text=self.serializer.dumps(result))]
+        
+        binding = self.tool_registry.get(tool_name)
+        if binding is None:
+            return [TextContent(type="text", text=f"Unknown tool: {tool_name}")]
         
         try:
-            # Knowledge base tools
-            if tool_name == "knowledge_base_get_info":
-                result = self.knowledge_base_tool.get_info(
-                    topic=arguments.get("topic"),
-                    subtopic=arguments.get("subtopic")
-                )
-            elif tool_name == "knowledge_base_list_topics":
-                result = self.knowledge_base_tool.list_topics()
-            elif tool_name == "knowledge_base_search":
-                result = self.knowledge_base_tool.search(
-                    query=arguments.get("query")
-                )
-            
-            # Data analysis tools
-            elif tool_name == "data_analysis_get_summary_statistics":
-                result = self.data_analysis_tool.get_summary_statistics(
-                    column=arguments.get("column")
-                )
-            elif tool_name == "data_analysis_filter_data":
-                result = self.data_analysis_tool.filter_data(
-                    column=arguments.get("column"),
-                    operator=arguments.get("operator"),
-                    value=arguments.get("value")
-                )
-            elif tool_name == "data_analysis_get_correlation":
-                result = self.data_analysis_tool.get_correlation(
-                    column1=arguments.get("column1"),
-                    column2=arguments.get("column2")
-                )
-            
-            # Document processing tools
-            elif tool_name == "document_processing_extract_entities":
-                result = self.document_processing_tool.extract_entities(
-                    text=arguments.get("text")
-                )
-            elif tool_name == "document_processing_summarize":
-                result = self.document_processing_tool.summarize(
-                    text=arguments.get("text"),
-                    max_length=arguments.get("max_length", 100)
-                )
-            elif tool_name == "document_processing_extract_keywords":
-                result = self.document_processing_tool.extract_keywords(
-                    text=arguments.get("text"),
-                    max_keywords=arguments.get("max_keywords", 5)
-                )
-            else:
-                return [TextContent(type="text", text=f"Unknown tool: {tool_name}")]
-            
-            # Convert result to JSON string
-            result_json = json.dumps(result, indent=2)
-            
+            _, result_json = await self._run_tool(binding, arguments)
             return [TextContent(type="text", text=result_json)]
         except Exception as e:
             logger.exception(f"Error calling tool {tool_name}")
             return [TextContent(type="text", text=f"Error: {str(e)}")]
     
+    async def _run_tool(self, binding: ToolBinding, arguments: Optional[Dict[str, Any]]) -> Tuple[Any, str]:
+        """
+        Run a tool call, answering it from the response cache if possible.
+        
+        Args:
+            binding: The tool
+            arguments: Arguments sent by the client
+            
+        Returns:
+            Tuple of (result, JSON-encoded result); the result is None when
+            the response came from the cache
+        """
+        tool_name = binding.name
+        cache_key = None
+        if self.response_cache is not None and binding.cacheable:
+            # Reading the data version may load the data, which must not
+            # block the event loop for tools that run off it
+            if binding.definition.execution == INLINE:
+                version = binding.data_version()
+            else:
+                version = await self.executor.run_in_thread(binding.data_version)
+            cache_key = make_cache_key(tool_name, binding.bind(arguments), version)
+            cached = self.response_cache.get(cache_key, tool_name)
+            if cached is not None:
+                return None, cached
+        
+        result = await self.executor.run(binding, arguments)
+        
+        # Convert result to JSON string
+        result_json = self.serializer.dumps(result)
+        
+        # Error results may be transient, so only successes are cached
+        if cache_key is not None and not (isinstance(result, dict) and "error" in result):
+            self.response_cache.put(cache_key, tool_name, result_json, binding.definition.cache_ttl)
+        
+        return result, result_json
+    
+    async def execute_pipeline(self, steps: Any, outputs: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Run a DAG of tool calls and resource reads in one request.
+        
+        Steps reference the results of other steps in their arguments and
+        run as soon as those are ready, so independent steps run
+        concurrently (see ``mcp_server.composition``).
+        
+        Args:
+            steps: Step dictionaries, each with an id and a tool or resource
+            outputs: Steps whose results are returned; all steps if omitted
+            
+        Returns:
+            Dictionary with the result of each output step and the steps
+            that failed, or an error if the pipeline is invalid
+        """
+        try:
+            return await execute_steps(steps, outputs, self._call_pipeline_tool, self._read_pipeline_resource)
+        except PipelineError as e:
+            return {"error": str(e)}
+    
+    async def _call_pipeline_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool for a pipeline step and return its result."""
+        binding = self.tool_registry.get(tool_name)
+        if binding is None:
+            return {"error": f"Unknown tool: {tool_name}"}
+        
+        result, result_json = await self._run_tool(binding, arguments)
+        return json.loads(result_json) if result is None else result
+    
+    async def _read_pipeline_resource(self, uri: str) -> Any:
+        """Read a resource for a pipeline step and return its decoded content."""
+        content = (await self._handle_read_resource(uri))[0]
+        if content["mime_type"] == "application/json":
+            return json.loads(content["content"])
+        if content["mime_type"] == "text/plain":
+            # Unknown URIs and read failures
+            return {"error": content["content"]}
+        return content["content"]
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Report server metrics.
+        
+        Returns:
+            Dictionary with the response cache counters (None for a disabled
+            cache), the executor counters and the request pipeline state of
+            the open sessions
+        """
+        return {
+            "response_cache": self.response_cache.stats() if self.response_cache is not None else None,
+            "executor": self.executor.stats(),
+            "pipeline": self.pipeline_stats()
+        }
+    
+    def pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Report the request pipelines of the open sessions.
+        
+        Returns:
+            Dictionary with the number of sessions and their summed counters
+        """
+        totals = {"sessions": 0, "in_flight": 0, "pending": 0, "dispatched": 0, "dropped": 0}
+        for pipeline in list(self.pipelines):
+            stats = pipeline.stats()
+            totals["sessions"] += 1
+            for key in ("in_flight", "pending", "dispatched", "dropped"):
+                totals[key] += stats[key]
+        totals["max_in_flight"] = self.max_in_flight
+        return totals
+    
     async def _handle_list_resources(self):
         """Handle ListResources request."""
         from mcp.types import Resource
@@ -301,7 +290,13 @@ class MCPServer:
                 uri="mcp://documents/list",
                 name="Document List",
                 mimeType="application/json",
-                description="List of all available documents"
+                description="First page of the available documents (title and metadata)"
+            ),
+            Resource(
+                uri="mcp://server/metrics",
+                name="Server Metrics",
+                mimeType="application/json",
+                description="Response cache and tool executor counters"
             )
         ]
     
@@ -316,6 +311,49 @@ class MCPServer:
                 mimeType="application/json",
                 description="Search the web for a query"
             ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/list{?cursor,limit,fields}",
+                name="Document List Page",
+                mimeType="application/json",
+                description="Page of documents after a cursor, with the listed fields "
+                            "(title, metadata, content, content_length, summary, keywords, entities)"
+            ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/batch/{document_ids}",
+                name="Document Batch",
+                mimeType="application/json",
+                description="Get several documents at once by comma-separated IDs"
+            ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/{document_id}/content",
+                name="Document Content",
+                mimeType="text/markdown",
+                description="Body of a document"
+            ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/{document_id}/derivatives",
+                name="Document Derivatives",
+                mimeType="application/json",
+                description="Summary, keywords and entities of a document, computed when it was added"
+            ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/{document_id}/chunks",
+                name="Document Chunks",
+                mimeType="application/json",
+                description="Offsets and headings of the content chunks of a document"
+            ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/{document_id}/chunks/{number}",
+                name="Document Chunk",
+                mimeType="application/json",
+                description="One content chunk of a document, with the URI of the next chunk"
+            ),
+            ResourceTemplate(
+                uriTemplate="mcp://documents/{document_id}/range/{start}-{end}",
+                name="Document Range",
+                mimeType="application/json",
+                description="A character range of the content of a document"
+            ),
             ResourceTemplate(
                 uriTemplate="mcp://documents/{document_id}",
                 name="Document",
@@ -334,45 +372,105 @@ class MCPServer:
         """Handle ReadResource request."""
         try:
             # Static resources
-            if uri == "mcp://documents/list":
-                result = self.document_resource.list_documents()
+            if uri == "mcp://documents/list" or uri.startswith("mcp://documents/list?"):
+                # Optional query: ?cursor=...&limit=...&fields=title,metadata
+                params = parse_qs(uri.partition("?")[2])
+                fields = params.get("fields", [None])[0]
+                try:
+                    result = self.document_resource.list_documents(
+                        cursor=params.get("cursor", [None])[0],
+                        limit=int(params.get("limit", [DEFAULT_PAGE_SIZE])[0]),
+                        fields=fields.split(",") if fields else None
+                    )
+                except ValueError:
+                    result = {"error": f"Invalid limit: {params['limit'][0]}"}
+                return [{
+                    "uri": uri,
+                    "mime_type": "application/json",
+                    "content": self.serializer.dumps(result)
+                }]
+            
+            if uri == "mcp://server/metrics":
                 return [{
                     "uri": uri,
                     "mime_type": "application/json",
-                    "content": json.dumps(result, indent=2)
+                    "content": self.serializer.dumps(self.metrics())
                 }]
             
             # Web search resource template
             web_search_match = uri.startswith("mcp://web-search/")
             if web_search_match:
-                query = uri[len("mcp://web-search/"):]
+                query = unquote(uri[len("mcp://web-search/"):])
                 result = self.web_search_resource.search(query)
                 return [{
                     "uri": uri,
                     "mime_type": "application/json",
-                    "content": json.dumps(result, indent=2)
+                    "content": self.serializer.dumps(result)
+                }]
+            
+            # Document batch resource template
+            if uri.startswith("mcp://documents/batch/"):
+                ids = uri[len("mcp://documents/batch/"):].split(",")
+                result = self.document_resource.get_documents([unquote(i) for i in ids if i])
+                return [{
+                    "uri": uri,
+                    "mime_type": "application/json",
+                    "content": self.serializer.dumps(result)
+                }]
+            
+            # Document content, chunk and range resource templates
+            part_match = DOCUMENT_PART_PATTERN.match(uri)
+            if part_match:
+                document_id = unquote(part_match.group("id"))
+                if part_match.group("content"):
+                    result = self.document_resource.get_document_content(document_id)
+                    if "error" not in result:
+                        return [{
+                            "uri": uri,
+                            "mime_type": "text/markdown",
+                            "content": result["content"]
+                        }]
+                elif part_match.group("derivatives"):
+                    result = self.document_resource.get_document_derivatives(document_id)
+                elif part_match.group("chunk") is not None:
+                    result = self.document_resource.get_document_chunk(document_id, int(part_match.group("chunk")))
+                    if "error" not in result and result["chunk"] + 1 < result["chunks"]:
+                        # Lets clients stream the body chunk by chunk
+                        result["next"] = f"mcp://documents/{part_match.group('id')}/chunks/{result['chunk'] + 1}"
+                elif part_match.group("start") is not None:
+                    result = self.document_resource.get_document_range(
+                        document_id,
+                        int(part_match.group("start")),
+                        int(part_match.group("end"))
+                    )
+                else:
+                    result = self.document_resource.get_document_chunks(document_id)
+                return [{
+                    "uri": uri,
+                    "mime_type": "application/json",
+                    "content": self.serializer.dumps(result)
                 }]
             
             # Document resource template
             document_match = uri.startswith("mcp://documents/")
             if document_match and not uri.startswith("mcp://documents/search/"):
-                document_id = uri[len("mcp://documents/"):]
+                document_id = unquote(uri[len("mcp://documents/"):])
                 result = self.document_resource.get_document(document_id)
                 return [{
                     "uri": uri,
                     "mime_type": "application/json",
-                    "content": json.dumps(result, indent=2)
+                    "content": self.serializer.dumps(result)
                 }]
             
             # Document search resource template
             document_search_match = uri.startswith("mcp://documents/search/")
             if document_search_match:
-                query = uri[len("mcp://documents/search/"):]
+                query = unquote(uri[len("mcp://documents/search/"):])
                 result = self.document_resource.search_documents(query)
                 return [{
                     "uri": uri,
                     "mime_type": "application/json",
-                    "content": json.dumps(result, indent=2)
+                    "content": self.serializer.dumps(result)
                 }]
             
             return [{
@@ -388,15 +486,37 @@ class MCPServer:
                 "content": f"Error reading resource: {str(e)}"
             }]
 
+    async def serve_session(self, read_stream, write_stream, stateless: bool = False):
+        """
+        Serve one client session over a pair of message streams.
+        
+        Args:
+            read_stream: Messages received from the client
+            write_stream: Messages sent to the client
+            stateless: Whether the session is a stateless HTTP request
+        """
+        async with AsyncExitStack() as stack:
+            # Bound the requests handled at once; responses go out as they
+            # complete, matched to their requests by id
+            if self.max_in_flight > 0:
+                pipeline = RequestPipeline(self.max_in_flight)
+                self.pipelines.add(pipeline)
+                stack.callback(self.pipelines.discard, pipeline)
+                read_stream, write_stream = await stack.enter_async_context(
+                    pipeline.attach(read_stream, write_stream)
+                )
+            
+            initialization_options = self.server.create_initialization_options()
+            await self.server.run(read_stream, write_stream, initialization_options, stateless=stateless)
+    
     async def run(self):
-        """Run the MCP server."""
+        """Run the MCP server on stdio."""
         async with stdio_server() as (read_stream, write_stream):
-            # The error shows run() needs read_stream, write_stream, and initialization_options
-            # Let's provide empty dict as default initialization_options
-            initialization_options = {}
-            await self.server.run(read_stream, write_stream, initialization_options)
-            logger.info("MCP server running on stdio")       
-    
+            try:
+                logger.info("MCP server running on stdio")
+                await self.serve_session(read_stream, write_stream)
+            finally:
+                self.executor.shutdown(wait=False)
 
 
 
@@ -0,0 +1,109 @@
+"""
+Sharing an in-memory dataset between worker processes.
+
+The parent process publishes each column of a DataFrame once as a ``.npy``
+file, in a RAM-backed directory (``/dev/shm``) where available. Workers
+memory-map the files read-only and build a DataFrame on top of the mappings
+without copying, so the column data is held in memory once however many
+workers attach. Numeric, boolean and datetime columns are shared this way.
+Other columns (such as strings) cannot be mapped and are loaded into every
+worker.
+
+The index is not published; attached frames get a default RangeIndex.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# File describing the published columns, in order
+MANIFEST_FILE = "manifest.json"
+
+# Column dtype kinds that can be memory-mapped
+SHAREABLE_KINDS = "biufcmM"
+
+
+def _default_directory() -> Optional[str]:
+    """Directory under which datasets are published by default."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def publish_frame(frame: pd.DataFrame, directory: Optional[str] = None) -> str:
+    """
+    Publish the columns of a DataFrame for workers to attach to.
+
+    Args:
+        frame: Data to publish
+        directory: Directory to write the columns to; a new temporary
+            directory (in ``/dev/shm`` if available) is created if omitted
+
+    Returns:
+        Path of the directory holding the published columns
+    """
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="mcp-dataset-", dir=_default_directory())
+    else:
+        os.makedirs(directory, exist_ok=True)
+
+    columns = []
+    shared_bytes = 0
+    for position, column in enumerate(frame.columns):
+        values = frame[column].to_numpy()
+        shared = values.dtype.kind in SHAREABLE_KINDS
+        file_name = f"{position}.npy"
+        np.save(os.path.join(directory, file_name), values, allow_pickle=not shared)
+        columns.append({"name": column, "file": file_name, "shared": shared})
+        if shared:
+            shared_bytes += values.nbytes
+
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(frame), "columns": columns}, f)
+
+    logger.info(f"Published {len(columns)} columns ({shared_bytes / 1e6:.1f} MB shared) to {directory}")
+    return directory
+
+
+def attach_frame(directory: str) -> pd.DataFrame:
+    """
+    Attach to a published DataFrame.
+
+    Shared columns are read-only memory mappings of the published files.
+
+    Args:
+        directory: Directory returned by ``publish_frame``
+
+    Returns:
+        DataFrame backed by the published columns
+    """
+    with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    data = {}
+    for column in manifest["columns"]:
+        path = os.path.join(directory, column["file"])
+        if column["shared"]:
+            data[column["name"]] = np.load(path, mmap_mode="r")
+        else:
+            data[column["name"]] = np.load(path, allow_pickle=True)
+
+    return pd.DataFrame(data, copy=False)
+
+
+def remove_published(directory: str) -> None:
+    """
+    Delete a published DataFrame.
+
+    Workers that are still attached keep their mappings until they exit.
+
+    Args:
+        directory: Directory returned by ``publish_frame``
+    """
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,349 @@
+"""
+Knowledge base storage backends.
+
+This module defines the storage interface behind ``KnowledgeBaseTool`` and two
+implementations: an in-memory store for small, literal knowledge bases and a
+SQLite store that keeps entries on disk, searches them with FTS5 and loads
+topics lazily into a bounded LRU cache.
+
+A SQLite knowledge base can be built from a JSON file with::
+
+    python -m mcp_server.storage knowledge_base.json knowledge_base.db
+"""
+
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mcp_server.search import MIN_PREFIX_LENGTH, InvertedIndex, flatten_text, tokenize
+
+logger = logging.getLogger(__name__)
+
+# A search hit: ((topic, subtopic or None), score)
+SearchHit = Tuple[Tuple[str, Optional[str]], float]
+
+
+def split_topic(topic: str, data: Any) -> List[Tuple[Optional[str], str, Any]]:
+    """
+    Split a topic into the entries it is stored and searched as.
+
+    Topics whose values are all dictionaries (such as "ai_frameworks") become
+    one entry per subtopic; every other topic is a single entry.
+
+    Args:
+        topic: Topic name
+        data: Topic content
+
+    Returns:
+        List of (subtopic or None, entry name, entry data) tuples
+    """
+    if isinstance(data, dict) and data and all(isinstance(value, dict) for value in data.values()):
+        return [(subtopic, subtopic, subtopic_data) for subtopic, subtopic_data in data.items()]
+    return [(None, topic, data)]
+
+
+class KnowledgeBaseStore:
+    """Storage interface for the knowledge base."""
+
+    # Incremented on every change made through the store
+    version = 0
+
+    def list_topics(self) -> List[str]:
+        """Return all topic names."""
+        raise NotImplementedError
+
+    def get_topic(self, topic: str) -> Optional[Any]:
+        """Return the content of a topic, or None if it does not exist."""
+        raise NotImplementedError
+
+    def get_subtopic(self, topic: str, subtopic: str) -> Optional[Any]:
+        """Return the content of a subtopic, or None if it does not exist."""
+        data = self.get_topic(topic)
+        if isinstance(data, dict):
+            return data.get(subtopic)
+        return None
+
+    def put_topic(self, topic: str, data: Any) -> None:
+        """Add or replace a topic."""
+        raise NotImplementedError
+
+    def delete_topic(self, topic: str) -> None:
+        """Remove a topic if it exists."""
+        raise NotImplementedError
+
+    def search(self, query: str, top_k: Optional[int] = 10) -> List[SearchHit]:
+        """Rank entries for a query, best first."""
+        raise NotImplementedError
+
+    def put_topics(self, topics: Dict[str, Any]) -> None:
+        """Add or replace several topics."""
+        for topic, data in topics.items():
+            self.put_topic(topic, data)
+
+
+class InMemoryKnowledgeBaseStore(KnowledgeBaseStore):
+    """Knowledge base held in a dictionary and searched with an inverted index."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            data: Knowledge base dictionary; used in place, not copied
+        """
+        self._data = data if data is not None else {}
+        self._index = InvertedIndex(field_weights={"name": 2.0})
+        self._entries: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+
+        for topic in self._data:
+            self._index_topic(topic)
+
+    def _index_topic(self, topic: str) -> None:
+        """Rebuild the index entries of one topic."""
+        for key in self._entries.pop(topic, []):
+            self._index.remove(key)
+
+        if topic not in self._data:
+            return
+
+        keys = []
+        for subtopic, name, data in split_topic(topic, self._data[topic]):
+            key = (topic, subtopic)
+            self._index.add(key, {"name": name, "body": " ".join(flatten_text(data))})
+            keys.append(key)
+        self._entries[topic] = keys
+
+    def list_topics(self) -> List[str]:
+        return list(self._data.keys())
+
+    def get_topic(self, topic: str) -> Optional[Any]:
+        return self._data.get(topic)
+
+    def put_topic(self, topic: str, data: Any) -> None:
+        self._data[topic] = data
+        self._index_topic(topic)
+        self.version += 1
+
+    def delete_topic(self, topic: str) -> None:
+        self._data.pop(topic, None)
+        self._index_topic(topic)
+        self.version += 1
+
+    def search(self, query: str, top_k: Optional[int] = 10) -> List[SearchHit]:
+        return self._index.search(query, top_k=top_k)
+
+
+class SQLiteKnowledgeBaseStore(KnowledgeBaseStore):
+    """
+    Knowledge base stored in SQLite.
+
+    Each entry (see ``split_topic``) is one row of JSON; an FTS5 table that
+    shares the entry rowids serves ranked search over entry names and text.
+    Entries are read lazily and kept in a bounded LRU cache.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            topic TEXT NOT NULL,
+            subtopic TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (topic, subtopic)
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(name, body);
+    """
+
+    # Subtopic value of entries that hold a whole topic
+    WHOLE_TOPIC = ""
+
+    def __init__(self, path: str, cache_size: int = 1024):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            path: Path of the SQLite database file
+            cache_size: Maximum number of entries kept in memory
+        """
+        self.path = path
+        self.cache_size = cache_size
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(self.SCHEMA)
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Any]:
+        """Return a cached entry and mark it as recently used."""
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        return None
+
+    def _cache_put(self, key: Tuple[str, str], value: Any) -> None:
+        """Cache an entry, evicting the least recently used ones."""
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _invalidate(self, topic: str) -> None:
+        """Drop every cached entry of a topic."""
+        for key in [key for key in self._cache if key[0] == topic]:
+            del self._cache[key]
+
+    def _load(self, topic: str, subtopic: str) -> Optional[Any]:
+        """Load one entry, from the cache if possible."""
+        key = (topic, subtopic)
+        with self._lock:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+            row = self._connection.execute(
+                "SELECT data FROM entries WHERE topic = ? AND subtopic = ?",
+                (topic, subtopic)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value = json.loads(row[0])
+            self._cache_put(key, value)
+            return value
+
+    def list_topics(self) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT topic FROM entries GROUP BY topic ORDER BY MIN(rowid)"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_topic(self, topic: str) -> Optional[Any]:
+        whole = self._load(topic, self.WHOLE_TOPIC)
+        if whole is not None:
+            return whole
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT subtopic FROM entries WHERE topic = ? ORDER BY rowid",
+                (topic,)
+            ).fetchall()
+        if not rows:
+            return None
+        return {row[0]: self._load(topic, row[0]) for row in rows}
+
+    def get_subtopic(self, topic: str, subtopic: str) -> Optional[Any]:
+        if subtopic != self.WHOLE_TOPIC:
+            data = self._load(topic, subtopic)
+            if data is not None:
+                return data
+
+        whole = self._load(topic, self.WHOLE_TOPIC)
+        if isinstance(whole, dict):
+            return whole.get(subtopic)
+        return None
+
+    def _write_topic(self, topic: str, data: Any) -> None:
+        """Replace the rows of one topic; the caller holds the lock."""
+        self._delete_rows(topic)
+        for subtopic, name, entry in split_topic(topic, data):
+            subtopic = self.WHOLE_TOPIC if subtopic is None else subtopic
+            cursor = self._connection.execute(
+                "INSERT INTO entries (topic, subtopic, data) VALUES (?, ?, ?)",
+                (topic, subtopic, json.dumps(entry))
+            )
+            self._connection.execute(
+                "INSERT INTO entries_fts (rowid, name, body) VALUES (?, ?, ?)",
+                (cursor.lastrowid, " ".join(tokenize(name)), " ".join(tokenize(" ".join(flatten_text(entry)))))
+            )
+
+    def _delete_rows(self, topic: str) -> None:
+        """Delete the rows of one topic; the caller holds the lock."""
+        self._connection.execute(
+            "DELETE FROM entries_fts WHERE rowid IN (SELECT rowid FROM entries WHERE topic = ?)",
+            (topic,)
+        )
+        self._connection.execute("DELETE FROM entries WHERE topic = ?", (topic,))
+        self._invalidate(topic)
+
+    def put_topic(self, topic: str, data: Any) -> None:
+        self.put_topics({topic: data})
+
+    def put_topics(self, topics: Dict[str, Any]) -> None:
+        with self._lock, self._connection:
+            for topic, data in topics.items():
+                self._write_topic(topic, data)
+            self.version += 1
+
+    def delete_topic(self, topic: str) -> None:
+        with self._lock, self._connection:
+            self._delete_rows(topic)
+            self.version += 1
+
+    @staticmethod
+    def _match_expression(query: str) -> str:
+        """Translate a query into an FTS5 MATCH expression."""
+        terms = []
+        for token in dict.fromkeys(tokenize(query)):
+            terms.append(f'"{token}"*' if len(token) >= MIN_PREFIX_LENGTH else f'"{token}"')
+        return " OR ".join(terms)
+
+    def search(self, query: str, top_k: Optional[int] = 10) -> List[SearchHit]:
+        expression = self._match_expression(query)
+        if not expression:
+            return []
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT entries.topic, entries.subtopic, bm25(entries_fts, 2.0, 1.0) AS rank "
+                "FROM entries_fts JOIN entries ON entries.rowid = entries_fts.rowid "
+                "WHERE entries_fts MATCH ? ORDER BY rank LIMIT ?",
+                (expression, -1 if top_k is None else top_k)
+            ).fetchall()
+
+        # FTS5 reports BM25 as a negative number where lower is better
+        return [
+            ((topic, None if subtopic == self.WHOLE_TOPIC else subtopic), -rank)
+            for topic, subtopic, rank in rows
+        ]
+
+
+def build_sqlite_store(source: str, path: str) -> SQLiteKnowledgeBaseStore:
+    """
+    Build a SQLite knowledge base from a JSON file.
+
+    Args:
+        source: Path of a JSON file mapping topics to their content
+        path: Path of the SQLite database to create or update
+
+    Returns:
+        The populated store
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        topics = json.load(f)
+
+    store = SQLiteKnowledgeBaseStore(path)
+    store.put_topics(topics)
+    logger.info(f"Imported {len(topics)} topics into {path}")
+    return store
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    """Build a SQLite knowledge base from the command line."""
+    args = list(sys.argv[1:] if argv is None else argv)
+    if len(args) != 2:
+        print("Usage: python -m mcp_server.storage <source.json> <database.db>", file=sys.stderr)
+        sys.exit(2)
+
+    logging.basicConfig(level=logging.INFO)
+    build_sqlite_store(args[0], args[1]).close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Streaming accumulators for chunked data analysis.
+
+Each accumulator consumes a column (or several) one chunk at a time in
+constant memory and can be merged with another accumulator of the same kind,
+so statistics over data larger than memory are computed in a single pass.
+"""
+
+import math
+import warnings
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+class MomentAccumulator:
+    """
+    Running count, mean, variance, minimum and maximum of one column.
+
+    Chunks are combined with the pairwise form of Welford's algorithm (Chan et
+    al.), which stays numerically stable for long streams.
+    """
+
+    def __init__(self):
+        """Initialize an empty accumulator."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a chunk of values; NaNs are ignored.
+
+        Args:
+            values: One-dimensional array of values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+
+        chunk = MomentAccumulator()
+        chunk.count = int(values.size)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.minimum = float(values.min())
+        chunk.maximum = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other: "MomentAccumulator") -> None:
+        """
+        Fold another accumulator into this one.
+
+        Args:
+            other: Accumulator over disjoint data
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), NaN with fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)."""
+        return math.sqrt(self.variance)
+
+
+class TDigest:
+    """
+    Merging t-digest for approximate quantiles (Dunning and Ertl).
+
+    Values are kept as weighted centroids whose size shrinks towards the
+    tails, so extreme quantiles stay accurate while memory is bounded by the
+    compression parameter.
+    """
+
+    def __init__(self, compression: float = 200.0):
+        """
+        Initialize an empty digest.
+
+        Args:
+            compression: Roughly the maximum number of centroids kept
+        """
+        self.compression = compression
+        self.count = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a chunk of values; NaNs are ignored.
+
+        Args:
+            values: One-dimensional array of values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._compress(
+            np.concatenate([self._means, values]),
+            np.concatenate([self._weights, np.ones(values.size)])
+        )
+
+    def merge(self, other: "TDigest") -> None:
+        """
+        Fold another digest into this one.
+
+        Args:
+            other: Digest over disjoint data
+        """
+        if not other.count:
+            return
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress(
+            np.concatenate([self._means, other._means]),
+            np.concatenate([self._weights, other._weights])
+        )
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        """Merge sorted points into centroids bounded by the k1 scale function."""
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+        total = weights.sum()
+
+        # Map each point's quantile to the arcsine scale; points falling in
+        # the same unit interval of that scale are merged into one centroid.
+        quantiles = (np.cumsum(weights) - weights / 2.0) / total
+        scale = self.compression / (2.0 * math.pi) * np.arcsin(2.0 * quantiles - 1.0)
+        buckets = np.floor(scale - scale[0]).astype(np.int64)
+        _, buckets = np.unique(buckets, return_inverse=True)
+
+        merged_weights = np.bincount(buckets, weights=weights)
+        self._means = np.bincount(buckets, weights=weights * means) / merged_weights
+        self._weights = merged_weights
+        self.count = float(total)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, NaN if the digest is empty
+        """
+        if not self.count:
+            return math.nan
+
+        positions = np.cumsum(self._weights) - self._weights / 2.0
+        positions = np.concatenate([[0.0], positions, [self.count]])
+        values = np.concatenate([[self.minimum], self._means, [self.maximum]])
+        return float(np.interp(q * self.count, positions, values))
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[float, float]:
+        """
+        Estimate several quantiles.
+
+        Args:
+            qs: Quantiles between 0 and 1
+
+        Returns:
+            Mapping from quantile to estimated value
+        """
+        return {q: self.quantile(q) for q in qs}
+
+
+class CorrelationAccumulator:
+    """
+    Running pairwise co-moments of several columns.
+
+    For every pair of columns the accumulator keeps the sums needed for the
+    Pearson coefficient over the rows where both values are present, matching
+    pandas' pairwise handling of missing data. Values are shifted by a
+    per-column reference taken from the first chunk to keep the sums well
+    conditioned. All sums are additive, so chunks and accumulators combine by
+    addition and every update is a handful of matrix products.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            columns: Names of the columns to correlate
+        """
+        self.columns = list(columns)
+        self._positions = {column: i for i, column in enumerate(self.columns)}
+        size = len(self.columns)
+        self._shift: Optional[np.ndarray] = None
+        self._count = np.zeros((size, size))
+        self._sum = np.zeros((size, size))
+        self._sum_squares = np.zeros((size, size))
+        self._sum_products = np.zeros((size, size))
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a chunk of rows.
+
+        Args:
+            values: Two-dimensional array with one column per accumulator column
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return
+
+        present = ~np.isnan(values)
+        if self._shift is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                self._shift = np.nan_to_num(np.nanmean(values, axis=0))
+
+        shifted = np.where(present, values - self._shift, 0.0)
+        mask = present.astype(np.float64)
+
+        # Entry (i, j) sums over rows where columns i and j are both present
+        self._count += mask.T @ mask
+        self._sum += shifted.T @ mask
+        self._sum_squares += (shifted * shifted).T @ mask
+        self._sum_products += shifted.T @ shifted
+
+    def merge(self, other: "CorrelationAccumulator") -> None:
+        """
+        Fold another accumulator over the same columns into this one.
+
+        Args:
+            other: Accumulator over disjoint data
+        """
+        if other._shift is None:
+            return
+        if self._shift is None:
+            self._shift = other._shift.copy()
+            self._count = other._count.copy()
+            self._sum = other._sum.copy()
+            self._sum_squares = other._sum_squares.copy()
+            self._sum_products = other._sum_products.copy()
+            return
+
+        # Re-center the other sums on this accumulator's reference values
+        d = other._shift - self._shift
+        count = other._count
+        column_sums = other._sum + count * d[:, None]
+        self._sum_squares += other._sum_squares + 2.0 * d[:, None] * other._sum + count * (d[:, None] ** 2)
+        self._sum_products += (
+            other._sum_products
+            + d[:, None] * other._sum.T
+            + other._sum * d[None, :]
+            + count * np.outer(d, d)
+        )
+        self._sum += column_sums
+        self._count += count
+
+    def matrix(self) -> np.ndarray:
+        """
+        Compute the Pearson correlation matrix.
+
+        Returns:
+            Square matrix indexed like ``columns``; NaN where undefined
+        """
+        count = self._count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            covariance = self._sum_products - self._sum * self._sum.T / count
+            variance = self._sum_squares - self._sum ** 2 / count
+            correlation = covariance / np.sqrt(variance * variance.T)
+        correlation[count < 2] = np.nan
+        diagonal = np.diag_indices_from(correlation)
+        correlation[diagonal] = np.where(np.isnan(correlation[diagonal]), np.nan, 1.0)
+        return np.clip(correlation, -1.0, 1.0)
+
+    def correlation(self, column1: str, column2: str) -> float:
+        """
+        Compute the Pearson correlation of two columns.
+
+        Args:
+            column1: First column name
+            column2: Second column name
+
+        Returns:
+            Correlation coefficient, NaN where undefined
+        """
+        i = self._positions[column1]
+        j = self._positions[column2]
+        return float(self.matrix()[i, j])
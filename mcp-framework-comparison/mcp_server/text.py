@@ -0,0 +1,362 @@
+"""
+Text processing for the document processing tools.
+
+The functions here make a single pass over their input with precompiled
+tables and keep only what they need (word counts, a bounded heap), so they
+stay fast on inputs of several megabytes. NumPy is imported on the first
+summary, so importing this module stays cheap.
+"""
+
+import heapq
+import math
+import re
+import string
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Punctuation that separates words; hyphens and apostrophes are kept so that
+# "pre-trained" and "don't" stay one word
+_SEPARATORS = (set(string.punctuation) - set("-'")) | set("\u2018\u201c\u201d\u2013\u2014\u2026\u00ab\u00bb")
+_WORD_TABLE = str.maketrans({character: " " for character in _SEPARATORS})
+
+# Characters trimmed from the ends of words
+_WORD_EDGES = "-'\u2019"
+
+# Words never reported as keywords
+KEYWORD_STOPWORDS = frozenset({
+    "a", "about", "after", "also", "an", "and", "are", "as", "at", "be", "been",
+    "but", "by", "can", "could", "does", "each", "for", "from", "have", "into",
+    "just", "like", "more", "most", "only", "or", "other", "over", "some",
+    "such", "than", "that", "the", "their", "them", "then", "there", "these",
+    "they", "this", "those", "to", "very", "want", "were", "what", "when",
+    "where", "which", "while", "will", "with", "would", "your", "in", "on"
+})
+
+# Keywords are at least this many characters long
+MIN_KEYWORD_LENGTH = 4
+
+# Keyword scoring modes
+FREQUENCY = "frequency"
+TFIDF = "tfidf"
+KEYWORD_MODES = (FREQUENCY, TFIDF)
+
+
+def count_words(text: str) -> Counter:
+    """
+    Count the candidate keywords of a text.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Counter of lowercase words, without stopwords and short words
+    """
+    # Translating and splitting run in C; only distinct words are filtered in
+    # Python
+    counts = Counter(text.lower().translate(_WORD_TABLE).split())
+    words: Counter = Counter()
+    for word, count in counts.items():
+        word = word.strip(_WORD_EDGES)
+        if len(word) >= MIN_KEYWORD_LENGTH and word not in KEYWORD_STOPWORDS:
+            words[word] += count
+    return words
+
+
+def document_frequencies(texts: Iterable[str]) -> Tuple[Counter, int]:
+    """
+    Count in how many texts of a corpus each candidate keyword occurs.
+
+    Args:
+        texts: Texts of the corpus
+
+    Returns:
+        Tuple of (document frequency of every word, number of texts)
+    """
+    frequencies: Counter = Counter()
+    count = 0
+    for text in texts:
+        frequencies.update(count_words(text).keys())
+        count += 1
+    return frequencies, count
+
+
+def top_keywords(
+    text: str,
+    max_keywords: int = 5,
+    mode: str = FREQUENCY,
+    corpus: Optional[Tuple[Counter, int]] = None
+) -> List[Dict[str, object]]:
+    """
+    Extract the top keywords of a text.
+
+    In frequency mode keywords are ranked by how often they occur. In TF-IDF
+    mode the count is weighted by the smoothed inverse document frequency of
+    the word in a corpus, so words common to every document rank lower.
+
+    Args:
+        text: Text to extract keywords from
+        max_keywords: Maximum number of keywords
+        mode: "frequency" or "tfidf"
+        corpus: Document frequencies and corpus size, as returned by
+            ``document_frequencies``; required in TF-IDF mode
+
+    Returns:
+        List of keywords, best first, each with its frequency (and score in
+        TF-IDF mode); ties keep the order of first occurrence
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"Unknown keyword mode '{mode}'; expected one of {', '.join(KEYWORD_MODES)}")
+
+    counts = count_words(text)
+    if mode == FREQUENCY:
+        top = heapq.nlargest(max_keywords, counts.items(), key=lambda item: item[1])
+        return [{"word": word, "frequency": frequency} for word, frequency in top]
+
+    frequencies, size = corpus if corpus is not None else (Counter(), 0)
+    scores = {
+        word: frequency * (math.log((1 + size) / (1 + frequencies.get(word, 0))) + 1.0)
+        for word, frequency in counts.items()
+    }
+    top = heapq.nlargest(max_keywords, scores.items(), key=lambda item: item[1])
+    return [{"word": word, "frequency": counts[word], "score": round(score, 4)} for word, score in top]
+
+
+# Sentence boundaries: end punctuation (not after a list number) followed by
+# whitespace, blank lines, and line breaks before Markdown headings, list
+# items and code fences
+SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[^\d\s][.!?])\s+(?=[\"'(\[]?[A-Z0-9#*])"
+    r"|\n[ \t]*\n\s*"
+    r"|\n(?=[ \t]*(?:#|[-*+][ \t]|\d+\.[ \t]|```))"
+)
+
+# Fenced code blocks, left out of summaries; an unclosed fence runs to the end
+CODE_BLOCK_PATTERN = re.compile(r"```.*?(?:```|\Z)", re.DOTALL)
+
+# Sentences shorter than this many words, and headings, are not picked for
+# summaries
+MIN_SENTENCE_WORDS = 4
+
+# Texts longer than this many characters are summarized as a stream
+STREAMING_THRESHOLD = 1_000_000
+
+# Characters segmented and scored at a time in streaming mode, and number of
+# best sentences carried over from earlier blocks
+STREAM_BLOCK_SIZE = 256_000
+STREAM_CANDIDATES = 256
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences with collapsed whitespace.
+
+    Fenced code blocks are dropped.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        List of non-empty sentences
+    """
+    sentences = []
+    for sentence in SENTENCE_BOUNDARY.split(CODE_BLOCK_PATTERN.sub("\n\n", text)):
+        sentence = " ".join(sentence.split())
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+
+def _sentence_terms(sentence: str) -> List[str]:
+    """Return the terms of a sentence that count towards its score."""
+    return [
+        word for word in (token.strip(_WORD_EDGES) for token in sentence.lower().translate(_WORD_TABLE).split())
+        if len(word) >= MIN_KEYWORD_LENGTH and word not in KEYWORD_STOPWORDS
+    ]
+
+
+def score_sentences(
+    terms: List[List[str]],
+    corpus: Optional[Tuple[Counter, Counter, int]] = None
+) -> "np.ndarray":
+    """
+    Score sentences by their cosine similarity to the text centroid.
+
+    Sentences and the centroid are TF-IDF vectors, with the sentences as the
+    documents; all sums are computed with NumPy over the flat token arrays.
+
+    Args:
+        terms: Terms of each sentence
+        corpus: Term frequencies, sentence frequencies and number of
+            sentences of the whole text, when scoring a subset of its
+            sentences; computed from ``terms`` if omitted
+
+    Returns:
+        Array of scores, one per sentence
+    """
+    import numpy as np
+
+    vocabulary: Dict[str, int] = {}
+    term_ids = np.fromiter(
+        (vocabulary.setdefault(term, len(vocabulary)) for sentence in terms for term in sentence),
+        dtype=np.int64
+    )
+    lengths = np.fromiter((len(sentence) for sentence in terms), dtype=np.int64, count=len(terms))
+    sentence_ids = np.repeat(np.arange(len(terms)), lengths)
+    size = len(vocabulary)
+    if not size:
+        return np.zeros(len(terms))
+
+    # Count every (sentence, term) pair once
+    pairs, pair_counts = np.unique(sentence_ids * size + term_ids, return_counts=True)
+    pair_sentences, pair_terms = np.divmod(pairs, size)
+
+    if corpus is None:
+        frequencies = np.bincount(term_ids, minlength=size).astype(float)
+        sentence_frequencies = np.bincount(pair_terms, minlength=size)
+        count = len(terms)
+    else:
+        term_counts, sentence_counts, count = corpus
+        words = list(vocabulary)
+        frequencies = np.array([term_counts[word] for word in words], dtype=float)
+        sentence_frequencies = np.array([sentence_counts[word] for word in words])
+
+    idf = np.log((1.0 + count) / (1.0 + sentence_frequencies)) + 1.0
+    dots = np.bincount(sentence_ids, weights=(frequencies * idf * idf)[term_ids], minlength=len(terms))
+    norms = np.sqrt(np.bincount(pair_sentences, weights=(pair_counts * idf[pair_terms]) ** 2, minlength=len(terms)))
+    return np.divide(dots, norms, out=np.zeros(len(terms)), where=norms > 0)
+
+
+def select_sentences(sentences: List[str], scores: Iterable[float], max_words: int) -> str:
+    """
+    Pick the best sentences that fit in a word budget.
+
+    Args:
+        sentences: Candidate sentences, in text order
+        scores: Score of each sentence
+        max_words: Maximum number of words in the result
+
+    Returns:
+        The picked sentences in text order, each distinct sentence at most
+        once; the best sentence cut to the budget if no sentence fits
+    """
+    lengths = [len(sentence.split()) for sentence in sentences]
+    ranked = sorted(
+        (
+            index for index, length in enumerate(lengths)
+            if length >= MIN_SENTENCE_WORDS and not sentences[index].startswith("#")
+        ),
+        key=lambda index: -scores[index]
+    ) or sorted(range(len(sentences)), key=lambda index: -scores[index])
+
+    picked = []
+    seen = set()
+    budget = max_words
+    for index in ranked:
+        # Repeated sentences (boilerplate, repeated headers) are picked once
+        if lengths[index] <= budget and sentences[index] not in seen:
+            picked.append(index)
+            seen.add(sentences[index])
+            budget -= lengths[index]
+            if budget < MIN_SENTENCE_WORDS:
+                break
+
+    if not picked:
+        if not ranked:
+            return ""
+        return " ".join(sentences[ranked[0]].split()[:max_words]) + "..."
+    return " ".join(sentences[index] for index in sorted(picked))
+
+
+def summarize_text(text: str, max_words: int = 100) -> str:
+    """
+    Summarize text with its most central sentences.
+
+    Args:
+        text: Text to summarize
+        max_words: Maximum number of words in the summary
+
+    Returns:
+        The summary; the text itself if it fits in the budget
+    """
+    # Splitting stops after the budget, so long texts are not tokenized here
+    if len(text.split(None, max_words)) <= max_words:
+        return text
+
+    if len(text) > STREAMING_THRESHOLD:
+        return summarize_stream(
+            (text[start:start + STREAM_BLOCK_SIZE] for start in range(0, len(text), STREAM_BLOCK_SIZE)),
+            max_words
+        )
+
+    sentences = split_sentences(text)
+    scores = score_sentences([_sentence_terms(sentence) for sentence in sentences])
+    return select_sentences(sentences, scores, max_words)
+
+
+def summarize_stream(pieces: Iterable[str], max_words: int = 100) -> str:
+    """
+    Summarize a text given as a stream of pieces, in bounded memory.
+
+    The stream is segmented and scored one block at a time, keeping only the
+    ``STREAM_CANDIDATES`` best sentences so far and the term statistics of
+    the whole text. The candidates are rescored against the centroid of the
+    whole text at the end.
+
+    Args:
+        pieces: Consecutive pieces of the text, such as document chunks
+        max_words: Maximum number of words in the summary
+
+    Returns:
+        The summary
+    """
+    # (score, position, sentence, terms) of the best sentences so far
+    candidates: List[Tuple[float, int, str, List[str]]] = []
+    term_counts: Counter = Counter()
+    sentence_counts: Counter = Counter()
+    position = 0
+
+    def consume(block: str) -> None:
+        nonlocal position
+        sentences = split_sentences(block)
+        terms = [_sentence_terms(sentence) for sentence in sentences]
+        for sentence_terms in terms:
+            term_counts.update(sentence_terms)
+            sentence_counts.update(set(sentence_terms))
+        scores = score_sentences(terms)
+        for sentence, sentence_terms, score in zip(sentences, terms, scores):
+            entry = (float(score), position, sentence, sentence_terms)
+            if len(candidates) < STREAM_CANDIDATES:
+                heapq.heappush(candidates, entry)
+            elif entry[0] > candidates[0][0]:
+                heapq.heapreplace(candidates, entry)
+            position += 1
+
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) < STREAM_BLOCK_SIZE:
+            continue
+        # Keep the last, possibly incomplete, sentence for the next block
+        boundaries = list(SENTENCE_BOUNDARY.finditer(buffer, max(0, len(buffer) - STREAM_BLOCK_SIZE // 2)))
+        cut = boundaries[-1].end() if boundaries else len(buffer)
+        if buffer.count("```", 0, cut) % 2:
+            # Never cut inside a code block; keep it whole for the next block
+            # unless it fills the buffer
+            cut = buffer.rfind("```", 0, cut) or cut
+        consume(buffer[:cut])
+        buffer = buffer[cut:]
+    if buffer:
+        consume(buffer)
+
+    candidates.sort(key=lambda entry: entry[1])
+    scores = score_sentences(
+        [entry[3] for entry in candidates],
+        corpus=(term_counts, sentence_counts, position)
+    )
+    return select_sentences([entry[2] for entry in candidates], scores, max_words)
@@ -3,15 +3,30 @@ Tools implementation for the MCP server.
 
 This module defines the tools that the MCP server provides to clients.
 Each tool represents a specific capability that can be invoked by clients.
+
+pandas, NumPy and the sample dataset are loaded on the first call of a tool
+that needs them, so importing this module (and starting the server) stays
+cheap for clients that only use the knowledge base or document tools.
 """
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
-import pandas as pd
-import numpy as np
+import os
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+from mcp_server.execution import PROCESS, THREAD
+from mcp_server.gazetteer import Gazetteer
+from mcp_server.registry import tool
+from mcp_server.storage import InMemoryKnowledgeBaseStore, KnowledgeBaseStore, SQLiteKnowledgeBaseStore
+from mcp_server.text import FREQUENCY, KEYWORD_MODES, TFIDF, document_frequencies, summarize_text, top_keywords
+
+if TYPE_CHECKING:
+    import pandas as pd
+    
+    from mcp_server.dataset import Dataset
+
 logger = logging.getLogger(__name__)
 
 # Sample knowledge base for demonstration purposes
@@ -50,9 +65,44 @@ KNOWLEDGE_BASE = {
     }
 }
 
+# Environment variable pointing at a SQLite knowledge base built with
+# ``python -m mcp_server.storage``; the literal above is used when unset.
+KNOWLEDGE_BASE_DB_ENV = "MCP_KNOWLEDGE_BASE_DB"
+
+_knowledge_base_store: Optional[KnowledgeBaseStore] = None
+
+
+def get_knowledge_base_store() -> KnowledgeBaseStore:
+    """Return the active knowledge base store, creating it on first use."""
+    global _knowledge_base_store
+    
+    if _knowledge_base_store is None:
+        path = os.environ.get(KNOWLEDGE_BASE_DB_ENV)
+        if path:
+            logger.info(f"Using SQLite knowledge base at {path}")
+            _knowledge_base_store = SQLiteKnowledgeBaseStore(path)
+        else:
+            _knowledge_base_store = InMemoryKnowledgeBaseStore(KNOWLEDGE_BASE)
+    
+    return _knowledge_base_store
+
+
+def set_knowledge_base_store(store: Optional[KnowledgeBaseStore]) -> None:
+    """
+    Replace the active knowledge base store.
+    
+    Args:
+        store: The store to use, or None to recreate the default on next use
+    """
+    global _knowledge_base_store
+    _knowledge_base_store = store
+
 # Sample dataset for data analysis
-def generate_sample_data() -> pd.DataFrame:
+def generate_sample_data() -> "pd.DataFrame":
     """Generate a sample dataset for demonstration purposes."""
+    import numpy as np
+    import pandas as pd
+    
     np.random.seed(42)
     dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
     
@@ -67,12 +117,229 @@ def generate_sample_data() -> pd.DataFrame:
     
     return pd.DataFrame(data)
 
-SAMPLE_DATA = generate_sample_data()
+_sample_data: Optional["pd.DataFrame"] = None
+
+
+def get_sample_data() -> "pd.DataFrame":
+    """Return the sample dataset, generating it on first use."""
+    global _sample_data
+    
+    if _sample_data is None:
+        _sample_data = generate_sample_data()
+    
+    return _sample_data
+
+
+def __getattr__(name: str) -> Any:
+    """Generate SAMPLE_DATA lazily on first access (PEP 562)."""
+    if name == "SAMPLE_DATA":
+        return get_sample_data()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Environment variables pointing at a CSV or Parquet file to analyze in
+# chunks instead of the sample data, and the CSV columns holding dates
+DATASET_PATH_ENV = "MCP_DATASET_PATH"
+DATASET_DATE_COLUMNS_ENV = "MCP_DATASET_DATE_COLUMNS"
+
+_dataset: Optional["Dataset"] = None
+
+
+def get_dataset() -> "Dataset":
+    """Return the active dataset, creating it on first use."""
+    global _dataset
+    
+    if _dataset is None:
+        from mcp_server.dataset import ChunkedDataset, InMemoryDataset
+        
+        path = os.environ.get(DATASET_PATH_ENV)
+        if path:
+            logger.info(f"Using chunked dataset at {path}")
+            date_columns = [c for c in os.environ.get(DATASET_DATE_COLUMNS_ENV, "").split(",") if c]
+            _dataset = ChunkedDataset(path, parse_dates=date_columns)
+        else:
+            _dataset = InMemoryDataset(get_sample_data())
+    
+    return _dataset
+
+
+def set_dataset(dataset: Optional["Dataset"]) -> None:
+    """
+    Replace the active dataset.
+    
+    Args:
+        dataset: The dataset to use, or None to fall back to the sample data
+    """
+    global _dataset
+    _dataset = dataset
+
+# Seconds a response of a pure tool may be served from the response cache.
+# Responses are also keyed on the data version, so changes made through the
+# server invalidate them immediately; the TTL bounds staleness otherwise.
+KNOWLEDGE_BASE_CACHE_TTL = 300.0
+DATA_ANALYSIS_CACHE_TTL = 300.0
+DOCUMENT_PROCESSING_CACHE_TTL = 3600.0
+
+# Data analysis runs NumPy/pandas code that releases the GIL, so it uses the
+# thread pool; at most this many calls run at once so cheaper tools are not
+# starved. Document processing is pure-Python CPU work and uses the process
+# pool, except entity extraction: its gazetteer can be replaced at runtime
+# with set_entity_gazetteer, which process workers would not see, so it runs
+# in the thread pool. Knowledge base tools query the store, which may be a
+# large SQLite database on disk, so they also run in the thread pool and a
+# slow search does not stall other sessions.
+DATA_ANALYSIS_MAX_CONCURRENCY = 2
+
+# Maximum number of texts in one call of a batch document processing tool
+MAX_BATCH_TEXTS = 1000
+
+# JSON schema of the texts argument of the batch tools
+BATCH_TEXTS_SCHEMA = {
+    "type": "array",
+    "items": {"type": "string"},
+    "maxItems": MAX_BATCH_TEXTS,
+    "description": "The texts to process"
+}
+
+
+# Entity dictionaries matched by document_processing_extract_entities
+ENTITY_DICTIONARY = {
+    "dates": [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December"
+    ],
+    "organizations": [
+        "Microsoft", "Microsoft Research", "Google", "Google DeepMind", "Apple", "Amazon",
+        "Facebook", "Meta", "OpenAI", "Anthropic", "Hugging Face", "IBM", "NVIDIA"
+    ],
+    "locations": [
+        "USA", "United States", "UK", "United Kingdom", "China", "India", "Russia",
+        "Germany", "France", "Japan", "New York", "San Francisco", "London", "Paris"
+    ]
+}
+ENTITY_CATEGORIES = ("people", "organizations", "locations", "dates", "misc")
+
+# Comma-separated dictionary files added to the built-in entities (JSON
+# files mapping categories to names, or <category>.txt files)
+ENTITY_GAZETTEERS_ENV = "MCP_ENTITY_GAZETTEERS"
+
+# Capitalized words ending like these are reported as people
+PEOPLE_SUFFIXES = ("son", "man", "berg", "ton")
+
+_entity_gazetteer: Optional[Gazetteer] = None
+
+
+def get_entity_gazetteer() -> Gazetteer:
+    """Return the entity gazetteer, compiling it on first use."""
+    global _entity_gazetteer
+    
+    if _entity_gazetteer is None:
+        gazetteer = Gazetteer()
+        for category, names in ENTITY_DICTIONARY.items():
+            gazetteer.add_names(names, category)
+        for path in filter(None, os.environ.get(ENTITY_GAZETTEERS_ENV, "").split(",")):
+            gazetteer.load(path.strip())
+        _entity_gazetteer = gazetteer
+    
+    return _entity_gazetteer
+
+
+def set_entity_gazetteer(gazetteer: Optional[Gazetteer]) -> None:
+    """
+    Replace the entity gazetteer.
+    
+    Args:
+        gazetteer: The gazetteer to use, or None to rebuild the default on
+            next use
+    """
+    global _entity_gazetteer
+    _entity_gazetteer = gazetteer
+
+
+_corpus_frequencies: Optional[Tuple[Counter, int]] = None
+
+
+def get_corpus_frequencies() -> Tuple[Counter, int]:
+    """Return the document frequencies of the built-in documents, for TF-IDF."""
+    global _corpus_frequencies
+    
+    if _corpus_frequencies is None:
+        from mcp_server.resources import DOCUMENTS
+        _corpus_frequencies = document_frequencies(document["content"] for document in DOCUMENTS.values())
+    
+    return _corpus_frequencies
+
+
+def process_batch(texts: Any, process: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply a document processing function to each text of a batch.
+    
+    Args:
+        texts: List of texts
+        process: Function returning the result for one text
+        
+    Returns:
+        Dictionary with the result of each text, in order; a text that is not
+        a string or fails gets an error result of its own
+    """
+    if not isinstance(texts, list):
+        return {"error": "texts must be a list of strings"}
+    if len(texts) > MAX_BATCH_TEXTS:
+        return {"error": f"At most {MAX_BATCH_TEXTS} texts can be processed per call"}
+    
+    results = []
+    for text in texts:
+        if not isinstance(text, str):
+            results.append({"error": f"Expected a string, got {type(text).__name__}"})
+            continue
+        try:
+            results.append(process(text))
+        except Exception as e:
+            logger.exception("Error processing a batch item")
+            results.append({"error": str(e)})
+    
+    return {"results": results}
+
+
+def knowledge_base_version() -> Any:
+    """Return the version of the active knowledge base store."""
+    store = get_knowledge_base_store()
+    return (id(store), store.version)
+
+
+def entity_gazetteer_version() -> Any:
+    """Return the version of the active entity gazetteer."""
+    gazetteer = get_entity_gazetteer()
+    return (id(gazetteer), gazetteer.version)
+
+
+def dataset_version() -> Any:
+    """Return the version of the active dataset."""
+    dataset = get_dataset()
+    return (id(dataset), dataset.version)
+
 
 class KnowledgeBaseTool:
     """Tool for accessing the knowledge base."""
     
     @staticmethod
+    @tool(
+        name="knowledge_base_get_info",
+        description="Get information from the knowledge base",
+        properties={
+            "topic": {
+                "type": "string",
+                "description": "The main topic to retrieve information about"
+            },
+            "subtopic": {
+                "type": "string",
+                "description": "Optional subtopic for more specific information"
+            }
+        },
+        required=["topic"],
+        cache_ttl=KNOWLEDGE_BASE_CACHE_TTL,
+        cache_version=knowledge_base_version,
+        execution=THREAD
+    )
     def get_info(topic: str, subtopic: Optional[str] = None) -> Dict[str, Any]:
         """
         Get information from the knowledge base.
@@ -84,15 +351,27 @@ class KnowledgeBaseTool:
         Returns:
             Dictionary containing the requested information
         """
-        if topic not in KNOWLEDGE_BASE:
-            return {"error": f"Topic '{topic}' not found in knowledge base"}
+        store = get_knowledge_base_store()
         
-        if subtopic and subtopic in KNOWLEDGE_BASE[topic]:
-            return {subtopic: KNOWLEDGE_BASE[topic][subtopic]}
+        if subtopic:
+            subtopic_data = store.get_subtopic(topic, subtopic)
+            if subtopic_data is not None:
+                return {subtopic: subtopic_data}
         
-        return KNOWLEDGE_BASE[topic]
+        topic_data = store.get_topic(topic)
+        if topic_data is None:
+            return {"error": f"Topic '{topic}' not found in knowledge base"}
+        
+        return topic_data
     
     @staticmethod
+    @tool(
+        name="knowledge_base_list_topics",
+        description="List all available topics in the knowledge base",
+        cache_ttl=KNOWLEDGE_BASE_CACHE_TTL,
+        cache_version=knowledge_base_version,
+        execution=THREAD
+    )
     def list_topics() -> List[str]:
         """
         List all available topics in the knowledge base.
@@ -100,61 +379,92 @@ class KnowledgeBaseTool:
         Returns:
             List of available topics
         """
-        return list(KNOWLEDGE_BASE.keys())
+        return get_knowledge_base_store().list_topics()
     
     @staticmethod
-    def search(query: str) -> Dict[str, Any]:
+    @tool(
+        name="knowledge_base_search",
+        description="Search the knowledge base for a query",
+        properties={
+            "query": {
+                "type": "string",
+                "description": "The search query"
+            },
+            "top_k": {
+                "type": "integer",
+                "description": "Maximum number of results to return"
+            }
+        },
+        required=["query"],
+        cache_ttl=KNOWLEDGE_BASE_CACHE_TTL,
+        cache_version=knowledge_base_version,
+        execution=THREAD
+    )
+    def search(query: str, top_k: int = 10) -> Dict[str, Any]:
         """
         Search the knowledge base for a query.
         
+        Results are ranked with BM25 by the knowledge base store; topics and
+        subtopics appear in order of relevance.
+        
         Args:
             query: The search query
+            top_k: Maximum number of entries to return
             
         Returns:
             Dictionary containing search results
         """
+        store = get_knowledge_base_store()
         results = {}
-        query = query.lower()
-        
-        def search_value(value: Any, query: str) -> bool:
-            """Helper function to search through values recursively."""
-            if isinstance(value, str):
-                return query in value.lower()
-            elif isinstance(value, list):
-                return any(search_value(item, query) for item in value)
-            elif isinstance(value, dict):
-                return any(search_value(v, query) for v in value.values())
-            return False
-        
-        for topic, topic_data in KNOWLEDGE_BASE.items():
-            if isinstance(topic_data, dict):
-                # For ai_frameworks, search through each framework
-                if topic == "ai_frameworks":
-                    matching_frameworks = {}
-                    for framework, framework_data in topic_data.items():
-                        # Check framework name
-                        if query in framework.lower():
-                            matching_frameworks[framework] = framework_data
-                            continue
-                            
-                        # Check framework data
-                        if search_value(framework_data, query):
-                            matching_frameworks[framework] = framework_data
-                    
-                    if matching_frameworks:
-                        results["ai_frameworks"] = matching_frameworks
-                else:
-                    # For other topics, check if any value matches
-                    if search_value(topic_data, query):
-                        results[topic] = topic_data
+        
+        for (topic, subtopic), _ in store.search(query, top_k=top_k):
+            if subtopic is None:
+                results[topic] = store.get_topic(topic)
+            else:
+                results.setdefault(topic, {})[subtopic] = store.get_subtopic(topic, subtopic)
         
         return results
+    
+    @staticmethod
+    def update_topic(topic: str, data: Any) -> None:
+        """
+        Add or replace a topic in the knowledge base.
+        
+        Args:
+            topic: The topic to add or replace
+            data: The topic content
+        """
+        get_knowledge_base_store().put_topic(topic, data)
+    
+    @staticmethod
+    def remove_topic(topic: str) -> None:
+        """
+        Remove a topic from the knowledge base.
+        
+        Args:
+            topic: The topic to remove
+        """
+        get_knowledge_base_store().delete_topic(topic)
 
 
 class DataAnalysisTool:
     """Tool for analyzing and visualizing data."""
     
     @staticmethod
+    @tool(
+        name="data_analysis_get_summary_statistics",
+        description="Get summary statistics for the dataset",
+        properties={
+            "column": {
+                "type": "string",
+                "description": "Optional column name to get statistics for"
+            }
+        },
+        cache_ttl=DATA_ANALYSIS_CACHE_TTL,
+        cache_version=dataset_version,
+        execution=THREAD,
+        max_concurrency=DATA_ANALYSIS_MAX_CONCURRENCY
+    )
     def get_summary_statistics(column: Optional[str] = None) -> Dict[str, Any]:
         """
         Get summary statistics for the dataset.
@@ -165,83 +475,132 @@ class DataAnalysisTool:
         Returns:
             Dictionary containing summary statistics
         """
-        if column and column not in SAMPLE_DATA.columns:
+        dataset = get_dataset()
+        
+        if column and column not in dataset.columns:
             return {"error": f"Column '{column}' not found in dataset"}
         
+        # Statistics for all numeric columns are computed in one pass and
+        # cached until the dataset changes
+        statistics = dataset.column_statistics()
+        
         if column:
-            return {
-                "count": int(SAMPLE_DATA[column].count()),
-                "mean": float(SAMPLE_DATA[column].mean()),
-                "std": float(SAMPLE_DATA[column].std()),
-                "min": float(SAMPLE_DATA[column].min()),
-                "25%": float(SAMPLE_DATA[column].quantile(0.25)),
-                "50%": float(SAMPLE_DATA[column].quantile(0.5)),
-                "75%": float(SAMPLE_DATA[column].quantile(0.75)),
-                "max": float(SAMPLE_DATA[column].max())
-            }
+            if column not in statistics:
+                return {"error": f"Column '{column}' is not numeric"}
+            return dict(statistics[column])
         
         # Return summary for all numeric columns
-        numeric_cols = SAMPLE_DATA.select_dtypes(include=['number']).columns
-        result = {}
-        
-        for col in numeric_cols:
-            result[col] = {
-                "count": int(SAMPLE_DATA[col].count()),
-                "mean": float(SAMPLE_DATA[col].mean()),
-                "std": float(SAMPLE_DATA[col].std()),
-                "min": float(SAMPLE_DATA[col].min()),
-                "max": float(SAMPLE_DATA[col].max())
-            }
-            
-        return result
+        return {
+            col: {key: stats[key] for key in ("count", "mean", "std", "min", "max")}
+            for col, stats in statistics.items()
+        }
     
     @staticmethod
-    def filter_data(column: str, operator: str, value: Union[str, int, float]) -> Dict[str, Any]:
+    @tool(
+        name="data_analysis_filter_data",
+        description="Filter the dataset based on a condition or a compound filter expression",
+        properties={
+            "column": {
+                "type": "string",
+                "description": "Column name to filter on"
+            },
+            "operator": {
+                "type": "string",
+                "description": "Comparison operator ('eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'between', 'in', 'contains')"
+            },
+            "value": {
+                "oneOf": [
+                    {"type": "string"},
+                    {"type": "number"},
+                    {"type": "array"}
+                ],
+                "description": "Value to compare against; a [low, high] pair for 'between' and a list for 'in'"
+            },
+            "where": {
+                "type": "object",
+                "description": (
+                    "Compound filter used instead of column/operator/value: a condition "
+                    "{\"column\", \"operator\", \"value\"} or {\"and\": [...]}, {\"or\": [...]}, {\"not\": {...}}"
+                )
+            }
+        },
+        cache_ttl=DATA_ANALYSIS_CACHE_TTL,
+        cache_version=dataset_version,
+        execution=THREAD,
+        max_concurrency=DATA_ANALYSIS_MAX_CONCURRENCY
+    )
+    def filter_data(
+        column: Optional[str] = None,
+        operator: Optional[str] = None,
+        value: Union[str, int, float, List[Any], None] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Filter the dataset based on a condition.
         
+        Either a single condition (column, operator, value) or a compound
+        filter expression (where) is given. Range conditions on numeric and
+        date columns are answered from sorted indexes built on first use.
+        
         Args:
             column: Column name to filter on
-            operator: Comparison operator ('eq', 'gt', 'lt', 'gte', 'lte', 'contains')
+            operator: Comparison operator ('eq', 'ne', 'gt', 'lt', 'gte', 'lte', 'between', 'in', 'contains')
             value: Value to compare against
+            where: Compound filter expression (see mcp_server.filters)
             
         Returns:
             Dictionary containing filtered data statistics
         """
-        if column not in SAMPLE_DATA.columns:
-            return {"error": f"Column '{column}' not found in dataset"}
+        from mcp_server.filters import compile_filter
         
-        operators = {
-            "eq": lambda x, y: x == y,
-            "gt": lambda x, y: x > y,
-            "lt": lambda x, y: x < y,
-            "gte": lambda x, y: x >= y,
-            "lte": lambda x, y: x <= y,
-            "contains": lambda x, y: y in str(x)
-        }
+        dataset = get_dataset()
         
-        if operator not in operators:
-            return {"error": f"Operator '{operator}' not supported"}
+        if where is None:
+            if column not in dataset.columns:
+                return {"error": f"Column '{column}' not found in dataset"}
+            where = {"column": column, "operator": operator, "value": value}
         
         try:
-            filtered_data = SAMPLE_DATA[operators[operator](SAMPLE_DATA[column], value)]
+            predicate = compile_filter(where)
+        except ValueError as e:
+            return {"error": str(e)}
+        
+        for name in sorted(predicate.columns):
+            if name not in dataset.columns:
+                return {"error": f"Column '{name}' not found in dataset"}
+        
+        try:
+            result = dataset.filter(predicate)
             
             return {
-                "count": len(filtered_data),
-                "columns": list(filtered_data.columns),
-                "sample": filtered_data.head(5).to_dict(orient="records"),
-                "summary": {
-                    col: {
-                        "mean": float(filtered_data[col].mean()) if pd.api.types.is_numeric_dtype(filtered_data[col]) else None,
-                        "min": float(filtered_data[col].min()) if pd.api.types.is_numeric_dtype(filtered_data[col]) else None,
-                        "max": float(filtered_data[col].max()) if pd.api.types.is_numeric_dtype(filtered_data[col]) else None
-                    } for col in filtered_data.select_dtypes(include=['number']).columns
-                }
+                "count": result.count,
+                "columns": result.columns,
+                "sample": result.sample.to_dict(orient="records"),
+                "summary": result.summary
             }
         except Exception as e:
             return {"error": f"Error filtering data: {str(e)}"}
     
     @staticmethod
+    @tool(
+        name="data_analysis_get_correlation",
+        description="Calculate correlation between two columns",
+        properties={
+            "column1": {
+                "type": "string",
+                "description": "First column name"
+            },
+            "column2": {
+                "type": "string",
+                "description": "Second column name"
+            }
+        },
+        required=["column1", "column2"],
+        cache_ttl=DATA_ANALYSIS_CACHE_TTL,
+        cache_version=dataset_version,
+        execution=THREAD,
+        max_concurrency=DATA_ANALYSIS_MAX_CONCURRENCY
+    )
     def get_correlation(column1: str, column2: str) -> Dict[str, Any]:
         """
         Calculate correlation between two columns.
@@ -253,14 +612,16 @@ class DataAnalysisTool:
         Returns:
             Dictionary containing correlation information
         """
-        if column1 not in SAMPLE_DATA.columns:
+        dataset = get_dataset()
+        
+        if column1 not in dataset.columns:
             return {"error": f"Column '{column1}' not found in dataset"}
         
-        if column2 not in SAMPLE_DATA.columns:
+        if column2 not in dataset.columns:
             return {"error": f"Column '{column2}' not found in dataset"}
         
         try:
-            correlation = SAMPLE_DATA[column1].corr(SAMPLE_DATA[column2])
+            correlation = dataset.correlation(column1, column2)
             
             return {
                 "correlation": float(correlation),
@@ -270,124 +631,271 @@ class DataAnalysisTool:
             return {"error": f"Error calculating correlation: {str(e)}"}
 
 
+    @staticmethod
+    @tool(
+        name="data_analysis_get_correlation_matrix",
+        description="Get the correlation matrix of all numeric columns",
+        properties={
+            "method": {
+                "type": "string",
+                "description": "Correlation method ('pearson' or 'spearman')"
+            }
+        },
+        cache_ttl=DATA_ANALYSIS_CACHE_TTL,
+        cache_version=dataset_version,
+        execution=THREAD,
+        max_concurrency=DATA_ANALYSIS_MAX_CONCURRENCY
+    )
+    def get_correlation_matrix(method: str = "pearson") -> Dict[str, Any]:
+        """
+        Get the correlation matrix of all numeric columns.
+        
+        Args:
+            method: Correlation method ('pearson' or 'spearman')
+            
+        Returns:
+            Dictionary containing the correlation matrix
+        """
+        try:
+            matrix = get_dataset().correlation_matrix(method or "pearson")
+        except ValueError as e:
+            return {"error": str(e)}
+        
+        return {
+            "method": method or "pearson",
+            "columns": matrix.columns,
+            "matrix": matrix.to_dict()
+        }
+
+
 class DocumentProcessingTool:
     """Tool for processing and extracting information from documents."""
     
     @staticmethod
+    @tool(
+        name="document_processing_extract_entities",
+        description="Extract entities from text",
+        properties={
+            "text": {
+                "type": "string",
+                "description": "The text to extract entities from"
+            }
+        },
+        required=["text"],
+        cache_ttl=DOCUMENT_PROCESSING_CACHE_TTL,
+        cache_version=entity_gazetteer_version,
+        execution=THREAD
+    )
     def extract_entities(text: str) -> Dict[str, Any]:
         """
         Extract entities from text.
         
+        Names in the entity dictionaries, including multi-word names, are
+        matched in one pass over the text; other capitalized words are
+        reported as people (by common surname suffixes) or misc.
+        
         Args:
             text: The text to extract entities from
             
         Returns:
             Dictionary containing extracted entities
         """
-        # This is a simplified implementation for demonstration purposes
-        entities = {
-            "people": [],
-            "organizations": [],
-            "locations": [],
-            "dates": [],
-            "misc": []
-        }
-        
-        # Simple pattern matching for demonstration
-        words = text.split()
-        
-        for word in words:
-            word = word.strip(".,!?():;\"'")
-            
-            # Check for capitalized words (potential named entities)
-            if word and word[0].isupper() and len(word) > 1:
-                if word in ["January", "February", "March", "April", "May", "June", 
-                           "July", "August", "September", "October", "November", "December"]:
-                    entities["dates"].append(word)
-                elif word in ["Microsoft", "Google", "Apple", "Amazon", "Facebook", "OpenAI", "Anthropic"]:
-                    entities["organizations"].append(word)
-                elif word in ["USA", "UK", "China", "India", "Russia", "Germany", "France", "Japan"]:
-                    entities["locations"].append(word)
-                else:
-                    # Simple heuristic: words ending with common name suffixes
-                    if any(word.endswith(suffix) for suffix in ["son", "man", "berg", "ton"]):
-                        entities["people"].append(word)
-                    else:
-                        entities["misc"].append(word)
-        
-        # Remove duplicates
-        for category in entities:
-            entities[category] = list(set(entities[category]))
-            
-        return entities
+        gazetteer = get_entity_gazetteer()
+        tokens = gazetteer.tokenize(text)
+        matches = gazetteer.find_tokens(tokens)
+        
+        # Unique entities in order of first occurrence
+        entities = {category: {} for category in ENTITY_CATEGORIES}
+        matched_tokens = Counter()
+        for first, last, category in matches:
+            entities.setdefault(category, {})[" ".join(tokens[first:last + 1])] = None
+            matched_tokens.update(tokens[first:last + 1])
+        
+        # Classify each distinct capitalized word occurring outside the matches
+        for word, count in Counter(tokens).items():
+            if len(word) > 1 and word[0].isupper() and count > matched_tokens[word]:
+                category = "people" if word.endswith(PEOPLE_SUFFIXES) else "misc"
+                entities[category][word] = None
+        
+        return {category: list(names) for category, names in entities.items()}
     
     @staticmethod
+    @tool(
+        name="document_processing_summarize",
+        description="Generate a summary of the text",
+        properties={
+            "text": {
+                "type": "string",
+                "description": "The text to summarize"
+            },
+            "max_length": {
+                "type": "integer",
+                "description": "Maximum length of the summary, in words"
+            }
+        },
+        required=["text"],
+        cache_ttl=DOCUMENT_PROCESSING_CACHE_TTL,
+        execution=PROCESS
+    )
     def summarize(text: str, max_length: int = 100) -> Dict[str, Any]:
         """
-        Generate a summary of the text.
+        Generate an extractive summary of the text.
+        
+        Sentences are scored by their TF-IDF similarity to the centroid of
+        the text, and the best ones that fit in the budget are returned in
+        text order. Very long texts are summarized as a stream in bounded
+        memory.
         
         Args:
             text: The text to summarize
-            max_length: Maximum length of the summary
+            max_length: Maximum length of the summary, in words
             
         Returns:
             Dictionary containing the summary
         """
-        # This is a simplified implementation for demonstration purposes
-        words = text.split()
-        
-        if len(words) <= max_length:
-            return {"summary": text}
-        
-        # Extract first and last sentences as a simple summary
-        sentences = text.split('.')
-        if len(sentences) >= 3:
-            summary = f"{sentences[0].strip()}. {sentences[1].strip()}."
-        else:
-            # Just take the first few words
-            summary = ' '.join(words[:max_length]) + "..."
-            
-        return {"summary": summary}
+        return {"summary": summarize_text(text, max_words=max_length)}
     
     @staticmethod
-    def extract_keywords(text: str, max_keywords: int = 5) -> Dict[str, Any]:
+    @tool(
+        name="document_processing_extract_keywords",
+        description="Extract keywords from text",
+        properties={
+            "text": {
+                "type": "string",
+                "description": "The text to extract keywords from"
+            },
+            "max_keywords": {
+                "type": "integer",
+                "description": "Maximum number of keywords to extract"
+            },
+            "mode": {
+                "type": "string",
+                "enum": list(KEYWORD_MODES),
+                "description": "Rank keywords by frequency, or by TF-IDF against the document collection"
+            }
+        },
+        required=["text"],
+        cache_ttl=DOCUMENT_PROCESSING_CACHE_TTL,
+        execution=PROCESS
+    )
+    def extract_keywords(text: str, max_keywords: int = 5, mode: str = FREQUENCY) -> Dict[str, Any]:
         """
         Extract keywords from text.
         
         Args:
             text: The text to extract keywords from
             max_keywords: Maximum number of keywords to extract
+            mode: "frequency" or "tfidf"
             
         Returns:
             Dictionary containing extracted keywords
         """
-        # This is a simplified implementation for demonstration purposes
-        common_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "with", "by", "about", "as"}
-        words = text.lower().split()
-        
-        # Remove punctuation
-        words = [word.strip(".,!?():;\"'") for word in words]
-        
-        # Filter out common words and short words
-        filtered_words = [word for word in words if word not in common_words and len(word) > 3]
+        mode = mode or FREQUENCY
+        corpus = get_corpus_frequencies() if mode == TFIDF else None
+        try:
+            keywords = top_keywords(text, max_keywords=max_keywords, mode=mode, corpus=corpus)
+        except ValueError as e:
+            return {"error": str(e)}
         
-        # Count word frequencies
-        word_counts = {}
-        for word in filtered_words:
-            if word in word_counts:
-                word_counts[word] += 1
-            else:
-                word_counts[word] = 1
+        return {
+            "keywords": keywords
+        }
+    
+    @staticmethod
+    @tool(
+        name="document_processing_extract_entities_batch",
+        description="Extract entities from each of a list of texts",
+        properties={
+            "texts": BATCH_TEXTS_SCHEMA
+        },
+        required=["texts"],
+        cache_ttl=DOCUMENT_PROCESSING_CACHE_TTL,
+        cache_version=entity_gazetteer_version,
+        execution=THREAD,
+        batch="texts"
+    )
+    def extract_entities_batch(texts: List[str]) -> Dict[str, Any]:
+        """
+        Extract entities from each of a list of texts.
         
-        # Sort by frequency
-        sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
+        Args:
+            texts: The texts to extract entities from
+            
+        Returns:
+            Dictionary with the entities of each text, in order
+        """
+        return process_batch(texts, DocumentProcessingTool.extract_entities)
+    
+    @staticmethod
+    @tool(
+        name="document_processing_summarize_batch",
+        description="Generate a summary of each of a list of texts",
+        properties={
+            "texts": BATCH_TEXTS_SCHEMA,
+            "max_length": {
+                "type": "integer",
+                "description": "Maximum length of each summary, in words"
+            }
+        },
+        required=["texts"],
+        cache_ttl=DOCUMENT_PROCESSING_CACHE_TTL,
+        execution=PROCESS,
+        batch="texts"
+    )
+    def summarize_batch(texts: List[str], max_length: int = 100) -> Dict[str, Any]:
+        """
+        Generate an extractive summary of each of a list of texts.
         
-        # Return top keywords
-        keywords = sorted_words[:max_keywords]
+        Args:
+            texts: The texts to summarize
+            max_length: Maximum length of each summary, in words
+            
+        Returns:
+            Dictionary with the summary of each text, in order
+        """
+        return process_batch(texts, lambda text: DocumentProcessingTool.summarize(text, max_length))
+    
+    @staticmethod
+    @tool(
+        name="document_processing_extract_keywords_batch",
+        description="Extract keywords from each of a list of texts",
+        properties={
+            "texts": BATCH_TEXTS_SCHEMA,
+            "max_keywords": {
+                "type": "integer",
+                "description": "Maximum number of keywords to extract per text"
+            },
+            "mode": {
+                "type": "string",
+                "enum": list(KEYWORD_MODES),
+                "description": "Rank keywords by frequency, or by TF-IDF against the document collection"
+            }
+        },
+        required=["texts"],
+        cache_ttl=DOCUMENT_PROCESSING_CACHE_TTL,
+        execution=PROCESS,
+        batch="texts"
+    )
+    def extract_keywords_batch(texts: List[str], max_keywords: int = 5, mode: str = FREQUENCY) -> Dict[str, Any]:
+        """
+        Extract keywords from each of a list of texts.
         
-        return {
-            "keywords": [{"word": word, "frequency": freq} for word, freq in keywords]
-        }
+        Args:
+            texts: The texts to extract keywords from
+            max_keywords: Maximum number of keywords to extract per text
+            mode: "frequency" or "tfidf"
+            
+        Returns:
+            Dictionary with the keywords of each text, in order
+        """
+        mode = mode or FREQUENCY
+        if mode not in KEYWORD_MODES:
+            return {"error": f"Unknown keyword mode '{mode}'; expected one of {', '.join(KEYWORD_MODES)}"}
+        
+        return process_batch(
+            texts,
+            lambda text: DocumentProcessingTool.extract_keywords(text, max_keywords=max_keywords, mode=mode)
+        )
 
 
 # Helper functions
@@ -0,0 +1,147 @@
+"""
+Pre-forked multi-process HTTP serving.
+
+A single Python process is bound by the GIL for the pandas/NumPy work of the
+data analysis tools. In worker mode the parent process loads the dataset,
+publishes its columns once (see ``mcp_server.shared_data``), binds the
+listening socket and starts worker processes that each attach to the
+published columns without copying them and accept connections on the shared
+socket. The kernel spreads incoming connections across the workers.
+
+Workers do not share MCP sessions, so worker mode serves HTTP statelessly:
+every request is complete on its own and any worker can answer it. Each
+worker keeps its own response cache. A worker that dies is restarted.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+from mcp_server.http_transport import DEFAULT_HOST, DEFAULT_KEEP_ALIVE, DEFAULT_MAX_CONNECTIONS, DEFAULT_PORT
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the worker processes
+SUPERVISE_INTERVAL = 1.0
+
+
+def _worker_main(sock: socket.socket, dataset_directory: Optional[str], options: Dict[str, Any]) -> None:
+    """
+    Entry point of a worker process.
+
+    Args:
+        sock: Shared listening socket
+        dataset_directory: Published dataset to attach to, if any
+        options: Keyword arguments for ``run_http``
+    """
+    from mcp_server.http_transport import run_http
+    from mcp_server.server import MCPServer
+    from mcp_server.tools import set_dataset
+
+    if dataset_directory is not None:
+        from mcp_server.dataset import InMemoryDataset
+        from mcp_server.shared_data import attach_frame
+
+        set_dataset(InMemoryDataset(attach_frame(dataset_directory)))
+
+    logger.info(f"Worker {os.getpid()} started")
+    try:
+        asyncio.run(run_http(MCPServer(), sock=sock, stateless=True, **options))
+    except KeyboardInterrupt:
+        pass
+
+
+def _bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Create the listening socket shared by the workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _publish_dataset() -> Optional[str]:
+    """Publish the active dataset if it is held in memory."""
+    from mcp_server.dataset import InMemoryDataset
+    from mcp_server.shared_data import publish_frame
+    from mcp_server.tools import get_dataset
+
+    dataset = get_dataset()
+    if not isinstance(dataset, InMemoryDataset):
+        # Chunked datasets are read from disk by every worker; the page cache
+        # already shares them
+        return None
+    return publish_frame(dataset.frame)
+
+
+def run_workers(
+    workers: int,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    keep_alive: float = DEFAULT_KEEP_ALIVE,
+    json_response: bool = False
+) -> None:
+    """
+    Serve over streamable HTTP from several worker processes until interrupted.
+
+    Args:
+        workers: Number of worker processes
+        host: Interface to listen on
+        port: Port to listen on
+        max_connections: Maximum number of connections served at once by each
+            worker
+        keep_alive: Seconds an idle keep-alive connection stays open
+        json_response: Whether to answer with JSON bodies instead of SSE streams
+    """
+    from mcp_server.shared_data import remove_published
+
+    sock = _bind(host, port)
+    dataset_directory = _publish_dataset()
+    options = {"max_connections": max_connections, "keep_alive": keep_alive, "json_response": json_response}
+
+    # Workers start from a clean interpreter and attach to the published data
+    context = multiprocessing.get_context("spawn")
+
+    def start(index: int) -> multiprocessing.Process:
+        process = context.Process(
+            target=_worker_main,
+            args=(sock, dataset_directory, options),
+            name=f"mcp-worker-{index}"
+        )
+        process.start()
+        return process
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    previous_handler = signal.signal(signal.SIGTERM, stop)
+    processes: List[multiprocessing.Process] = []
+    try:
+        processes = [start(index) for index in range(workers)]
+        logger.info(f"Serving on http://{host}:{port} with {workers} workers")
+        while True:
+            time.sleep(SUPERVISE_INTERVAL)
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    logger.warning(f"Worker {process.pid} exited with code {process.exitcode}; restarting")
+                    processes[index] = start(index)
+    except KeyboardInterrupt:
+        logger.info("Stopping workers")
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=10)
+        sock.close()
+        if dataset_directory is not None:
+            remove_published(dataset_directory)
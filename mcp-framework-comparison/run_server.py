@@ -3,8 +3,16 @@
 Script to run the MCP server.
 
 This script starts the MCP server and keeps it running until interrupted.
+By default the server talks to a single client over stdio; with
+``--transport http`` one process serves many clients over streamable HTTP.
+
+Usage:
+    python3 run_server.py
+    python3 run_server.py --transport http --port 8000 --max-connections 256
+    python3 run_server.py --transport http --workers 4
 """
 
+import argparse
 import asyncio
 import logging
 import os
@@ -13,7 +21,16 @@ import sys
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from mcp_server.http_transport import (
+    DEFAULT_HOST,
+    DEFAULT_KEEP_ALIVE,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_PORT,
+    DEFAULT_SESSION_IDLE_TIMEOUT,
+    run_http,
+)
 from mcp_server.server import MCPServer
+from mcp_server.workers import run_workers
 
 # Configure logging
 logging.basicConfig(
@@ -24,14 +41,74 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def main():
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description="Run the MCP server.")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio", help="Transport to serve on")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="HTTP interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="HTTP port to listen on")
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS,
+        help="Maximum HTTP connections and requests served at once; further ones get 503"
+    )
+    parser.add_argument(
+        "--keep-alive",
+        type=float,
+        default=DEFAULT_KEEP_ALIVE,
+        help="Seconds an idle HTTP keep-alive connection stays open"
+    )
+    parser.add_argument(
+        "--session-idle-timeout",
+        type=float,
+        help=f"Seconds without requests after which an HTTP session ends (default {DEFAULT_SESSION_IDLE_TIMEOUT:g})"
+    )
+    parser.add_argument("--stateless", action="store_true", help="Serve HTTP requests without sessions")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="HTTP worker processes sharing the dataset; more than one implies --stateless"
+    )
+    parser.add_argument("--json-response", action="store_true", help="Answer HTTP requests with JSON instead of SSE")
+    args = parser.parse_args()
+
+    # Reject options the chosen mode would silently ignore
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.transport == "stdio" and args.workers > 1:
+        parser.error("--workers requires --transport http")
+    if args.session_idle_timeout is not None:
+        if args.transport == "stdio":
+            parser.error("--session-idle-timeout requires --transport http")
+        if args.stateless or args.workers > 1:
+            parser.error("--session-idle-timeout cannot be used with --stateless or --workers > 1, which serve without sessions")
+    else:
+        args.session_idle_timeout = DEFAULT_SESSION_IDLE_TIMEOUT
+    return args
+
+
+async def main(args):
     """Run the MCP server."""
     logger.info("Starting MCP server...")
     
     server = MCPServer()
     
     try:
-        await server.run()
+        if args.transport == "http":
+            await run_http(
+                server,
+                host=args.host,
+                port=args.port,
+                max_connections=args.max_connections,
+                keep_alive=args.keep_alive,
+                stateless=args.stateless,
+                json_response=args.json_response,
+                session_idle_timeout=args.session_idle_timeout
+            )
+        else:
+            await server.run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -40,4 +117,15 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    if args.transport == "http" and args.workers > 1:
+        run_workers(
+            args.workers,
+            host=args.host,
+            port=args.port,
+            max_connections=args.max_connections,
+            keep_alive=args.keep_alive,
+            json_response=args.json_response
+        )
+    else:
+        asyncio.run(main(args))
\ No newline at end of file
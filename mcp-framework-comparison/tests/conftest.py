@@ -0,0 +1,12 @@
+"""
+Shared test configuration.
+
+The tests import the server packages from the project directory, like the
+scripts in it do.
+"""
+
+import os
+import sys
+
+# Add the project directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,106 @@
+"""Tests for the batch document processing tools in mcp_server.tools."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_server.cache import ResponseCache
+from mcp_server.execution import MIN_BATCH_CHUNK_SIZE, ToolExecutor
+from mcp_server.server import MCPServer
+from mcp_server.tools import MAX_BATCH_TEXTS, DocumentProcessingTool, process_batch
+
+TEXTS = [
+    "Acme opened an office in Paris. The office hires engineers.",
+    "Python tools parse documents. Documents become summaries and keywords.",
+    "",
+]
+
+
+def call(server, name, arguments):
+    binding = server.tool_registry.get(name)
+    _, payload = asyncio.run(server._run_tool(binding, arguments))
+    return json.loads(payload)
+
+
+def make_server(process_workers=0):
+    executor = ToolExecutor(thread_workers=3, process_workers=process_workers)
+    return MCPServer(response_cache=ResponseCache(), executor=executor)
+
+
+@pytest.fixture
+def server():
+    server = make_server()
+    yield server
+    server.executor.shutdown()
+
+
+def test_process_batch_reports_item_errors_in_place():
+    def process(text):
+        if text == "bad":
+            raise RuntimeError("cannot process")
+        return {"length": len(text)}
+
+    result = process_batch(["ok", 3, "bad", ""], process)
+
+    assert result == {"results": [
+        {"length": 2},
+        {"error": "Expected a string, got int"},
+        {"error": "cannot process"},
+        {"length": 0}
+    ]}
+
+
+def test_process_batch_rejects_invalid_batches():
+    assert process_batch("text", len) == {"error": "texts must be a list of strings"}
+    assert process_batch([""] * (MAX_BATCH_TEXTS + 1), len) == {
+        "error": f"At most {MAX_BATCH_TEXTS} texts can be processed per call"
+    }
+
+
+@pytest.mark.parametrize("name, arguments, single", [
+    ("document_processing_extract_entities_batch", {}, DocumentProcessingTool.extract_entities),
+    ("document_processing_summarize_batch", {"max_length": 5},
+     lambda text: DocumentProcessingTool.summarize(text, 5)),
+    ("document_processing_extract_keywords_batch", {"max_keywords": 3, "mode": "tfidf"},
+     lambda text: DocumentProcessingTool.extract_keywords(text, max_keywords=3, mode="tfidf")),
+])
+def test_batch_results_match_the_single_tools(server, name, arguments, single):
+    result = call(server, name, {"texts": TEXTS, **arguments})
+
+    assert result == json.loads(json.dumps({"results": [single(text) for text in TEXTS]}))
+
+
+def test_chunked_batches_keep_the_input_order(server):
+    texts = [f"Document {i} mentions keyword{i} twice: keyword{i}. " * (MIN_BATCH_CHUNK_SIZE // 40) for i in range(5)]
+
+    result = call(server, "document_processing_extract_keywords_batch", {"texts": texts, "max_keywords": 1})
+
+    assert [item["keywords"][0]["word"] for item in result["results"]] == [f"keyword{i}" for i in range(5)]
+
+
+def test_chunked_batches_run_in_worker_processes():
+    server = make_server(process_workers=1)
+    texts = ["Worker processes summarize long texts. " * (MIN_BATCH_CHUNK_SIZE // 30)] * 2
+
+    try:
+        result = call(server, "document_processing_summarize_batch", {"texts": texts, "max_length": 10})
+        assert server.executor._processes is not None
+    finally:
+        server.executor.shutdown()
+
+    assert result == {"results": [DocumentProcessingTool.summarize(texts[0], 10)] * 2}
+
+
+def test_batches_over_max_items_are_rejected(server):
+    texts = ["x"] * (MAX_BATCH_TEXTS + 1)
+
+    result = call(server, "document_processing_summarize_batch", {"texts": texts})
+
+    assert result == {"error": f"At most {MAX_BATCH_TEXTS} texts can be processed per call"}
+
+
+def test_unknown_keyword_modes_are_rejected_once(server):
+    result = call(server, "document_processing_extract_keywords_batch", {"texts": TEXTS, "mode": "rake"})
+
+    assert result["error"].startswith("Unknown keyword mode 'rake'")
@@ -0,0 +1,135 @@
+"""Tests for the response cache in mcp_server.cache and its use by the server."""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from mcp_server import tools
+from mcp_server.cache import ResponseCache, make_cache_key
+from mcp_server.dataset import InMemoryDataset
+from mcp_server.server import MCPServer
+
+
+class FakeClock:
+    """Clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_keys_ignore_argument_order():
+    assert make_cache_key("tool", {"a": 1, "b": [1, 2]}) == make_cache_key("tool", {"b": [1, 2], "a": 1})
+
+
+def test_keys_depend_on_tool_arguments_and_version():
+    key = make_cache_key("tool", {"a": 1}, version=1)
+
+    assert key != make_cache_key("other", {"a": 1}, version=1)
+    assert key != make_cache_key("tool", {"a": 2}, version=1)
+    assert key != make_cache_key("tool", {"a": 1}, version=2)
+    assert key != make_cache_key("tool", {"a": 1}, version=(1, 0))
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ResponseCache(clock=clock)
+    cache.put("key", "tool", "payload", ttl=10)
+
+    clock.now = 9.9
+    assert cache.get("key", "tool") == "payload"
+
+    clock.now = 10.0
+    assert cache.get("key", "tool") is None
+    assert cache.stats()["tools"]["tool"]["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_entries_without_ttl_are_not_stored(clock):
+    cache = ResponseCache(clock=clock)
+    cache.put("key", "tool", "payload", ttl=0)
+
+    assert cache.get("key", "tool") is None
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = ResponseCache(max_bytes=10, clock=clock)
+    cache.put("a", "tool", "aaaa", ttl=60)
+    cache.put("b", "tool", "bbbb", ttl=60)
+    assert cache.get("a", "tool") == "aaaa"
+
+    cache.put("c", "tool", "cccc", ttl=60)
+
+    assert cache.get("b", "tool") is None
+    assert cache.get("a", "tool") == "aaaa"
+    assert cache.get("c", "tool") == "cccc"
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["tools"]["tool"]["evictions"] == 1
+
+
+def test_responses_larger_than_the_cache_are_not_stored(clock):
+    cache = ResponseCache(max_bytes=4, clock=clock)
+    cache.put("key", "tool", "too large", ttl=60)
+
+    assert cache.get("key", "tool") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_invalidate_by_tool(clock):
+    cache = ResponseCache(clock=clock)
+    cache.put("a", "one", "a", ttl=60)
+    cache.put("b", "two", "b", ttl=60)
+
+    cache.invalidate("one")
+    assert cache.get("a", "one") is None
+    assert cache.get("b", "two") == "b"
+
+    cache.invalidate()
+    assert cache.get("b", "two") is None
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+
+
+@pytest.fixture
+def dataset():
+    dataset = InMemoryDataset(pd.DataFrame({"value": [1, 2, 3, 4]}))
+    tools.set_dataset(dataset)
+    yield dataset
+    tools.set_dataset(None)
+
+
+def count_rows(server):
+    binding = server.tool_registry.get("data_analysis_filter_data")
+    arguments = {"column": "value", "operator": "gt", "value": 1}
+    return asyncio.run(server._run_tool(binding, arguments))
+
+
+def test_server_answers_repeated_calls_from_the_cache(server, dataset):
+    result, payload = count_rows(server)
+    assert result["count"] == 3
+
+    cached, cached_payload = count_rows(server)
+    assert cached is None
+    assert cached_payload == payload
+
+
+def test_server_cache_is_invalidated_by_a_new_data_version(server, dataset):
+    count_rows(server)
+
+    dataset.append(pd.DataFrame({"value": [5]}))
+    result, _ = count_rows(server)
+
+    assert result["count"] == 4
+    assert server.response_cache.stats()["tools"]["data_analysis_filter_data"]["stores"] == 2
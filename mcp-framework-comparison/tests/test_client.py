@@ -0,0 +1,139 @@
+"""Tests for the MCP client in mcp_client."""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import BlobResourceContents, CallToolResult, ReadResourceResult, TextContent, TextResourceContents
+
+from mcp_client import AsyncMCPClient, MCPClient
+from mcp_client.client import SERVER_URL_ENV, decode_resource, decode_tool_result
+from mcp_server.resources import DOCUMENTS
+
+
+def tool_result(text, is_error=False):
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+
+def resource(mime_type, text=None, blob=None):
+    if blob is not None:
+        contents = BlobResourceContents(uri="mcp://test", mimeType=mime_type, blob=blob)
+    else:
+        contents = TextResourceContents(uri="mcp://test", mimeType=mime_type, text=text)
+    return ReadResourceResult(contents=[contents])
+
+
+@pytest.mark.parametrize("result, expected", [
+    (tool_result('{"topics": ["mcp"]}'), {"topics": ["mcp"]}),
+    (tool_result("Error: Unknown tool: nope"), {"error": "Unknown tool: nope"}),
+    (tool_result("not JSON"), {"error": "not JSON"}),
+    (tool_result("Input validation failed", is_error=True), {"error": "Input validation failed"}),
+])
+def test_tool_results_are_decoded(result, expected):
+    assert decode_tool_result(result) == expected
+
+
+@pytest.mark.parametrize("result, expected", [
+    (resource("application/json", text='{"id": "a"}'), {"id": "a"}),
+    (resource("text/markdown", text="# Title"), "# Title"),
+    (resource("text/plain", text="Unknown resource URI: mcp://x"), {"error": "Unknown resource URI: mcp://x"}),
+    (resource("application/octet-stream", blob="AAE="), "AAE="),
+    (ReadResourceResult(contents=[]), None),
+])
+def test_resources_are_decoded(result, expected):
+    assert decode_resource(result) == expected
+
+
+@pytest.mark.parametrize("server_url, expected", [
+    ("http://localhost:8000", "http://localhost:8000/mcp"),
+    ("http://localhost:8000/", "http://localhost:8000/mcp"),
+    ("http://localhost:8000/custom/", "http://localhost:8000/custom/"),
+])
+def test_server_urls_without_a_path_use_the_mcp_endpoint(server_url, expected):
+    client = AsyncMCPClient(server_url)
+
+    assert client.server_url == expected
+    assert client.transport == "http"
+
+
+def test_transport_follows_the_environment(monkeypatch):
+    monkeypatch.setenv(SERVER_URL_ENV, "http://example.com:9000")
+    assert MCPClient().server_url == "http://example.com:9000/mcp"
+
+    monkeypatch.delenv(SERVER_URL_ENV)
+    client = AsyncMCPClient()
+    assert client.server_url is None
+    assert client.transport == "stdio"
+    assert client.command[0] == sys.executable
+
+
+def test_calls_need_an_open_session():
+    with pytest.raises(RuntimeError, match="not connected"):
+        asyncio.run(AsyncMCPClient().call_tool("knowledge_base_list_topics"))
+
+
+@pytest.fixture
+def stdio(monkeypatch):
+    # Spawn the bundled server even if a server URL is configured
+    monkeypatch.delenv(SERVER_URL_ENV, raising=False)
+
+
+def test_stdio_session_keeps_the_order_of_concurrent_calls(stdio):
+    async def run():
+        async with AsyncMCPClient(timeout=30) as client:
+            calls = await client.call_tools([
+                ("knowledge_base_get_info", {"topic": "mcp", "subtopic": "components"}),
+                ("nope", {}),
+                ("knowledge_base_list_topics", {}),
+                ("knowledge_base_get_info", {"topic": "missing"}),
+            ])
+            resources = await client.get_resources([
+                "mcp://documents/mcp_overview/range/0-20",
+                "mcp://documents/mcp_overview/content",
+                "mcp://unknown",
+            ])
+            return client.tools, calls, resources
+
+    tools, calls, resources = asyncio.run(run())
+
+    assert "document_processing_summarize_batch" in tools
+    assert calls == [
+        {"components": ["Server", "Client", "Transport", "Tools", "Resources"]},
+        {"error": "Unknown tool: nope"},
+        ["ai_frameworks", "mcp"],
+        {"error": "Topic 'missing' not found in knowledge base"},
+    ]
+    assert resources[0]["content"] == DOCUMENTS["mcp_overview"]["content"][:20]
+    assert resources[1] == DOCUMENTS["mcp_overview"]["content"]
+    assert resources[2] == {"error": "Unknown resource URI: mcp://unknown"}
+
+
+def test_sync_client_shares_one_session_between_threads(stdio):
+    client = MCPClient(timeout=30)
+    topics = ["mcp", "ai_frameworks"] * 4
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(topics)) as pool:
+            results = list(pool.map(lambda topic: client.call_tool("knowledge_base_get_info", {"topic": topic}), topics))
+        session = client.client._session
+        listed = client.get_resources(["mcp://documents/list?limit=1&fields=title"])
+    finally:
+        client.close()
+
+    assert results == [results[0], results[1]] * 4
+    assert "specification" in results[0] and "langchain" in results[1]
+    assert session is not None and client.client._session is None
+    assert listed[0]["documents"] == [{"id": "autogen_guide", "title": "AutoGen Integration Guide"}]
+    assert not client._thread.is_alive()
+    # Closing twice is harmless
+    client.close()
+
+
+def test_sync_client_reports_connection_failures():
+    client = MCPClient(command=[sys.executable, "-c", "pass"], timeout=5)
+
+    with pytest.raises(McpError):
+        client.connect()
+    assert client._loop is None
@@ -0,0 +1,268 @@
+"""Tests for server-side tool pipelines in mcp_server.composition."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.cache import ResponseCache
+from mcp_server.composition import (
+    MAX_PIPELINE_STEPS,
+    PipelineError,
+    execute_steps,
+    expand_uri,
+    lookup,
+    parse_steps,
+    resolve,
+)
+from mcp_server.documents import DocumentCollection
+from mcp_server.resources import set_document_collection
+from mcp_server.server import MCPServer
+
+
+def ref(reference):
+    return {"$ref": reference}
+
+
+def test_steps_are_ordered_after_their_dependencies():
+    steps = [
+        {"id": "report", "tool": "t", "arguments": {"a": ref("left.x"), "b": [ref("right")]}},
+        {"id": "left", "tool": "t", "arguments": {"x": ref("source.value")}},
+        {"id": "right", "tool": "t", "arguments": {"nested": {"x": ref("source")}}},
+        {"id": "source", "tool": "t"},
+    ]
+
+    ordered = [step.id for step in parse_steps(steps)]
+
+    assert ordered.index("source") < ordered.index("left") < ordered.index("report")
+    assert ordered.index("source") < ordered.index("right") < ordered.index("report")
+    assert parse_steps(steps)[-1].dependencies == frozenset({"left", "right"})
+
+
+@pytest.mark.parametrize("steps", [
+    [{"id": "a", "tool": "t", "arguments": {"x": ref("a")}}],
+    [
+        {"id": "a", "tool": "t", "arguments": {"x": ref("c.value")}},
+        {"id": "b", "tool": "t", "arguments": {"x": ref("a")}},
+        {"id": "c", "tool": "t", "arguments": {"x": ref("b")}},
+        {"id": "d", "tool": "t"},
+    ],
+])
+def test_cycles_are_rejected(steps):
+    with pytest.raises(PipelineError, match="reference each other in a cycle"):
+        parse_steps(steps)
+
+
+def test_cycle_error_names_only_the_steps_in_or_after_the_cycle():
+    steps = [
+        {"id": "free", "tool": "t"},
+        {"id": "a", "tool": "t", "arguments": {"x": ref("b"), "y": ref("free")}},
+        {"id": "b", "tool": "t", "arguments": {"x": ref("a")}},
+    ]
+
+    with pytest.raises(PipelineError, match="^Steps a, b reference"):
+        parse_steps(steps)
+
+
+@pytest.mark.parametrize("steps,outputs,message", [
+    ([{"id": "a", "tool": "t", "arguments": {"x": ref("missing.value")}}], None,
+     "Step 'a' references unknown step 'missing'"),
+    ([{"id": "a", "tool": "t"}], ["b"], "Unknown output step 'b'"),
+    ([{"id": "a", "tool": "t"}], "a", "outputs must be a list of step IDs"),
+    ([{"id": "a", "tool": "t"}], 1, "outputs must be a list of step IDs"),
+    ([{"id": "a", "tool": "t"}], [["a"]], "outputs must be a list of step IDs"),
+    ([], None, "steps must be a non-empty list"),
+    ({"id": "a"}, None, "steps must be a non-empty list"),
+    (["a"], None, "Step 0 must be an object"),
+    ([{"id": "a.b", "tool": "t"}], None, "needs an id without dots"),
+    ([{"tool": "t"}], None, "needs an id without dots"),
+    ([{"id": "a", "tool": "t"}, {"id": "a", "tool": "t"}], None, "Duplicate step id 'a'"),
+    ([{"id": "a"}], None, "needs exactly one of tool and resource"),
+    ([{"id": "a", "tool": "t", "resource": "mcp://x"}], None, "needs exactly one of tool and resource"),
+    ([{"id": "a", "tool": "execute_pipeline"}], None, "cannot run a nested pipeline"),
+    ([{"id": "a", "tool": "t", "arguments": [1]}], None, "must be an object"),
+    ([{"id": "a", "tool": "t", "arguments": {"x": {"$ref": ""}}}], None, "Invalid reference"),
+    ([{"id": str(i), "tool": "t"} for i in range(MAX_PIPELINE_STEPS + 1)], None, "At most"),
+])
+def test_invalid_pipelines_are_rejected(steps, outputs, message):
+    with pytest.raises(PipelineError, match=message):
+        parse_steps(steps, outputs)
+
+
+RESULT = {
+    "results": [
+        {"id": "a", "tags": ["x", "y"], "score": 1.0},
+        {"id": "b", "tags": ["z"], "score": 0.5},
+    ],
+    "total": 2,
+}
+
+
+@pytest.mark.parametrize("path,expected", [
+    ("total", 2),
+    ("results.0.id", "a"),
+    ("results.-1.score", 0.5),
+    ("results.*.id", ["a", "b"]),
+    ("results.*.tags.0", ["x", "z"]),
+    ("results.*.tags.*", [["x", "y"], ["z"]]),
+    ("results.*", RESULT["results"]),
+    ("", RESULT),
+])
+def test_lookup_follows_paths(path, expected):
+    segments = path.split(".") if path else []
+
+    assert lookup(RESULT, segments, f"step.{path}") == expected
+
+
+@pytest.mark.parametrize("path,message", [
+    ("missing", "not found in the result"),
+    ("results.2.id", "not found in the result"),
+    ("results.*.missing", "not found in the result"),
+    ("total.*", "maps over a value that is not a list"),
+    ("results.0.id.*", "maps over a value that is not a list"),
+])
+def test_lookup_rejects_missing_paths(path, message):
+    with pytest.raises(PipelineError, match=message):
+        lookup(RESULT, path.split("."), f"step.{path}")
+
+
+def test_resolve_replaces_nested_references():
+    arguments = {
+        "ids": ref("search.results.*.id"),
+        "options": {"first": ref("search.results.0")},
+        "n": [ref("search.total"), 3]
+    }
+
+    assert resolve(arguments, {"search": RESULT}) == {
+        "ids": ["a", "b"],
+        "options": {"first": RESULT["results"][0]},
+        "n": [2, 3]
+    }
+
+
+def test_expand_uri_quotes_values_and_joins_lists():
+    uri = expand_uri("mcp://documents/batch/{ids}?q={query}", {"ids": ["a/b", "c d"], "query": "x,y"})
+
+    assert uri == "mcp://documents/batch/a%2Fb,c%20d?q=x%2Cy"
+
+
+def test_expand_uri_requires_every_placeholder():
+    with pytest.raises(PipelineError, match="No value for '{id}'"):
+        expand_uri("mcp://documents/{id}", {})
+
+
+def run_steps(steps, outputs=None, tools=None, resources=None):
+    calls = []
+
+    async def call_tool(name, arguments):
+        calls.append((name, arguments))
+        return (tools or {})[name](arguments)
+
+    async def read_resource(uri):
+        calls.append(("resource", uri))
+        return (resources or {})[uri]
+
+    return asyncio.run(execute_steps(steps, outputs, call_tool, read_resource)), calls
+
+
+def test_results_flow_between_steps():
+    result, calls = run_steps(
+        [
+            {"id": "search", "tool": "search", "arguments": {"query": "mcp"}},
+            {"id": "docs", "resource": "mcp://documents/batch/{ids}", "arguments": {"ids": ref("search.results.*.id")}},
+            {"id": "summary", "tool": "summarize", "arguments": {"text": ref("docs.0")}},
+        ],
+        outputs=["summary"],
+        tools={
+            "search": lambda arguments: RESULT,
+            "summarize": lambda arguments: {"summary": arguments["text"].upper()}
+        },
+        resources={"mcp://documents/batch/a,b": ["first", "second"]}
+    )
+
+    assert result == {"results": {"summary": {"summary": "FIRST"}}, "failed": []}
+    assert ("resource", "mcp://documents/batch/a,b") in calls
+
+
+def test_independent_steps_run_concurrently():
+    started = []
+
+    async def wait_for_both(arguments):
+        started.append(arguments["name"])
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        return {"name": arguments["name"]}
+
+    async def run():
+        steps = [
+            {"id": "a", "tool": "wait", "arguments": {"name": "a"}},
+            {"id": "b", "tool": "wait", "arguments": {"name": "b"}},
+        ]
+        return await asyncio.wait_for(
+            execute_steps(steps, None, lambda name, arguments: wait_for_both(arguments), None),
+            timeout=5
+        )
+
+    result = asyncio.run(run())
+
+    assert result["results"] == {"a": {"name": "a"}, "b": {"name": "b"}}
+
+
+def test_failures_skip_dependent_steps_only():
+    def fail(arguments):
+        raise RuntimeError("boom")
+
+    result, calls = run_steps(
+        [
+            {"id": "broken", "tool": "fail"},
+            {"id": "error", "tool": "echo", "arguments": {"error": "reported"}},
+            {"id": "after_broken", "tool": "echo", "arguments": {"x": ref("broken")}},
+            {"id": "after_error", "tool": "echo", "arguments": {"x": ref("error")}},
+            {"id": "bad_path", "tool": "echo", "arguments": {"x": ref("ok.missing")}},
+            {"id": "ok", "tool": "echo", "arguments": {"value": 1}},
+        ],
+        tools={"fail": fail, "echo": lambda arguments: arguments}
+    )
+
+    results = result["results"]
+    assert results["broken"] == {"error": "boom"}
+    assert results["after_broken"] == {"error": "Skipped because step 'broken' failed"}
+    assert results["after_error"] == {"error": "Skipped because step 'error' failed"}
+    assert results["bad_path"] == {"error": "Reference 'ok.missing' not found in the result"}
+    assert results["ok"] == {"value": 1}
+    assert result["failed"] == ["broken", "error", "after_broken", "after_error", "bad_path"]
+    assert [name for name, _ in calls].count("echo") == 2
+
+
+@pytest.fixture
+def server():
+    set_document_collection(DocumentCollection({
+        "notes/a b": {"title": "Release notes", "content": "The protocol release adds pipelines."},
+        "guide": {"title": "Guide", "content": "Pipelines run steps."}
+    }))
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+    set_document_collection(None)
+
+
+def test_server_pipeline_reads_documents_with_encoded_ids(server):
+    result = asyncio.run(server.execute_pipeline([
+        {"id": "hits", "resource": "mcp://documents/search/{query}", "arguments": {"query": "release pipelines"}},
+        {"id": "batch", "resource": "mcp://documents/batch/{ids}", "arguments": {"ids": ref("hits.results.*.id")}},
+        {"id": "best", "resource": "mcp://documents/{id}", "arguments": {"id": ref("hits.results.0.id")}},
+        {"id": "keywords", "tool": "document_processing_extract_keywords", "arguments": {"text": ref("best.content")}},
+    ]))
+
+    assert result["failed"] == []
+    results = result["results"]
+    assert results["hits"]["results"][0]["id"] == "notes/a b"
+    assert [document["id"] for document in results["batch"]["documents"]] == ["notes/a b", "guide"]
+    assert results["best"]["title"] == "Release notes"
+    assert "keywords" in results["keywords"]
+
+
+def test_server_reports_invalid_pipelines_and_unknown_tools(server):
+    assert asyncio.run(server.execute_pipeline([])) == {"error": "steps must be a non-empty list"}
+
+    result = asyncio.run(server.execute_pipeline([{"id": "a", "tool": "no_such_tool"}]))
+    assert result == {"results": {"a": {"error": "Unknown tool: no_such_tool"}}, "failed": ["a"]}
@@ -0,0 +1,183 @@
+"""Tests for datasets and their derived results in mcp_server.dataset."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcp_server import tools
+from mcp_server.dataset import ChunkedDataset, InMemoryDataset, compute_column_statistics
+from mcp_server.filters import compile_filter
+from mcp_server.tools import DataAnalysisTool
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=500, freq="D"),
+        "x": rng.normal(10, 2, 500),
+        "n": rng.integers(0, 100, 500),
+        "label": rng.choice(["a", "b"], 500)
+    })
+    frame.loc[::11, "x"] = np.nan
+    return frame
+
+
+def test_column_statistics_match_pandas_describe(frame):
+    statistics = compute_column_statistics(frame)
+
+    assert list(statistics) == ["x", "n"]
+    for column, expected in frame[["x", "n"]].describe().items():
+        for key, value in expected.items():
+            assert statistics[column][key] == pytest.approx(value, rel=1e-12)
+
+
+def test_column_statistics_of_empty_and_all_missing_columns():
+    statistics = compute_column_statistics(pd.DataFrame({"x": [np.nan, np.nan], "label": ["a", "b"]}))
+    empty = compute_column_statistics(pd.DataFrame({"x": pd.Series([], dtype=float)}))
+
+    assert statistics["x"]["count"] == 0
+    assert math.isnan(statistics["x"]["mean"]) and math.isnan(statistics["x"]["50%"])
+    assert empty["x"]["count"] == 0
+    assert compute_column_statistics(pd.DataFrame({"label": ["a"]})) == {}
+
+
+def test_derived_results_are_computed_once_per_version(frame):
+    dataset = InMemoryDataset(frame)
+    calls = []
+
+    def compute():
+        calls.append(dataset.version)
+        return len(calls)
+
+    assert dataset.cached("result", compute) == 1
+    assert dataset.cached("result", compute) == 1
+
+    dataset.touch()
+    assert dataset.cached("result", compute) == 2
+    assert calls == [0, 1]
+
+
+def test_statistics_follow_replaced_and_appended_data(frame):
+    dataset = InMemoryDataset(frame)
+    first = dataset.column_statistics()
+
+    assert dataset.column_statistics() is first
+
+    dataset.append(pd.DataFrame({"x": [1000.0], "n": [1]}))
+    assert dataset.column_statistics()["x"]["max"] == 1000.0
+    assert dataset.column_statistics()["n"]["count"] == 501
+
+    dataset.replace(frame.head(10))
+    assert dataset.column_statistics()["n"]["count"] == 10
+
+
+@pytest.fixture
+def dataset(frame):
+    dataset = InMemoryDataset(frame)
+    tools.set_dataset(dataset)
+    yield dataset
+    tools.set_dataset(None)
+
+
+def test_summary_statistics_tool(dataset, frame):
+    summary = DataAnalysisTool.get_summary_statistics()
+    column = DataAnalysisTool.get_summary_statistics("n")
+
+    assert set(summary) == {"x", "n"}
+    assert set(summary["x"]) == {"count", "mean", "std", "min", "max"}
+    assert summary["x"]["count"] == frame["x"].count()
+    assert column["50%"] == frame["n"].median()
+
+
+@pytest.mark.parametrize("column,error", [
+    ("missing", "Column 'missing' not found in dataset"),
+    ("label", "Column 'label' is not numeric"),
+])
+def test_summary_statistics_tool_errors(dataset, column, error):
+    assert DataAnalysisTool.get_summary_statistics(column) == {"error": error}
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def chunked(request, frame, tmp_path):
+    if request.param == "csv":
+        path = tmp_path / "data.csv"
+        frame.to_csv(path, index=False)
+    else:
+        path = tmp_path / "data.parquet"
+        frame.to_parquet(path, index=False)
+    return ChunkedDataset(str(path), chunk_size=64, parse_dates=["date"])
+
+
+def test_chunked_statistics_match_in_memory(chunked, frame):
+    expected = InMemoryDataset(frame).column_statistics()
+
+    statistics = chunked.column_statistics()
+
+    assert chunked.columns == list(frame.columns)
+    assert list(statistics) == ["x", "n"]
+    for column in statistics:
+        assert statistics[column]["count"] == expected[column]["count"]
+        for key in ("mean", "std", "min", "max"):
+            assert statistics[column][key] == pytest.approx(expected[column][key], rel=1e-9)
+        # Quartiles are t-digest estimates
+        for key in ("25%", "50%", "75%"):
+            assert statistics[column][key] == pytest.approx(expected[column][key], rel=0.05)
+
+
+def test_chunked_filter_samples_and_summarizes_like_in_memory(chunked, frame):
+    predicate = compile_filter({"column": "n", "operator": "lt", "value": 30})
+    expected = InMemoryDataset(frame).filter(predicate, sample_size=100)
+
+    result = chunked.filter(predicate, sample_size=100)
+
+    assert result.count == expected.count
+    assert len(result.sample) == 100
+    assert result.sample["n"].tolist() == expected.sample["n"].tolist()
+    for column, summary in expected.summary.items():
+        assert result.summary[column] == pytest.approx(summary, rel=1e-9)
+
+
+def test_chunked_correlations_match_in_memory(chunked, frame):
+    expected = InMemoryDataset(frame).correlation_matrix()
+
+    matrix = chunked.correlation_matrix()
+
+    assert matrix.columns == expected.columns
+    np.testing.assert_allclose(matrix.matrix, expected.matrix, rtol=1e-9, atol=1e-12)
+    assert chunked.correlation("x", "n") == pytest.approx(expected.get("x", "n"), rel=1e-9)
+    with pytest.raises(ValueError, match="requires an in-memory dataset"):
+        chunked.correlation_matrix("spearman")
+
+
+def test_chunked_results_are_recomputed_when_the_file_changes(frame, tmp_path):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    chunked = ChunkedDataset(str(path), chunk_size=64)
+    assert chunked.column_statistics()["n"]["count"] == 500
+
+    frame.head(20).to_csv(path, index=False)
+
+    assert chunked.column_statistics()["n"]["count"] == 20
+
+
+@pytest.fixture
+def dataset_path(frame, tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    monkeypatch.setenv(tools.DATASET_PATH_ENV, str(path))
+    monkeypatch.setenv(tools.DATASET_DATE_COLUMNS_ENV, "date")
+    tools.set_dataset(None)
+    yield path
+    tools.set_dataset(None)
+
+
+def test_dataset_path_selects_a_chunked_dataset(dataset_path):
+    dataset = tools.get_dataset()
+
+    assert isinstance(dataset, ChunkedDataset)
+    assert dataset.path == str(dataset_path)
+    assert dataset.parse_dates == ["date"]
+    assert DataAnalysisTool.get_summary_statistics("n")["count"] == 500
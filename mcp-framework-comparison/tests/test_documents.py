@@ -0,0 +1,410 @@
+"""Tests for the document collection in mcp_server.documents."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_server import tools
+from mcp_server.cache import ResponseCache
+from mcp_server.documents import (
+    MAX_BATCH_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_RANGE_LENGTH,
+    DocumentCollection,
+    content_hash,
+    decode_cursor,
+    encode_cursor,
+    split_chunks,
+)
+from mcp_server.gazetteer import Gazetteer
+from mcp_server.resources import DOCUMENTS, DocumentResource, derive_document, set_document_collection
+from mcp_server.server import MCPServer
+from mcp_server.tools import DocumentProcessingTool
+
+
+def sample_documents():
+    return {
+        "mcp": {
+            "title": "Model Context Protocol",
+            "content": "MCP lets language models call tools and read resources.",
+            "metadata": {"tags": ["protocol", "tools"]}
+        },
+        "pandas": {
+            "title": "Pandas Guide",
+            "content": "Pandas analyzes tabular data. It can also serve tools.",
+            "metadata": {"tags": ["data"]}
+        },
+        "notes": {
+            "title": "Notes",
+            "content": "Nothing relevant here.",
+            "metadata": {"tags": ["protocol"]}
+        }
+    }
+
+
+@pytest.fixture
+def collection():
+    collection = DocumentCollection(sample_documents())
+    set_document_collection(collection)
+    yield collection
+    set_document_collection(None)
+
+
+@pytest.fixture
+def gazetteer():
+    gazetteer = Gazetteer()
+    gazetteer.add("Acme", "organizations")
+    tools.set_entity_gazetteer(gazetteer)
+    yield gazetteer
+    tools.set_entity_gazetteer(None)
+
+
+def test_search_ranks_matches_with_a_highlighted_snippet(collection):
+    results = collection.search("tools")
+
+    assert [result["id"] for result in results] == ["mcp", "pandas"]
+    assert results[0]["score"] > results[1]["score"]
+    assert results[0]["title"] == "Model Context Protocol"
+    assert results[0]["metadata"] == {"tags": ["protocol", "tools"]}
+    assert results[0]["match"] == "content"
+    assert results[0]["snippet"] == "MCP lets language models call <mark>tools</mark> and read resources"
+
+
+def test_search_reports_title_and_tag_matches(collection):
+    results = collection.search("protocol")
+
+    # The title weighs more than a tag
+    assert [(result["id"], result["match"]) for result in results] == [("mcp", "title"), ("notes", "metadata.tags")]
+    assert results[0]["snippet"] == "Model Context <mark>Protocol</mark>"
+    assert results[1]["snippet"] == "<mark>protocol</mark>"
+
+
+def test_search_follows_added_replaced_and_deleted_documents(collection):
+    collection.put("notes", {"title": "Notes", "content": "Tools everywhere", "metadata": {}})
+    collection.delete("mcp")
+    collection.put("guide", {"title": "Tools Guide", "content": "Tools for agents."})
+
+    assert collection.search("protocol") == []
+    assert [result["id"] for result in collection.search("tools", top_k=None)] == ["guide", "notes", "pandas"]
+    assert [result["id"] for result in collection.search("tools", top_k=1)] == ["guide"]
+    assert len(collection) == 3 and "mcp" not in collection
+
+
+def test_search_resource_lists_each_document_once(collection):
+    result = DocumentResource.search_documents("tools protocol")
+
+    assert result["query"] == "tools protocol"
+    assert [document["id"] for document in result["results"]] == ["mcp", "notes", "pandas"]
+
+
+@pytest.mark.parametrize("document_id", ["mcp", "a/b c", "naïve-ドキュメント", ""])
+def test_cursors_round_trip(document_id):
+    cursor = encode_cursor(document_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == document_id
+
+
+@pytest.mark.parametrize("cursor", ["***", "gA"])
+def test_malformed_cursors_are_rejected(collection, cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        collection.list(cursor=cursor)
+
+
+def list_all(collection, limit, **kwargs):
+    pages = []
+    cursor = None
+    while True:
+        page = collection.list(cursor=cursor, limit=limit, **kwargs)
+        pages.append([document["id"] for document in page["documents"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_pages_follow_their_cursors_in_id_order(collection):
+    assert list_all(collection, limit=2) == [["mcp", "notes"], ["pandas"]]
+    assert list_all(collection, limit=3) == [["mcp", "notes", "pandas"]]
+    assert collection.list(limit=1)["total"] == 3
+
+
+def test_pages_stay_consistent_while_documents_change(collection):
+    first = collection.list(limit=2)
+    collection.delete("notes")
+    collection.put("alpha", {"title": "Alpha", "content": "First"})
+    collection.put("zeta", {"title": "Zeta", "content": "Last"})
+
+    second = collection.list(cursor=first["next_cursor"], limit=2)
+
+    # The next page starts after the last listed ID, even though it was removed
+    assert [document["id"] for document in second["documents"]] == ["pandas", "zeta"]
+    assert second["next_cursor"] is None
+    assert second["total"] == 4
+
+
+def test_listings_include_only_the_requested_fields(collection):
+    default = collection.list(limit=1)["documents"][0]
+    projected = collection.list(limit=1, fields=["content_length", "content"])["documents"][0]
+
+    assert default == {"id": "mcp", "title": "Model Context Protocol", "metadata": {"tags": ["protocol", "tools"]}}
+    assert projected == {
+        "id": "mcp",
+        "content_length": 55,
+        "content": "MCP lets language models call tools and read resources."
+    }
+
+
+def test_invalid_listing_arguments_are_rejected(collection):
+    with pytest.raises(ValueError, match="Unknown fields: body"):
+        collection.list(fields=["title", "body"])
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        collection.list(limit=0)
+
+
+def test_page_size_is_capped():
+    collection = DocumentCollection({f"doc{i:04d}": {"title": str(i)} for i in range(MAX_PAGE_SIZE + 1)})
+
+    page = collection.list(limit=MAX_PAGE_SIZE * 2)
+
+    assert len(page["documents"]) == MAX_PAGE_SIZE
+    assert decode_cursor(page["next_cursor"]) == f"doc{MAX_PAGE_SIZE - 1:04d}"
+
+
+def test_list_resource_reports_errors(collection):
+    assert DocumentResource.list_documents(limit=2)["next_cursor"] == encode_cursor("notes")
+    assert "error" in DocumentResource.list_documents(cursor="***")
+    assert "error" in DocumentResource.list_documents(fields=["body"])
+
+
+@pytest.fixture
+def server(collection):
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+
+
+def read(server, uri):
+    content = asyncio.run(server._handle_read_resource(uri))[0]
+    return json.loads(content["content"])
+
+
+def test_list_resource_pages_through_cursors(server):
+    first = read(server, "mcp://documents/list?limit=2&fields=title,content_length")
+    second = read(server, f"mcp://documents/list?cursor={first['next_cursor']}&limit=2")
+
+    assert first["documents"] == [
+        {"id": "mcp", "title": "Model Context Protocol", "content_length": 55},
+        {"id": "notes", "title": "Notes", "content_length": 22}
+    ]
+    assert [document["id"] for document in second["documents"]] == ["pandas"]
+    assert second["next_cursor"] is None
+    assert read(server, "mcp://documents/list?limit=x") == {"error": "Invalid limit: x"}
+
+
+def test_batches_keep_request_order_and_report_missing_ids(collection):
+    result = collection.get_many(["pandas", "missing", "mcp", "pandas"])
+
+    assert [document["id"] for document in result["documents"]] == ["pandas", "mcp"]
+    assert result["documents"][0]["title"] == "Pandas Guide"
+    assert result["missing"] == ["missing"]
+
+
+def test_batches_are_limited(collection):
+    ids = [f"doc{i}" for i in range(MAX_BATCH_SIZE + 1)]
+
+    assert collection.get_many(ids[:-1])["missing"] == ids[:-1]
+    with pytest.raises(ValueError, match=f"At most {MAX_BATCH_SIZE} documents"):
+        collection.get_many(ids)
+    assert "error" in DocumentResource.get_documents(ids)
+
+
+def test_batch_resource_fetches_comma_separated_ids(server):
+    result = read(server, "mcp://documents/batch/notes,a%2Cb,,mcp")
+
+    assert [document["id"] for document in result["documents"]] == ["notes", "mcp"]
+    assert result["missing"] == ["a,b"]
+
+
+MARKDOWN = "# Intro\nShort intro.\n## Usage\n" + "word " * 30 + "\n## End\nBye.\n"
+
+
+def test_short_texts_are_one_chunk():
+    assert split_chunks("", 10) == [(0, 0)]
+    assert split_chunks("# Title\nBody", 100) == [(0, 12)]
+
+
+def test_chunks_follow_headings_and_cut_long_sections():
+    chunks = split_chunks(MARKDOWN, 60)
+
+    assert chunks == [(0, 21), (21, 80), (80, 140), (140, 193)]
+    assert all(end - start <= 60 for start, end in chunks)
+    assert "".join(MARKDOWN[start:end] for start, end in chunks) == MARKDOWN
+    # Long sections are cut after whitespace, not inside a word
+    assert MARKDOWN[80:140].startswith("word ")
+
+
+def test_chunk_list_names_the_first_heading_of_each_chunk():
+    collection = DocumentCollection({"guide": {"title": "Guide", "content": MARKDOWN}}, chunk_size=60)
+
+    described = collection.chunks("guide")
+
+    assert described["content_length"] == len(MARKDOWN)
+    assert [chunk["heading"] for chunk in described["chunks"]] == ["Intro", "Usage", None, "End"]
+    assert collection.chunks("missing") is None
+
+
+def test_chunks_and_ranges_read_part_of_the_content():
+    collection = DocumentCollection({"guide": {"title": "Guide", "content": MARKDOWN}}, chunk_size=60)
+
+    chunk = collection.get_chunk("guide", 1)
+    clipped = collection.get_range("guide", 150, 1000)
+
+    assert chunk == {"id": "guide", "chunk": 1, "chunks": 4, "start": 21, "end": 80, "content": MARKDOWN[21:80]}
+    assert clipped["content"] == MARKDOWN[150:]
+    assert (clipped["start"], clipped["end"], clipped["content_length"]) == (150, 193, 193)
+    assert collection.get_range("guide", 500, 600)["content"] == ""
+    assert collection.get_chunk("missing", 0) is None
+
+
+@pytest.mark.parametrize("read, message", [
+    (lambda collection: collection.get_chunk("guide", 4), "Chunk 4 out of range"),
+    (lambda collection: collection.get_range("guide", 5, 4), "Invalid range 5-4"),
+    (lambda collection: collection.get_range("guide", 0, MAX_RANGE_LENGTH + 1), "Ranges are limited"),
+])
+def test_invalid_chunks_and_ranges_are_rejected(read, message):
+    collection = DocumentCollection({"guide": {"title": "Guide", "content": MARKDOWN}}, chunk_size=60)
+
+    with pytest.raises(ValueError, match=message):
+        read(collection)
+
+
+def test_chunk_resources_stream_the_content(server):
+    set_document_collection(DocumentCollection({"a guide": {"title": "Guide", "content": MARKDOWN}}, chunk_size=60))
+
+    parts = []
+    uri = "mcp://documents/a%20guide/chunks/0"
+    while uri is not None:
+        chunk = read(server, uri)
+        parts.append(chunk["content"])
+        uri = chunk.get("next")
+
+    assert "".join(parts) == MARKDOWN
+    assert len(parts) == len(read(server, "mcp://documents/a%20guide/chunks")["chunks"])
+    assert read(server, "mcp://documents/a%20guide/range/8-20")["content"] == "Short intro."
+    assert read(server, "mcp://documents/a%20guide/chunks/9") == {
+        "error": "Chunk 9 out of range; document 'a guide' has 4 chunks"
+    }
+
+
+def test_derivatives_are_computed_once_per_content():
+    calls = []
+
+    def derive(content):
+        calls.append(content)
+        return {"length": len(content)}
+
+    collection = DocumentCollection(
+        {"a": {"title": "A", "content": "same"}, "b": {"title": "B", "content": "same"}},
+        derive=derive
+    )
+    collection.put("a", {"title": "A2", "content": "same"})
+
+    assert calls == ["same"]
+    assert collection.derivatives("a")["length"] == 4
+    assert collection.derivatives("missing") is None
+
+
+def test_derivatives_follow_the_derive_version():
+    version = [1]
+    calls = []
+
+    def derive(content):
+        calls.append(version[0])
+        return {"version": version[0]}
+
+    collection = DocumentCollection(
+        {"a": {"title": "A", "content": "body"}},
+        derive=derive,
+        derive_version=lambda: version[0]
+    )
+    assert collection.derivatives("a")["version"] == 1
+    assert collection.derivatives("a")["version"] == 1
+
+    version[0] = 2
+    assert collection.derivatives("a")["version"] == 2
+    assert collection.list(fields=["summary"])["documents"][0]["summary"] is None
+    assert calls == [1, 2]
+
+
+def test_entities_follow_a_replaced_or_extended_gazetteer(gazetteer):
+    collection = DocumentCollection(
+        {"a": {"title": "A", "content": "Acme and Zorblax Industries signed a deal."}},
+        derive=derive_document,
+        derive_version=tools.entity_gazetteer_version
+    )
+    assert collection.derivatives("a")["entities"]["organizations"] == ["Acme"]
+
+    gazetteer.add("Zorblax Industries", "organizations")
+    assert collection.derivatives("a")["entities"]["organizations"] == ["Acme", "Zorblax Industries"]
+
+    replacement = Gazetteer()
+    replacement.add("Zorblax", "places")
+    tools.set_entity_gazetteer(replacement)
+    listed = collection.list(fields=["entities"])["documents"][0]
+    assert listed["entities"]["places"] == ["Zorblax"]
+    assert listed["entities"]["organizations"] == []
+
+
+def test_changed_content_is_derived_again_and_shared_derivatives_survive_deletes():
+    calls = []
+
+    def derive(content):
+        calls.append(content)
+        return {"length": len(content)}
+
+    collection = DocumentCollection(
+        {"a": {"title": "A", "content": "same"}, "b": {"title": "B", "content": "same"}},
+        derive=derive
+    )
+    collection.delete("a")
+    collection.put("b", {"title": "B", "content": "same", "metadata": {"tags": ["new"]}})
+    assert calls == ["same"]
+
+    collection.put("b", {"title": "B", "content": "changed"})
+
+    assert calls == ["same", "changed"]
+    assert collection.derivatives("b")["length"] == 7
+    assert collection.derivatives("a") is None
+
+
+def test_failed_derivations_leave_the_document_readable(caplog):
+    def derive(content):
+        raise RuntimeError("broken")
+
+    collection = DocumentCollection({"a": {"title": "A", "content": "body"}}, derive=derive)
+
+    derivatives = collection.derivatives("a")
+
+    assert set(derivatives) == {"id", "content_hash"}
+    assert collection.get("a")["content"] == "body"
+    assert "Could not compute derivatives of document 'a'" in caplog.text
+
+
+def test_default_documents_are_derived_at_ingest():
+    set_document_collection(None)
+    server = MCPServer(response_cache=ResponseCache())
+    content = DOCUMENTS["mcp_overview"]["content"]
+
+    try:
+        derivatives = read(server, "mcp://documents/mcp_overview/derivatives")
+        listed = read(server, "mcp://documents/list?limit=100&fields=summary,keywords")
+    finally:
+        server.executor.shutdown()
+        set_document_collection(None)
+
+    assert derivatives["summary"] == DocumentProcessingTool.summarize(content)["summary"]
+    assert derivatives["entities"] == DocumentProcessingTool.extract_entities(content)
+    assert derivatives == {"id": "mcp_overview", "content_hash": content_hash(content), **derive_document(content)}
+    listed = {document["id"]: document for document in listed["documents"]}
+    assert listed["mcp_overview"]["keywords"] == derivatives["keywords"]
@@ -0,0 +1,249 @@
+"""Tests for execution policies and batch splitting in mcp_server.execution."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcp_server.execution import (
+    INLINE,
+    MIN_BATCH_CHUNK_SIZE,
+    PROCESS,
+    PROCESS_MIN_INPUT_SIZE,
+    THREAD,
+    ToolExecutor,
+    input_size,
+    merge_batch,
+    split_batch,
+)
+from mcp_server.registry import ToolRegistry, tool
+from mcp_server.tools import DocumentProcessingTool
+
+
+class Tracker:
+    """Records how many calls run at once and the thread of each call."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.peak = 0
+        self.threads = []
+
+    def __call__(self, value):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return value
+
+
+def binding_for(handler, execution=THREAD, max_concurrency=None, batch=None, properties=None):
+    registry = ToolRegistry()
+
+    @tool(
+        name="probe",
+        description="Probe",
+        properties=properties,
+        execution=execution,
+        max_concurrency=max_concurrency,
+        batch=batch
+    )
+    def probe(texts=None, text=None):
+        if batch is not None:
+            return {"results": handler(texts)}
+        return handler(text)
+
+    return registry.register(probe)
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(thread_workers=3, process_workers=0)
+    yield executor
+    executor.shutdown()
+
+
+def run_calls(executor, binding, arguments_list):
+    async def run():
+        return await asyncio.gather(*(executor.run(binding, arguments) for arguments in arguments_list))
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("items,workers,expected_chunks", [
+    ([], 4, 0),
+    (["a"] * 10, 4, 1),
+    (["x" * MIN_BATCH_CHUNK_SIZE] * 6, 4, 6),
+    (["x" * (MIN_BATCH_CHUNK_SIZE // 2)] * 6, 4, 3),
+    (["x" * MIN_BATCH_CHUNK_SIZE * 2, "y", "z"], 4, 2),
+])
+def test_split_batch_makes_contiguous_chunks(items, workers, expected_chunks):
+    chunks = split_batch(items, workers)
+
+    assert len(chunks) == expected_chunks
+    assert [item for chunk in chunks for item in chunk] == items
+    assert all(chunks)
+
+
+def test_split_batch_caps_the_chunks_per_worker():
+    items = ["x" * MIN_BATCH_CHUNK_SIZE] * 100
+
+    assert len(split_batch(items, 2)) == 8
+
+
+def test_input_size_counts_strings_in_arguments_and_lists():
+    assert input_size({"text": "abc", "texts": ["de", 5, "f"], "limit": 10}) == 6
+
+
+def test_merge_batch_concatenates_or_returns_the_first_error():
+    assert merge_batch([{"results": [1]}, {"results": [2, 3]}]) == {"results": [1, 2, 3]}
+    assert merge_batch([{"results": [1]}, {"error": "bad"}, {"results": [2]}]) == {"error": "bad"}
+
+
+def test_inline_calls_run_on_the_event_loop(executor):
+    tracker = Tracker()
+    binding = binding_for(tracker, execution=INLINE)
+
+    assert run_calls(executor, binding, [{"text": "a"}]) == ["a"]
+    assert tracker.threads == [threading.current_thread().name]
+    assert executor._threads is None
+
+
+def test_thread_calls_run_in_the_thread_pool(executor):
+    tracker = Tracker()
+    binding = binding_for(tracker)
+
+    assert run_calls(executor, binding, [{"text": "a"}, {"text": "b"}]) == ["a", "b"]
+    assert all(name.startswith("mcp-tool") for name in tracker.threads)
+    assert executor.stats()["tools"]["probe"] == {
+        "waiting": 0, "running": 0, "completed": 2, "failed": 0, "cancelled": 0
+    }
+
+
+def test_max_concurrency_bounds_the_calls_of_a_tool(executor):
+    tracker = Tracker(delay=0.02)
+    binding = binding_for(tracker, max_concurrency=2)
+
+    results = run_calls(executor, binding, [{"text": str(i)} for i in range(6)])
+
+    assert results == [str(i) for i in range(6)]
+    assert tracker.peak == 2
+
+
+def test_small_process_calls_run_in_the_thread_pool():
+    executor = ToolExecutor(thread_workers=2, process_workers=1)
+    tracker = Tracker()
+    binding = binding_for(tracker, execution=PROCESS)
+
+    try:
+        assert run_calls(executor, binding, [{"text": "small"}]) == ["small"]
+        assert tracker.threads[0].startswith("mcp-tool")
+        assert executor._processes is None
+    finally:
+        executor.shutdown()
+
+
+def test_large_process_calls_run_in_the_process_pool():
+    executor = ToolExecutor(thread_workers=2, process_workers=1)
+    registry = ToolRegistry()
+    registry.register_object(DocumentProcessingTool())
+    binding = registry.get("document_processing_extract_keywords")
+    text = "Worker processes handle large texts. " * (PROCESS_MIN_INPUT_SIZE // 30)
+
+    try:
+        result = run_calls(executor, binding, [{"text": text}])[0]
+        assert executor._processes is not None
+        assert result == DocumentProcessingTool.extract_keywords(text)
+    finally:
+        executor.shutdown()
+
+
+def test_without_process_workers_process_calls_run_in_threads(executor):
+    tracker = Tracker()
+    binding = binding_for(tracker, execution=PROCESS)
+
+    run_calls(executor, binding, [{"text": "x" * PROCESS_MIN_INPUT_SIZE}])
+
+    assert tracker.threads[0].startswith("mcp-tool")
+
+
+BATCH_PROPERTIES = {"texts": {"type": "array", "maxItems": 8}}
+
+
+def test_batch_chunks_leave_one_worker_free(executor):
+    tracker = Tracker(delay=0.02)
+    binding = binding_for(tracker, batch="texts", properties=BATCH_PROPERTIES)
+    texts = [str(i) * MIN_BATCH_CHUNK_SIZE for i in range(6)]
+
+    result = run_calls(executor, binding, [{"texts": texts}])[0]
+
+    # Each text is a chunk of its own
+    assert result == {"results": texts}
+    assert len(tracker.threads) == 6
+    assert tracker.peak == 2
+
+
+def test_single_calls_find_a_free_worker_while_a_batch_runs(executor):
+    tracker = Tracker(delay=0.5)
+    batch = binding_for(tracker, batch="texts", properties=BATCH_PROPERTIES)
+    single = binding_for(lambda value: tracker.running)
+    texts = ["x" * MIN_BATCH_CHUNK_SIZE] * 4
+
+    async def run():
+        batch_call = asyncio.ensure_future(executor.run(batch, {"texts": texts}))
+        await asyncio.sleep(0.1)
+        running = await asyncio.wait_for(executor.run(single, {}), timeout=0.3)
+        await batch_call
+        return running
+
+    # Two batch chunks were running on the other workers
+    assert asyncio.run(run()) == 2
+
+
+def test_batches_over_max_items_are_passed_whole(executor):
+    tracker = Tracker()
+    binding = binding_for(tracker, batch="texts", properties={"texts": {"type": "array", "maxItems": 2}})
+    texts = ["x" * MIN_BATCH_CHUNK_SIZE] * 3
+
+    run_calls(executor, binding, [{"texts": texts}])
+
+    # One handler call got every item
+    assert len(tracker.threads) == 1
+
+
+def test_cancelled_waiting_calls_release_their_slot(executor):
+    release = threading.Event()
+    binding = binding_for(lambda value: release.wait(5) and value, max_concurrency=1)
+
+    async def run():
+        running = asyncio.ensure_future(executor.run(binding, {"text": "first"}))
+        await asyncio.sleep(0.01)
+        waiting = asyncio.ensure_future(executor.run(binding, {"text": "second"}))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        release.set()
+        first = await running
+        third = await executor.run(binding, {"text": "third"})
+        return first, third
+
+    assert asyncio.run(run()) == ("first", "third")
+    counters = executor.stats()["tools"]["probe"]
+    assert counters["cancelled"] == 1
+    assert counters["completed"] == 2
+    assert counters["waiting"] == 0 and counters["running"] == 0
+
+
+def test_failures_are_counted_and_raised(executor):
+    def fail(value):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_calls(executor, binding_for(fail), [{"text": "a"}])
+    assert executor.stats()["tools"]["probe"]["failed"] == 1
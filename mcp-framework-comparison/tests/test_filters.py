@@ -0,0 +1,260 @@
+"""Tests for the compiled filters in mcp_server.filters."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcp_server import tools
+from mcp_server.dataset import ChunkedDataset, InMemoryDataset
+from mcp_server.filters import SortedIndex, compile_filter
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    size = 200
+    temperature = rng.normal(20, 5, size).round(1)
+    temperature[::17] = np.nan
+    return pd.DataFrame({
+        "date": pd.date_range("2023-01-01", periods=size, freq="D"),
+        "temperature": temperature,
+        "air_quality_index": rng.integers(0, 120, size),
+        "city": rng.choice(["Tokyo", "Paris", "New York"], size)
+    })
+
+
+@pytest.fixture
+def dataset(frame):
+    return InMemoryDataset(frame)
+
+
+def indexed_positions(predicate, dataset):
+    return predicate.select(dataset.frame, dataset.sorted_index, dataset.text_column)
+
+
+def mask_positions(predicate, frame):
+    return np.flatnonzero(predicate.mask(frame))
+
+
+COMPARISONS = [
+    ("temperature", "eq", 20.0),
+    ("temperature", "gt", 20.5),
+    ("temperature", "gte", 20.5),
+    ("temperature", "lt", 18),
+    ("temperature", "lte", 18),
+    ("temperature", "between", [15, 25]),
+    ("temperature", "in", [19.5, 20.0, 21.3]),
+    ("air_quality_index", "eq", 50),
+    ("air_quality_index", "gt", 50),
+    ("air_quality_index", "gte", 50),
+    ("air_quality_index", "lt", 50),
+    ("air_quality_index", "lte", 50),
+    ("air_quality_index", "between", [40, 60]),
+    ("air_quality_index", "in", [10, 50, 90]),
+    ("date", "eq", "2023-03-01"),
+    ("date", "gt", "2023-03-01"),
+    ("date", "gte", "2023-03-01"),
+    ("date", "lt", "2023-03-01"),
+    ("date", "lte", "2023-03-01"),
+    ("date", "between", ["2023-02-01", "2023-02-28"]),
+    ("date", "in", ["2023-01-05", "2023-04-01"]),
+]
+
+
+@pytest.mark.parametrize("column,operator,value", COMPARISONS)
+def test_index_matches_mask(dataset, frame, column, operator, value):
+    predicate = compile_filter({"column": column, "operator": operator, "value": value})
+
+    positions = indexed_positions(predicate, dataset)
+
+    assert positions is not None
+    np.testing.assert_array_equal(positions, mask_positions(predicate, frame))
+
+
+@pytest.mark.parametrize("column,value", [("date", "2023-02"), ("temperature", ".5"), ("city", "York")])
+def test_cached_text_matches_mask_for_contains(dataset, frame, column, value):
+    predicate = compile_filter({"column": column, "operator": "contains", "value": value})
+
+    positions = indexed_positions(predicate, dataset)
+
+    np.testing.assert_array_equal(positions, mask_positions(predicate, frame))
+    assert positions.size
+
+
+def test_contains_without_text_lookup_is_not_indexed(dataset):
+    predicate = compile_filter({"column": "date", "operator": "contains", "value": "2023-02"})
+
+    assert predicate.select(dataset.frame, dataset.sorted_index) is None
+
+
+def test_text_column_is_cached_per_version(dataset, frame):
+    text = dataset.text_column("date")
+
+    assert dataset.text_column("date") is text
+    assert text.iloc[0] == "2023-01-01"
+
+    dataset.replace(frame.iloc[::-1].reset_index(drop=True))
+    assert dataset.text_column("date").iloc[0] == frame["date"].iloc[-1].strftime("%Y-%m-%d")
+
+
+@pytest.mark.parametrize("expression", [
+    {"and": [
+        {"column": "temperature", "operator": "gt", "value": 18},
+        {"column": "city", "operator": "eq", "value": "Paris"}
+    ]},
+    {"and": [
+        {"column": "date", "operator": "between", "value": ["2023-02-01", "2023-04-30"]},
+        {"column": "air_quality_index", "operator": "lt", "value": 60},
+        {"not": {"column": "city", "operator": "contains", "value": "York"}}
+    ]},
+    {"or": [
+        {"column": "air_quality_index", "operator": "gt", "value": 100},
+        {"column": "date", "operator": "contains", "value": "-06-"}
+    ]},
+])
+def test_compound_filters_match_mask(dataset, frame, expression):
+    predicate = compile_filter(expression)
+
+    positions = indexed_positions(predicate, dataset)
+
+    assert positions is not None
+    np.testing.assert_array_equal(positions, mask_positions(predicate, frame))
+
+
+def test_or_with_an_unindexable_child_falls_back_to_mask(dataset):
+    predicate = compile_filter({"or": [
+        {"column": "air_quality_index", "operator": "gt", "value": 100},
+        {"column": "city", "operator": "ne", "value": "Paris"}
+    ]})
+
+    assert indexed_positions(predicate, dataset) is None
+
+
+def test_missing_values_never_match(frame):
+    index = SortedIndex(frame["temperature"].to_numpy())
+
+    positions = index.range()
+
+    np.testing.assert_array_equal(positions, np.flatnonzero(frame["temperature"].notna().to_numpy()))
+
+
+def test_dataset_filter_summarizes_matching_rows(dataset, frame):
+    predicate = compile_filter({"column": "air_quality_index", "operator": "gte", "value": 100})
+
+    result = dataset.filter(predicate)
+
+    matching = frame[frame["air_quality_index"] >= 100]
+    assert result.count == len(matching)
+    assert result.summary["air_quality_index"]["min"] >= 100
+    assert result.sample.equals(matching.head(5))
+
+
+def test_chunked_dataset_filters_like_in_memory(dataset, frame, tmp_path):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    chunked = ChunkedDataset(str(path), chunk_size=32, parse_dates=["date"])
+    predicate = compile_filter({"and": [
+        {"column": "date", "operator": "contains", "value": "2023-0"},
+        {"column": "air_quality_index", "operator": "between", "value": [20, 80]}
+    ]})
+
+    assert chunked.filter(predicate).count == dataset.filter(predicate).count
+
+
+@pytest.mark.parametrize("column,value", [
+    ("date", 5),
+    ("date", True),
+    ("air_quality_index", "50"),
+    ("air_quality_index", True),
+    ("temperature", "20.5"),
+])
+@pytest.mark.parametrize("operator", ["eq", "ne", "gt", "gte", "lt", "lte"])
+def test_values_of_the_wrong_type_are_rejected(dataset, frame, column, value, operator):
+    predicate = compile_filter({"column": column, "operator": operator, "value": value})
+
+    with pytest.raises(ValueError, match="cannot be compared"):
+        predicate.mask(frame)
+    with pytest.raises(ValueError, match="cannot be compared"):
+        dataset.filter(predicate)
+
+
+@pytest.mark.parametrize("column,value", [("date", [5, "2023-01-05"]), ("temperature", [20.5, "21"])])
+def test_list_items_of_the_wrong_type_are_rejected(dataset, column, value):
+    predicate = compile_filter({"column": column, "operator": "in", "value": value})
+
+    with pytest.raises(ValueError, match="cannot be compared"):
+        dataset.filter(predicate)
+
+
+@pytest.mark.parametrize("expression,message", [
+    ({"column": "temperature", "operator": "like", "value": 1}, "not supported"),
+    ({"column": "temperature", "operator": "between", "value": 1}, "requires a \\[low, high\\]"),
+    ({"column": "temperature", "operator": "in", "value": 1}, "requires a list"),
+    ({"and": []}, "non-empty list"),
+    ({"column": "temperature"}, "Invalid filter expression"),
+])
+def test_malformed_expressions_are_rejected(expression, message):
+    with pytest.raises(ValueError, match=message):
+        compile_filter(expression)
+
+
+def test_compiled_filters_are_reused():
+    first = compile_filter({"column": "temperature", "operator": "gt", "value": 1})
+    second = compile_filter({"value": 1, "operator": "gt", "column": "temperature"})
+
+    assert first is second
+
+
+@pytest.fixture
+def tool_dataset(dataset):
+    tools.set_dataset(dataset)
+    yield dataset
+    tools.set_dataset(None)
+
+
+def test_filter_tool_reports_wrong_value_types(tool_dataset):
+    result = tools.DataAnalysisTool.filter_data("date", "gt", 5)
+
+    assert "cannot be compared with date column 'date'" in result["error"]
+
+
+def test_filter_tool_answers_contains_on_dates(tool_dataset):
+    result = tools.DataAnalysisTool.filter_data("date", "contains", "2023-02")
+
+    assert result["count"] == 28
+
+
+@pytest.mark.parametrize("operator,value", [
+    ("eq", None),
+    ("gt", None),
+    ("ne", None),
+    ("in", [None]),
+    ("in", [10, None]),
+    ("between", [None, 50]),
+])
+def test_missing_values_are_rejected(operator, value):
+    with pytest.raises(ValueError, match=f"Operator '{operator}' requires a value"):
+        compile_filter({"column": "air_quality_index", "operator": operator, "value": value})
+
+
+@pytest.mark.parametrize("sibling", [
+    {"column": "air_quality_index", "operator": "gt", "value": 100},
+    {"column": "city", "operator": "ne", "value": "Paris"},
+])
+def test_missing_values_fail_alike_on_the_index_and_mask_paths(tool_dataset, sibling):
+    # The sibling decides whether the "or" is answered from the index
+    where = {"or": [{"column": "air_quality_index", "operator": "gt"}, sibling]}
+
+    result = tools.DataAnalysisTool.filter_data(where=where)
+
+    assert result == {"error": "Operator 'gt' requires a value"}
+
+
+def test_filter_tool_requires_a_value(tool_dataset):
+    assert tools.DataAnalysisTool.filter_data("date", "eq") == {"error": "Operator 'eq' requires a value"}
+
+
+def test_contains_none_agrees_on_both_paths(dataset, frame):
+    predicate = compile_filter({"column": "city", "operator": "contains", "value": None})
+
+    np.testing.assert_array_equal(indexed_positions(predicate, dataset), mask_positions(predicate, frame))
@@ -0,0 +1,186 @@
+"""Tests for the entity gazetteer in mcp_server.gazetteer."""
+
+import asyncio
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_server import tools
+from mcp_server.cache import ResponseCache
+from mcp_server.gazetteer import Gazetteer
+from mcp_server.server import MCPServer
+
+
+def names(gazetteer, text):
+    return [(text[start:end], category) for start, end, category in gazetteer.find(text)]
+
+
+def test_multi_word_names_match_as_one_entity():
+    gazetteer = Gazetteer()
+    gazetteer.add_names(["Hugging Face", "New York"], "organizations")
+    gazetteer.add("York", "places")
+
+    text = "Hugging  Face opened an office in New York, not in York."
+
+    assert names(gazetteer, text) == [
+        ("Hugging  Face", "organizations"),
+        ("New York", "organizations"),
+        ("York", "places")
+    ]
+
+
+def test_partial_multi_word_names_do_not_match():
+    gazetteer = Gazetteer()
+    gazetteer.add("New York City", "places")
+
+    assert gazetteer.find("New York is big") == []
+
+
+def test_overlapping_names_resolve_to_the_leftmost_then_longest():
+    gazetteer = Gazetteer()
+    gazetteer.add("New York", "places")
+    gazetteer.add("New York Times", "organizations")
+    gazetteer.add("Times Square", "places")
+
+    assert names(gazetteer, "The New York Times Square office") == [("New York Times", "organizations")]
+    assert names(gazetteer, "Meet at Times Square in New York") == [
+        ("Times Square", "places"),
+        ("New York", "places")
+    ]
+
+
+def test_names_found_through_failure_links():
+    gazetteer = Gazetteer()
+    gazetteer.add("Bank of America Merrill", "organizations")
+    gazetteer.add("America Online", "organizations")
+
+    # After "Bank of America" the automaton falls back to "America" and
+    # continues with "Online"
+    assert names(gazetteer, "Bank of America Online") == [("America Online", "organizations")]
+    assert names(gazetteer, "Bank of America Merrill Online") == [("Bank of America Merrill", "organizations")]
+
+
+def test_shorter_names_inside_longer_ones_are_not_reported_twice():
+    gazetteer = Gazetteer()
+    gazetteer.add("Face", "misc")
+    gazetteer.add("Hugging Face", "organizations")
+
+    assert names(gazetteer, "Hugging Face and Face") == [("Hugging Face", "organizations"), ("Face", "misc")]
+
+
+def test_tokens_keep_inner_punctuation():
+    gazetteer = Gazetteer()
+    gazetteer.add("AT&T", "organizations")
+    gazetteer.add("Coca-Cola", "organizations")
+
+    assert names(gazetteer, "AT&T and Coca-Cola, but not Coca") == [
+        ("AT&T", "organizations"),
+        ("Coca-Cola", "organizations")
+    ]
+
+
+def test_case_sensitivity():
+    sensitive = Gazetteer()
+    sensitive.add("OpenAI", "organizations")
+    insensitive = Gazetteer(case_sensitive=False)
+    insensitive.add("OpenAI", "organizations")
+
+    assert sensitive.find("openai") == []
+    assert names(insensitive, "openai") == [("openai", "organizations")]
+
+
+def test_adding_names_after_matching_recompiles():
+    gazetteer = Gazetteer()
+    gazetteer.add("Paris", "places")
+    assert len(gazetteer.find("Paris and Berlin")) == 1
+    version = gazetteer.version
+
+    gazetteer.add("Berlin", "places")
+
+    assert gazetteer.version > version
+    assert len(gazetteer) == 2
+    assert names(gazetteer, "Paris and Berlin") == [("Paris", "places"), ("Berlin", "places")]
+
+
+def test_load_json_and_text_dictionaries(tmp_path):
+    json_path = tmp_path / "entities.json"
+    json_path.write_text(json.dumps({"organizations": ["Acme Corp"]}), encoding="utf-8")
+    text_path = tmp_path / "places.txt"
+    text_path.write_text("Springfield\n\nShelbyville\n", encoding="utf-8")
+
+    gazetteer = Gazetteer()
+    gazetteer.load(str(json_path))
+    gazetteer.load(str(text_path))
+
+    assert len(gazetteer) == 3
+    assert names(gazetteer, "Acme Corp moved from Springfield") == [
+        ("Acme Corp", "organizations"),
+        ("Springfield", "places")
+    ]
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_matching_while_names_are_added_from_another_thread(frequent_thread_switches):
+    gazetteer = Gazetteer()
+    gazetteer.add("Acme Corp", "organizations")
+    text = " ".join(f"Name{i} Corp" for i in range(2000)) + " Acme Corp"
+    done = threading.Event()
+
+    def add_names():
+        for i in range(2000):
+            gazetteer.add(f"Name{i} Corp", "organizations")
+        done.set()
+
+    def match():
+        results = []
+        while not done.is_set():
+            results.append(gazetteer.find(text))
+        return results
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        matchers = [pool.submit(match) for _ in range(3)]
+        pool.submit(add_names).result()
+        for matcher in matchers:
+            for matches in matcher.result():
+                # Every snapshot is consistent: the names added so far, in order
+                assert matches[-1][2] == "organizations"
+                assert text[matches[-1][0]:matches[-1][1]] == "Acme Corp"
+
+    assert len(gazetteer.find(text)) == 2001
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+    tools.set_entity_gazetteer(None)
+
+
+def extract(server, text):
+    binding = server.tool_registry.get("document_processing_extract_entities")
+    _, payload = asyncio.run(server._run_tool(binding, {"text": text}))
+    return json.loads(payload)
+
+
+def test_replaced_and_extended_gazetteers_apply_to_cached_calls(server):
+    text = "Zorblax Industries hired staff."
+    assert "Zorblax Industries" not in extract(server, text)["organizations"]
+
+    gazetteer = Gazetteer()
+    gazetteer.add("Zorblax", "places")
+    tools.set_entity_gazetteer(gazetteer)
+    assert extract(server, text)["places"] == ["Zorblax"]
+
+    gazetteer.add("Zorblax Industries", "organizations")
+    assert extract(server, text)["organizations"] == ["Zorblax Industries"]
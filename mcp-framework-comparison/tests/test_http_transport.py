@@ -0,0 +1,155 @@
+"""Tests for the streamable HTTP transport in mcp_server.http_transport."""
+
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+from mcp_client import AsyncMCPClient
+from mcp_server.cache import ResponseCache
+from mcp_server.http_transport import MCP_PATH, create_http_app, create_session_manager
+from mcp_server.server import MCPServer
+
+# Directory holding run_server.py
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+HEADERS = {"Accept": "application/json, text/event-stream"}
+
+
+def rpc(method, params=None, request_id=1):
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return message
+
+
+def tool_call(name, arguments, request_id=1):
+    return rpc("tools/call", {"name": name, "arguments": arguments}, request_id)
+
+
+def tool_result(response):
+    return json.loads(response.json()["result"]["content"][0]["text"])
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+
+
+def test_health_reports_server_metrics(server):
+    with TestClient(create_http_app(server)) as client:
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert set(response.json()["metrics"]) == {"response_cache", "executor", "pipeline"}
+
+
+def test_stateless_json_requests(server):
+    app = create_http_app(server, create_session_manager(server, stateless=True, json_response=True))
+
+    with TestClient(app) as client:
+        listed = client.post(MCP_PATH, json=rpc("tools/list"), headers=HEADERS)
+        called = client.post(
+            MCP_PATH,
+            json=tool_call("knowledge_base_get_info", {"topic": "mcp", "subtopic": "components"}),
+            headers=HEADERS
+        )
+        # The second call is answered from the cache the requests share
+        client.post(MCP_PATH, json=tool_call("knowledge_base_list_topics", {}), headers=HEADERS)
+        client.post(MCP_PATH, json=tool_call("knowledge_base_list_topics", {}), headers=HEADERS)
+        stats = client.get("/health").json()["metrics"]["response_cache"]
+
+    assert listed.headers["content-type"] == "application/json"
+    assert "knowledge_base_search" in [tool["name"] for tool in listed.json()["result"]["tools"]]
+    assert tool_result(called) == {"components": ["Server", "Client", "Transport", "Tools", "Resources"]}
+    assert stats["tools"]["knowledge_base_list_topics"]["hits"] == 1
+
+
+def test_sessions_are_pipelined_and_reported(server):
+    app = create_http_app(server, create_session_manager(server, json_response=True))
+    initialize = rpc("initialize", {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "1"}
+    })
+
+    with TestClient(app) as client:
+        opened = client.post(MCP_PATH, json=initialize, headers=HEADERS)
+        headers = {**HEADERS, "mcp-session-id": opened.headers["mcp-session-id"]}
+        client.post(MCP_PATH, json={"jsonrpc": "2.0", "method": "notifications/initialized"}, headers=headers)
+        search = tool_call("knowledge_base_search", {"query": "protocol"}, request_id=2)
+        called = client.post(MCP_PATH, json=search, headers=headers)
+        pipeline = client.get("/health").json()["metrics"]["pipeline"]
+        unknown = client.post(MCP_PATH, json=rpc("tools/list", request_id=3), headers={**HEADERS, "mcp-session-id": "x"})
+
+    assert opened.status_code == 200
+    assert "mcp" in tool_result(called)
+    assert pipeline["sessions"] == 1
+    assert pipeline["dispatched"] == 2
+    assert unknown.status_code == 404
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "run_server.py", "--transport", "http", "--port", str(port)],
+        cwd=PROJECT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{url}/health", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    pytest.fail("The HTTP server did not start")
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def test_one_process_serves_concurrent_clients(server_url):
+    async def session(topic):
+        async with AsyncMCPClient(server_url) as client:
+            results = await client.call_tools([
+                ("knowledge_base_get_info", {"topic": topic}),
+                ("knowledge_base_list_topics", {}),
+            ])
+            return client.transport, results
+
+    async def run():
+        return await asyncio.gather(session("mcp"), session("ai_frameworks"))
+
+    (transport, mcp), (_, frameworks) = asyncio.run(run())
+    metrics = httpx.get(f"{server_url}/health").json()["metrics"]
+
+    assert transport == "http"
+    assert mcp[0]["specification"].startswith("https://")
+    assert "langchain" in frameworks[0]
+    assert mcp[1] == frameworks[1] == ["ai_frameworks", "mcp"]
+    # Both sessions shared the process and its response cache
+    lookups = metrics["response_cache"]["tools"]["knowledge_base_list_topics"]
+    assert lookups["hits"] + lookups["misses"] == 2
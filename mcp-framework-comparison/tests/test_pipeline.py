@@ -0,0 +1,153 @@
+"""Tests for request pipelining in mcp_server.pipeline."""
+
+import anyio
+import pytest
+from mcp.shared.message import SessionMessage
+from mcp.types import JSONRPCMessage, JSONRPCNotification, JSONRPCRequest, JSONRPCResponse
+
+from mcp_server.pipeline import CANCELLED_METHOD, RequestPipeline
+
+
+def request(request_id):
+    return SessionMessage(JSONRPCMessage(JSONRPCRequest(jsonrpc="2.0", id=request_id, method="tools/call")))
+
+
+def response(request_id):
+    return SessionMessage(JSONRPCMessage(JSONRPCResponse(jsonrpc="2.0", id=request_id, result={})))
+
+
+def notification(method, **params):
+    return SessionMessage(JSONRPCMessage(JSONRPCNotification(jsonrpc="2.0", method=method, params=params)))
+
+
+def describe(message):
+    root = message.message.root
+    return root.id if isinstance(root, (JSONRPCRequest, JSONRPCResponse)) else root.method
+
+
+async def receive(stream, count):
+    with anyio.fail_after(1):
+        return [describe(await stream.receive()) for _ in range(count)]
+
+
+async def assert_idle(stream):
+    with anyio.move_on_after(0.05):
+        message = await stream.receive()
+        pytest.fail(f"Unexpected message {describe(message)}")
+
+
+def run_session(pipeline, session):
+    """Run a session coroutine between a fake client and the pipeline."""
+
+    async def run():
+        client_send, read_stream = anyio.create_memory_object_stream(100)
+        write_stream, client_receive = anyio.create_memory_object_stream(100)
+        async with pipeline.attach(read_stream, write_stream) as (session_read, session_write):
+            await session(client_send, client_receive, session_read, session_write)
+
+    anyio.run(run)
+
+
+def test_requests_are_released_in_order_as_responses_go_out():
+    pipeline = RequestPipeline(max_in_flight=2)
+
+    async def session(client_send, client_receive, session_read, session_write):
+        for request_id in range(1, 6):
+            await client_send.send(request(request_id))
+
+        assert await receive(session_read, 2) == [1, 2]
+        await assert_idle(session_read)
+
+        # Responses may go out of order; each frees one slot
+        await session_write.send(response(2))
+        assert await receive(client_receive, 1) == [2]
+        assert await receive(session_read, 1) == [3]
+
+        await session_write.send(response(1))
+        await session_write.send(response(3))
+        assert await receive(session_read, 2) == [4, 5]
+        assert pipeline.stats()["in_flight"] == 2
+
+    run_session(pipeline, session)
+
+    assert pipeline.stats()["dispatched"] == 5
+
+
+def test_notifications_are_never_held_back():
+    pipeline = RequestPipeline(max_in_flight=1)
+
+    async def session(client_send, client_receive, session_read, session_write):
+        await client_send.send(request(1))
+        await client_send.send(request(2))
+        await client_send.send(notification("notifications/progress", progressToken=1, progress=0.5))
+
+        assert await receive(session_read, 2) == [1, "notifications/progress"]
+        assert pipeline.stats()["pending"] == 1
+
+    run_session(pipeline, session)
+
+
+def test_cancelled_requests_are_dropped_before_dispatch():
+    pipeline = RequestPipeline(max_in_flight=1, max_pending=4)
+
+    async def session(client_send, client_receive, session_read, session_write):
+        for request_id in range(1, 4):
+            await client_send.send(request(request_id))
+        assert await receive(session_read, 1) == [1]
+
+        await client_send.send(notification(CANCELLED_METHOD, requestId=2))
+        await client_send.send(notification(CANCELLED_METHOD, requestId=1))
+
+        # Only the cancellation of the dispatched request reaches the session
+        assert await receive(session_read, 1) == [CANCELLED_METHOD]
+        await session_write.send(response(1))
+        assert await receive(session_read, 1) == [3]
+
+    run_session(pipeline, session)
+
+    assert pipeline.stats()["dropped"] == 1
+    assert pipeline.stats()["dispatched"] == 2
+
+
+def test_a_full_queue_stops_reading_the_transport():
+    pipeline = RequestPipeline(max_in_flight=1, max_pending=2)
+
+    async def session(client_send, client_receive, session_read, session_write):
+        for request_id in range(1, 6):
+            await client_send.send(request(request_id))
+        assert await receive(session_read, 1) == [1]
+        await anyio.sleep(0.05)
+
+        assert pipeline.stats()["pending"] == 2
+        assert client_send.statistics().current_buffer_used == 1
+
+        await session_write.send(response(1))
+        assert await receive(session_read, 1) == [2]
+        await anyio.sleep(0.05)
+        assert client_send.statistics().current_buffer_used == 0
+
+    run_session(pipeline, session)
+
+
+def test_session_sees_the_end_once_queued_requests_are_dispatched():
+    pipeline = RequestPipeline(max_in_flight=1)
+
+    async def session(client_send, client_receive, session_read, session_write):
+        await client_send.send(request(1))
+        await client_send.send(request(2))
+        await client_send.aclose()
+
+        assert await receive(session_read, 1) == [1]
+        await session_write.send(response(1))
+        assert await receive(session_read, 1) == [2]
+        await session_write.send(response(2))
+        with anyio.fail_after(1):
+            with pytest.raises(anyio.EndOfStream):
+                await session_read.receive()
+
+    run_session(pipeline, session)
+
+
+def test_max_in_flight_must_be_positive():
+    with pytest.raises(ValueError, match="max_in_flight must be at least 1"):
+        RequestPipeline(max_in_flight=0)
@@ -0,0 +1,143 @@
+"""Tests for tool declaration and dispatch in mcp_server.registry."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.cache import ResponseCache
+from mcp_server.composition import PIPELINE_TOOL_NAME
+from mcp_server.execution import THREAD
+from mcp_server.registry import TOOL_ATTRIBUTE, ToolRegistry, tool
+from mcp_server.server import MCPServer
+
+
+class Greeter:
+    """Tool object with two declared tools and one plain method."""
+
+    @staticmethod
+    @tool(
+        name="greet",
+        description="Greet someone",
+        properties={"name": {"type": "string"}, "punctuation": {"type": "string"}},
+        required=["name"]
+    )
+    def greet(name: str, punctuation: str = "!") -> str:
+        return f"Hello, {name}{punctuation}"
+
+    @tool(name="count", description="Count the calls", execution=THREAD, max_concurrency=2)
+    def count(self) -> int:
+        self.calls = getattr(self, "calls", 0) + 1
+        return self.calls
+
+    def helper(self) -> None:
+        pass
+
+
+class LoudGreeter(Greeter):
+    """Subclass adding a tool after the inherited ones."""
+
+    @staticmethod
+    @tool(name="shout", description="Shout at someone")
+    def shout(name: str) -> str:
+        return f"HEY {name.upper()}"
+
+
+def test_decorator_builds_the_definition():
+    definition = getattr(Greeter.greet, TOOL_ATTRIBUTE)
+
+    assert definition.name == "greet"
+    assert definition.input_schema == {
+        "type": "object",
+        "properties": {"name": {"type": "string"}, "punctuation": {"type": "string"}},
+        "required": ["name"]
+    }
+    assert definition.cache_ttl is None
+    assert getattr(Greeter.count, TOOL_ATTRIBUTE).execution == THREAD
+
+
+def test_unknown_execution_policies_are_rejected():
+    with pytest.raises(ValueError, match="Unknown execution policy 'gpu'"):
+        tool(name="t", description="t", execution="gpu")
+
+
+def test_register_object_keeps_definition_order_across_subclasses():
+    registry = ToolRegistry()
+
+    bindings = registry.register_object(LoudGreeter())
+
+    assert [binding.name for binding in bindings] == ["greet", "count", "shout"]
+    assert [listed.name for listed in registry.list_tools()] == ["greet", "count", "shout"]
+    assert "helper" not in registry
+    assert len(registry) == 3
+
+
+def test_bound_methods_keep_their_instance():
+    registry = ToolRegistry()
+    registry.register_object(Greeter())
+    binding = registry.get("count")
+
+    assert binding({}) == 1
+    assert binding(None) == 2
+
+
+@pytest.mark.parametrize("arguments,expected", [
+    ({"name": "Ada"}, "Hello, Ada!"),
+    ({"name": "Ada", "punctuation": "?"}, "Hello, Ada?"),
+    ({"name": "Ada", "punctuation": None}, "Hello, Ada!"),
+    ({"name": "Ada", "unknown": 1}, "Hello, Ada!"),
+])
+def test_arguments_are_bound_to_parameters_and_defaults(arguments, expected):
+    registry = ToolRegistry()
+    registry.register_object(Greeter())
+
+    assert registry.get("greet")(arguments) == expected
+
+
+def test_missing_arguments_without_a_default_bind_to_none():
+    registry = ToolRegistry()
+    registry.register_object(Greeter())
+
+    assert registry.get("greet").bind({}) == {"name": None, "punctuation": "!"}
+
+
+def test_duplicate_and_undeclared_tools_are_rejected():
+    registry = ToolRegistry()
+    registry.register_object(Greeter())
+
+    with pytest.raises(ValueError, match="Tool 'greet' is already registered"):
+        registry.register(Greeter.greet)
+    with pytest.raises(ValueError, match="is not declared as a tool"):
+        registry.register(Greeter().helper)
+
+
+def test_tool_list_is_rebuilt_after_a_registration():
+    registry = ToolRegistry()
+    registry.register(Greeter.greet)
+    first = registry.list_tools()
+
+    assert registry.list_tools() is first
+
+    registry.register(LoudGreeter.shout)
+    assert [listed.name for listed in registry.list_tools()] == ["greet", "shout"]
+    assert registry.get("missing") is None
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+
+
+def test_server_lists_every_registered_tool_and_the_pipeline_tool(server):
+    names = [listed.name for listed in asyncio.run(server._handle_list_tools())]
+
+    assert names[:-1] == [listed.name for listed in server.tool_registry.list_tools()]
+    assert names[-1] == PIPELINE_TOOL_NAME
+    assert len(names) == len(set(names))
+
+
+def test_server_reports_unknown_tools(server):
+    content = asyncio.run(server._handle_call_tool("no_such_tool", {}))
+
+    assert content[0].text == "Unknown tool: no_such_tool"
@@ -0,0 +1,122 @@
+"""Tests for the inverted index and snippets in mcp_server.search."""
+
+import math
+
+import pytest
+
+from mcp_server.search import InvertedIndex, make_snippet, tokenize
+
+
+def build_index(**kwargs):
+    index = InvertedIndex(**kwargs)
+    index.add("mcp", {"title": "Model Context Protocol", "content": "MCP connects models to tools and data."})
+    index.add("langchain", {"title": "LangChain", "content": "LangChain chains models, tools and indexes."})
+    index.add("pandas", {"title": "Pandas", "content": "Pandas analyzes tabular data with data frames."})
+    return index
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert tokenize("What is the Model-Context Protocol?") == ["model", "context", "protocol"]
+
+
+def test_bm25_score_matches_formula():
+    index = InvertedIndex()
+    index.add(1, {"text": "apple apple banana"})
+    index.add(2, {"text": "banana cherry"})
+
+    # "apple" occurs in one of two documents, twice in a document of length 3
+    k1, b = index.k1, index.b
+    idf = math.log(1.0 + (2 - 1 + 0.5) / (1 + 0.5))
+    norm = k1 * (1.0 - b + b * 3 / 2.5)
+    expected = idf * 2 * (k1 + 1.0) / (2 + norm)
+
+    assert index.score("apple") == {1: pytest.approx(expected)}
+
+
+def test_search_ranks_more_relevant_documents_first():
+    index = build_index()
+
+    results = index.search("data")
+
+    assert [doc_id for doc_id, _ in results] == ["pandas", "mcp"]
+    assert results[0][1] > results[1][1]
+
+
+def test_field_weights_favor_title_matches():
+    index = InvertedIndex(field_weights={"title": 3.0})
+    index.add("title", {"title": "tools", "content": "other words here"})
+    index.add("content", {"title": "other", "content": "tools words here"})
+
+    assert index.search("tools")[0][0] == "title"
+
+
+def test_query_tokens_match_terms_they_prefix():
+    index = build_index()
+
+    assert index.matching_terms("index") == {"indexes"}
+    assert [doc_id for doc_id, _ in index.search("analy")] == ["pandas"]
+
+
+def test_short_query_tokens_only_match_exactly():
+    index = InvertedIndex()
+    index.add(1, {"text": "ai agents"})
+    index.add(2, {"text": "aim"})
+
+    assert index.matching_terms("ai") == {"ai"}
+    assert set(index.score("ai")) == {1}
+
+
+def test_top_k_limits_results_and_none_returns_all():
+    index = build_index()
+
+    assert len(index.search("models tools data", top_k=1)) == 1
+    assert {doc_id for doc_id, _ in index.search("models tools data", top_k=None)} == {"mcp", "langchain", "pandas"}
+
+
+def test_remove_and_replace_keep_the_index_consistent():
+    index = build_index()
+
+    index.remove("pandas")
+    assert "pandas" not in index
+    assert [doc_id for doc_id, _ in index.search("data")] == ["mcp"]
+    assert index.matching_terms("tabular") == set()
+
+    index.add("mcp", {"title": "MCP", "content": "servers"})
+    assert index.search("data") == []
+    assert [doc_id for doc_id, _ in index.search("servers")] == ["mcp"]
+
+    index.remove("mcp")
+    index.remove("langchain")
+    index.remove("missing")
+    assert len(index) == 0
+    assert index.search("servers") == []
+
+
+def test_clear_empties_the_index():
+    index = build_index()
+
+    index.clear()
+
+    assert len(index) == 0
+    assert index.score("data") == {}
+
+
+def test_snippet_highlights_the_best_window():
+    text = "Intro words. " * 20 + "The protocol connects models to data sources. " + "Filler text. " * 20
+    terms = {"protocol", "data"}
+
+    snippet = make_snippet(text, terms, max_tokens=10)
+
+    assert "<mark>protocol</mark>" in snippet
+    assert "<mark>data</mark>" in snippet
+    assert snippet.startswith("...") and snippet.endswith("...")
+
+
+def test_snippet_keeps_original_case_and_custom_markers():
+    snippet = make_snippet("Model Context Protocol", {"protocol"}, highlight=("[", "]"))
+
+    assert snippet == "Model Context [Protocol]"
+
+
+def test_snippet_is_none_without_matches():
+    assert make_snippet("nothing relevant here", {"protocol"}) is None
@@ -0,0 +1,124 @@
+"""Tests for response serialization in mcp_server.serialization."""
+
+import json
+import math
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcp_server.serialization import (
+    BACKEND_ENV,
+    PRETTY_ENV,
+    OrjsonSerializer,
+    StdlibSerializer,
+    create_serializer,
+    orjson,
+    to_json_compatible,
+)
+
+BACKENDS = [
+    "json",
+    pytest.param("orjson", marks=pytest.mark.skipif(orjson is None, reason="orjson is not installed"))
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def serializer(request):
+    return create_serializer(request.param, pretty=False)
+
+
+def test_builtin_values_encode_compactly(serializer):
+    payload = {"text": "naïve café", "values": [1, 2.5, None, True], "nested": {"a": []}}
+
+    encoded = serializer.dumps(payload)
+
+    assert encoded == '{"text":"naïve café","values":[1,2.5,null,true],"nested":{"a":[]}}'
+    assert serializer.dumpb(payload) == encoded.encode("utf-8")
+
+
+def test_non_finite_floats_become_null(serializer):
+    payload = {"nan": math.nan, "values": [1.0, math.inf, -math.inf], "row": (math.nan,)}
+
+    assert json.loads(serializer.dumps(payload)) == {"nan": None, "values": [1.0, None, None], "row": [None]}
+
+
+def test_numpy_and_pandas_values_are_converted(serializer):
+    payload = {
+        "int": np.int64(3),
+        "float": np.float32(0.5),
+        "nan": np.float64("nan"),
+        "array": np.array([1.0, np.nan]),
+        "series": pd.Series([1, 2]),
+        "frame": pd.DataFrame({"x": [1.5, np.nan]}),
+        "timestamp": pd.Timestamp("2024-01-02 03:04:05"),
+        "nat": pd.NaT,
+        "datetime64": np.datetime64("2024-01-02"),
+        "missing_datetime64": np.datetime64("NaT")
+    }
+
+    decoded = json.loads(serializer.dumps(payload))
+
+    assert decoded["int"] == 3
+    assert decoded["float"] == 0.5
+    assert decoded["nan"] is None
+    assert decoded["array"] == [1.0, None]
+    assert decoded["series"] == [1, 2]
+    assert decoded["frame"] == [{"x": 1.5}, {"x": None}]
+    assert decoded["timestamp"].startswith("2024-01-02T03:04:05")
+    assert decoded["nat"] is None
+    assert decoded["datetime64"].startswith("2024-01-02")
+    assert decoded["missing_datetime64"] is None
+
+
+def test_standard_library_values_are_converted(serializer):
+    payload = {
+        "datetime": datetime(2024, 1, 2, 3, 4, 5),
+        "date": date(2024, 1, 2),
+        "duration": timedelta(minutes=1, seconds=30),
+        "decimal": Decimal("1.25"),
+        "set": {"only"}
+    }
+
+    assert json.loads(serializer.dumps(payload)) == {
+        "datetime": "2024-01-02T03:04:05",
+        "date": "2024-01-02",
+        "duration": 90.0,
+        "decimal": 1.25,
+        "set": ["only"]
+    }
+
+
+def test_unsupported_values_raise_type_error(serializer):
+    with pytest.raises(TypeError, match="Object of type object is not JSON serializable"):
+        to_json_compatible(object())
+    with pytest.raises(TypeError):
+        serializer.dumps({"value": object()})
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pretty_output_is_indented(backend):
+    assert create_serializer(backend, pretty=True).dumps({"a": [1]}) == '{\n  "a": [\n    1\n  ]\n}'
+
+
+def test_backend_and_indentation_follow_the_environment(monkeypatch):
+    monkeypatch.setenv(BACKEND_ENV, "json")
+    monkeypatch.setenv(PRETTY_ENV, "true")
+
+    serializer = create_serializer()
+
+    assert isinstance(serializer, StdlibSerializer)
+    assert serializer.pretty
+
+    monkeypatch.delenv(BACKEND_ENV)
+    monkeypatch.delenv(PRETTY_ENV)
+    default = OrjsonSerializer if orjson is not None else StdlibSerializer
+    assert isinstance(create_serializer(), default)
+    assert not create_serializer().pretty
+
+
+def test_unknown_backends_are_rejected():
+    with pytest.raises(ValueError, match="Unknown serializer backend 'yaml'"):
+        create_serializer("yaml")
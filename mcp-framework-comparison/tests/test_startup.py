@@ -0,0 +1,61 @@
+"""Tests for the lazy loading of data dependencies in mcp_server.tools."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from mcp_server import tools
+
+# Directory holding the mcp_server package
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.split()
+
+
+def test_server_starts_without_pandas_numpy_or_sample_data():
+    output = run_python(
+        "import sys\n"
+        "from mcp_server import tools\n"
+        "from mcp_server.server import MCPServer\n"
+        "server = MCPServer()\n"
+        "server.executor.shutdown()\n"
+        "print('pandas' in sys.modules, 'numpy' in sys.modules, tools._sample_data is not None)\n"
+    )
+
+    assert output == ["False", "False", "False"]
+
+
+def test_knowledge_base_calls_do_not_load_pandas():
+    output = run_python(
+        "import sys\n"
+        "from mcp_server.tools import KnowledgeBaseTool\n"
+        "KnowledgeBaseTool.search('protocol')\n"
+        "print('pandas' in sys.modules)\n"
+    )
+
+    assert output == ["False"]
+
+
+def test_sample_data_is_generated_once_on_first_access():
+    data = tools.SAMPLE_DATA
+
+    assert tools.get_sample_data() is data
+    assert list(data.columns) == [
+        "date", "temperature", "humidity", "wind_speed", "precipitation", "air_quality_index"
+    ]
+    assert len(data) == 365
+
+
+def test_unknown_module_attributes_still_raise():
+    with pytest.raises(AttributeError, match="has no attribute 'MISSING'"):
+        tools.MISSING
@@ -0,0 +1,135 @@
+"""Tests for the knowledge base stores in mcp_server.storage."""
+
+import json
+
+import pytest
+
+from mcp_server import tools
+from mcp_server.execution import THREAD
+from mcp_server.registry import TOOL_ATTRIBUTE
+from mcp_server.storage import (
+    InMemoryKnowledgeBaseStore,
+    SQLiteKnowledgeBaseStore,
+    build_sqlite_store,
+    split_topic,
+)
+from mcp_server.tools import KnowledgeBaseTool
+
+
+TOPICS = {
+    "frameworks": {
+        "langchain": {"description": "Chains of language model calls", "language": "python"},
+        "autogen": {"description": "Conversations between agents"}
+    },
+    "mcp": {
+        "description": "Protocol for tools and resources",
+        "components": ["Server", "Client"]
+    }
+}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryKnowledgeBaseStore(json.loads(json.dumps(TOPICS)))
+        return
+
+    store = SQLiteKnowledgeBaseStore(str(tmp_path / "kb.db"))
+    store.put_topics(TOPICS)
+    yield store
+    store.close()
+
+
+def test_topics_of_dictionaries_split_into_subtopics():
+    assert [entry[:2] for entry in split_topic("frameworks", TOPICS["frameworks"])] == [
+        ("langchain", "langchain"),
+        ("autogen", "autogen")
+    ]
+    assert split_topic("mcp", TOPICS["mcp"]) == [(None, "mcp", TOPICS["mcp"])]
+    assert split_topic("empty", {}) == [(None, "empty", {})]
+
+
+def test_topics_and_subtopics_round_trip(store):
+    assert store.list_topics() == ["frameworks", "mcp"]
+    assert store.get_topic("frameworks") == TOPICS["frameworks"]
+    assert store.get_topic("mcp") == TOPICS["mcp"]
+    assert store.get_subtopic("frameworks", "autogen") == TOPICS["frameworks"]["autogen"]
+    assert store.get_subtopic("mcp", "description") == TOPICS["mcp"]["description"]
+    assert store.get_topic("missing") is None
+    assert store.get_subtopic("frameworks", "missing") is None
+
+
+def test_search_ranks_name_and_text_matches(store):
+    hits = store.search("agent conversations")
+
+    assert [key for key, _ in hits] == [("frameworks", "autogen")]
+    assert hits[0][1] > 0
+    assert [key for key, _ in store.search("protocol")] == [("mcp", None)]
+    assert store.search("langchain")[0][0] == ("frameworks", "langchain")
+    assert store.search("") == []
+
+
+def test_search_matches_prefixes_and_limits_results(store):
+    assert store.search("conversation")[0][0] == ("frameworks", "autogen")
+    assert len(store.search("python protocol agents", top_k=1)) == 1
+    assert len(store.search("python protocol agents", top_k=None)) == 3
+
+
+def test_changes_are_visible_and_bump_the_version(store):
+    version = store.version
+
+    store.put_topic("mcp", {"description": "Replaced content about transports"})
+    store.delete_topic("frameworks")
+
+    assert store.version == version + 2
+    assert store.list_topics() == ["mcp"]
+    assert store.get_topic("mcp") == {"description": "Replaced content about transports"}
+    assert store.search("protocol") == []
+    assert store.search("agents") == []
+    assert [key for key, _ in store.search("transports")] == [("mcp", None)]
+
+
+def test_sqlite_cache_stays_bounded_and_sees_writes(tmp_path):
+    store = SQLiteKnowledgeBaseStore(str(tmp_path / "kb.db"), cache_size=2)
+    store.put_topics(TOPICS)
+
+    assert store.get_topic("frameworks") == TOPICS["frameworks"]
+    assert store.get_topic("mcp") == TOPICS["mcp"]
+    assert len(store._cache) == 2
+
+    store.put_topic("mcp", {"description": "New"})
+    assert store.get_subtopic("mcp", "description") == "New"
+    store.close()
+
+
+def test_build_sqlite_store_from_json(tmp_path):
+    source = tmp_path / "kb.json"
+    source.write_text(json.dumps(TOPICS), encoding="utf-8")
+    path = str(tmp_path / "kb.db")
+    build_sqlite_store(str(source), path).close()
+
+    # The database is read back by a fresh store, without the JSON file
+    store = SQLiteKnowledgeBaseStore(path)
+
+    assert store.list_topics() == ["frameworks", "mcp"]
+    assert store.get_subtopic("frameworks", "langchain") == TOPICS["frameworks"]["langchain"]
+    store.close()
+
+
+@pytest.fixture
+def knowledge_base(store):
+    tools.set_knowledge_base_store(store)
+    yield store
+    tools.set_knowledge_base_store(None)
+
+
+def test_tools_read_the_active_store(knowledge_base):
+    assert KnowledgeBaseTool.list_topics() == ["frameworks", "mcp"]
+    assert KnowledgeBaseTool.get_info("frameworks", "autogen") == {"autogen": TOPICS["frameworks"]["autogen"]}
+    assert KnowledgeBaseTool.get_info("missing") == {"error": "Topic 'missing' not found in knowledge base"}
+    assert KnowledgeBaseTool.search("agents") == {"frameworks": {"autogen": TOPICS["frameworks"]["autogen"]}}
+
+
+@pytest.mark.parametrize("name", ["get_info", "list_topics", "search"])
+def test_knowledge_base_tools_run_in_the_thread_pool(name):
+    assert getattr(getattr(KnowledgeBaseTool, name), TOOL_ATTRIBUTE).execution == THREAD
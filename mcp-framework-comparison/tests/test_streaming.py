@@ -0,0 +1,157 @@
+"""Tests for the streaming accumulators in mcp_server.streaming."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcp_server.streaming import CorrelationAccumulator, MomentAccumulator, TDigest
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(11)
+    values = rng.normal(1e6, 3.0, 5000)
+    values[::97] = np.nan
+    return values
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(5)
+    x = rng.normal(0, 1, 3000)
+    frame = pd.DataFrame({
+        "x": x,
+        "y": 2 * x + rng.normal(0, 0.5, 3000),
+        "z": rng.normal(100, 10, 3000)
+    })
+    frame.loc[::13, "y"] = np.nan
+    frame.loc[::29, "z"] = np.nan
+    return frame
+
+
+def chunks(array, size):
+    return [array[start:start + size] for start in range(0, len(array), size)]
+
+
+def assert_moments_equal(accumulator, expected):
+    assert accumulator.count == expected.count
+    assert accumulator.mean == pytest.approx(expected.mean, rel=1e-12)
+    assert accumulator.variance == pytest.approx(expected.variance, rel=1e-9)
+    assert accumulator.minimum == expected.minimum
+    assert accumulator.maximum == expected.maximum
+
+
+def test_single_pass_moments_match_numpy(values):
+    accumulator = MomentAccumulator()
+    accumulator.update(values)
+
+    present = values[~np.isnan(values)]
+    assert accumulator.count == present.size
+    assert accumulator.mean == pytest.approx(present.mean(), rel=1e-12)
+    assert accumulator.variance == pytest.approx(present.var(ddof=1), rel=1e-9)
+    assert accumulator.std == pytest.approx(present.std(ddof=1), rel=1e-9)
+    assert accumulator.minimum == present.min()
+    assert accumulator.maximum == present.max()
+
+
+@pytest.mark.parametrize("size", [1, 7, 250, 4999])
+def test_chunked_moments_match_single_pass(values, size):
+    single = MomentAccumulator()
+    single.update(values)
+
+    streamed = MomentAccumulator()
+    for chunk in chunks(values, size):
+        streamed.update(chunk)
+
+    assert_moments_equal(streamed, single)
+
+
+def test_merged_moments_match_single_pass(values):
+    single = MomentAccumulator()
+    single.update(values)
+
+    parts = []
+    for chunk in chunks(values, 600):
+        part = MomentAccumulator()
+        part.update(chunk)
+        parts.append(part)
+    merged = MomentAccumulator()
+    for part in reversed(parts):
+        merged.merge(part)
+
+    assert_moments_equal(merged, single)
+
+
+def test_empty_moments():
+    accumulator = MomentAccumulator()
+    accumulator.update(np.array([np.nan, np.nan]))
+    accumulator.merge(MomentAccumulator())
+
+    assert accumulator.count == 0
+    assert math.isnan(accumulator.variance)
+
+    accumulator.update(np.array([3.0]))
+    assert accumulator.mean == 3.0
+    assert math.isnan(accumulator.variance)
+
+
+@pytest.mark.parametrize("q", [0.01, 0.25, 0.5, 0.75, 0.99])
+def test_merged_digest_estimates_quantiles(q):
+    rng = np.random.default_rng(3)
+    values = rng.exponential(10.0, 20000)
+
+    merged = TDigest()
+    for chunk in chunks(values, 3000):
+        digest = TDigest()
+        digest.update(chunk)
+        merged.merge(digest)
+
+    assert merged.count == values.size
+    assert merged.quantile(q) == pytest.approx(np.quantile(values, q), rel=0.02)
+
+
+def test_digest_bounds_and_size():
+    values = np.arange(100000, dtype=np.float64)
+    digest = TDigest(compression=100)
+    for chunk in chunks(values, 10000):
+        digest.update(chunk)
+
+    assert digest.quantile(0.0) == 0.0
+    assert digest.quantile(1.0) == 99999.0
+    assert len(digest._means) <= 2 * digest.compression
+    assert math.isnan(TDigest().quantile(0.5))
+
+
+def test_correlation_matches_pandas_pairwise(table):
+    accumulator = CorrelationAccumulator(list(table.columns))
+    accumulator.update(table.to_numpy())
+
+    np.testing.assert_allclose(accumulator.matrix(), table.corr().to_numpy(), rtol=1e-9, atol=1e-12)
+    assert accumulator.correlation("x", "y") == pytest.approx(table["x"].corr(table["y"]), rel=1e-9)
+
+
+def test_merged_correlation_matches_single_pass(table):
+    columns = list(table.columns)
+    single = CorrelationAccumulator(columns)
+    single.update(table.to_numpy())
+
+    merged = CorrelationAccumulator(columns)
+    for chunk in chunks(table.to_numpy(), 700):
+        part = CorrelationAccumulator(columns)
+        part.update(chunk + 1000.0)
+        merged.merge(part)
+    shifted = CorrelationAccumulator(columns)
+    shifted.update(table.to_numpy() + 1000.0)
+
+    # Shifting the data does not change the correlation
+    np.testing.assert_allclose(merged.matrix(), single.matrix(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(merged.matrix(), shifted.matrix(), rtol=1e-9, atol=1e-12)
+
+
+def test_correlation_is_nan_with_fewer_than_two_rows():
+    accumulator = CorrelationAccumulator(["a", "b"])
+    accumulator.update(np.array([[1.0, 2.0]]))
+
+    assert np.isnan(accumulator.matrix()).all()
@@ -0,0 +1,136 @@
+"""Tests for keyword extraction and summarization in mcp_server.text."""
+
+import asyncio
+import json
+
+import pytest
+
+from mcp_server.cache import ResponseCache
+from mcp_server.server import MCPServer
+from mcp_server.text import (
+    FREQUENCY,
+    MIN_KEYWORD_LENGTH,
+    TFIDF,
+    count_words,
+    document_frequencies,
+    split_sentences,
+    summarize_stream,
+    summarize_text,
+    top_keywords,
+)
+
+
+TEXT = (
+    "The index keeps rows sorted. A sorted index answers range queries; "
+    "the index is rebuilt after appends. Rows are cheap."
+)
+
+
+def test_count_words_skips_stopwords_and_short_words():
+    counts = count_words(TEXT)
+
+    assert counts["index"] == 3
+    assert counts["rows"] == 2
+    assert "the" not in counts and "are" not in counts
+    assert min(len(word) for word in counts) == MIN_KEYWORD_LENGTH
+
+
+def test_frequency_keywords_keep_the_order_of_first_occurrence_on_ties():
+    assert top_keywords(TEXT, 3) == [
+        {"word": "index", "frequency": 3},
+        {"word": "rows", "frequency": 2},
+        {"word": "sorted", "frequency": 2}
+    ]
+
+
+def test_tfidf_keywords_rank_words_common_to_the_corpus_lower():
+    corpus = document_frequencies(["the index is fast", "an index of rows", "sorted rows"])
+
+    assert corpus[1] == 3
+    assert top_keywords(TEXT, 3, TFIDF, corpus) == [
+        {"word": "index", "frequency": 3, "score": 3.863},
+        {"word": "sorted", "frequency": 2, "score": 3.3863},
+        {"word": "rows", "frequency": 2, "score": 2.5754}
+    ]
+
+
+def test_unknown_keyword_modes_are_rejected():
+    with pytest.raises(ValueError, match="Unknown keyword mode 'rake'"):
+        top_keywords(TEXT, mode="rake")
+
+
+ARTICLE = """Caching speeds up repeated tool calls. The cache stores serialized responses for each tool call.
+Entries expire after a time to live.  The weather was nice.
+```
+cache = ResponseCache()
+```
+1. Responses are keyed by tool name and arguments. The cache stores responses per tool call."""
+
+
+def test_sentences_skip_code_blocks_and_list_numbers():
+    assert split_sentences(ARTICLE) == [
+        "Caching speeds up repeated tool calls.",
+        "The cache stores serialized responses for each tool call.",
+        "Entries expire after a time to live.",
+        "The weather was nice.",
+        "1. Responses are keyed by tool name and arguments.",
+        "The cache stores responses per tool call."
+    ]
+
+
+def test_summary_keeps_the_most_central_sentences_in_text_order():
+    summary = summarize_text(ARTICLE, max_words=20)
+
+    assert summary == (
+        "The cache stores serialized responses for each tool call. "
+        "The weather was nice. "
+        "The cache stores responses per tool call."
+    )
+    assert len(summary.split()) <= 20
+
+
+def test_texts_within_the_budget_are_returned_unchanged():
+    assert summarize_text("Short text.", max_words=5) == "Short text."
+
+
+def test_repeated_sentences_are_picked_once():
+    text = " ".join(["The cache stores responses per tool call."] * 5 + ["Entries expire after a time to live."])
+
+    assert summarize_text(text, max_words=20) == (
+        "The cache stores responses per tool call. Entries expire after a time to live."
+    )
+
+
+def test_streamed_summary_matches_the_whole_text():
+    pieces = [ARTICLE[start:start + 50] for start in range(0, len(ARTICLE), 50)]
+
+    assert summarize_stream(pieces, max_words=20) == summarize_text(ARTICLE, max_words=20)
+
+
+@pytest.fixture
+def server():
+    server = MCPServer(response_cache=ResponseCache())
+    yield server
+    server.executor.shutdown()
+
+
+def call(server, name, arguments):
+    binding = server.tool_registry.get(name)
+    _, payload = asyncio.run(server._run_tool(binding, arguments))
+    return json.loads(payload)
+
+
+def test_null_keyword_arguments_take_their_defaults(server):
+    arguments = {"text": TEXT, "max_keywords": None, "mode": None}
+
+    result = call(server, "document_processing_extract_keywords", arguments)
+
+    assert result["keywords"] == top_keywords(TEXT, 5, FREQUENCY)
+
+
+def test_null_summary_length_takes_its_default(server):
+    text = " ".join(f"Sentence number {i} talks about tool calls." for i in range(40))
+
+    result = call(server, "document_processing_summarize", {"text": text, "max_length": None})
+
+    assert result["summary"] == summarize_text(text)
@@ -0,0 +1,140 @@
+"""Tests for shared datasets and pre-forked workers in mcp_server.shared_data and mcp_server.workers."""
+
+import glob
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from mcp_server.shared_data import MANIFEST_FILE, attach_frame, publish_frame, remove_published
+from mcp_server.tools import DataAnalysisTool
+
+# Directory holding run_server.py
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "x": np.linspace(0, 1, 50),
+        "n": np.arange(50, dtype=np.int32),
+        "flag": np.arange(50) % 3 == 0,
+        "when": pd.date_range("2024-01-01", periods=50, freq="h"),
+        "label": [f"row {i}" for i in range(50)]
+    })
+
+
+def mapped_base(values):
+    base = values
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    return base
+
+
+def test_attached_frames_equal_the_published_frame(frame, tmp_path):
+    directory = publish_frame(frame, str(tmp_path / "published"))
+
+    attached = attach_frame(directory)
+
+    assert attached.equals(frame)
+    assert list(attached.dtypes)[:4] == list(frame.dtypes)[:4]
+
+
+def test_numeric_columns_are_read_only_mappings(frame, tmp_path):
+    directory = publish_frame(frame, str(tmp_path / "published"))
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    attached = attach_frame(directory)
+
+    assert manifest["rows"] == 50
+    assert [column["shared"] for column in manifest["columns"]] == [True, True, True, True, False]
+    for column in ("x", "n", "flag", "when"):
+        values = attached[column].to_numpy()
+        assert mapped_base(values) is not None
+        assert not values.flags.writeable
+    assert mapped_base(attached["label"].to_numpy()) is None
+
+
+def test_publishing_defaults_to_a_new_temporary_directory(frame):
+    directory = publish_frame(frame)
+
+    try:
+        assert os.path.basename(directory).startswith("mcp-dataset-")
+        if os.path.isdir("/dev/shm"):
+            assert directory.startswith("/dev/shm/")
+        assert len(attach_frame(directory)) == 50
+    finally:
+        remove_published(directory)
+
+    assert not os.path.exists(directory)
+    # Removing a directory twice is harmless
+    remove_published(directory)
+
+
+def published_directories():
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return set(glob.glob(os.path.join(root, "mcp-dataset-*")))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_workers_serve_the_shared_dataset_statelessly():
+    before = published_directories()
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "run_server.py", "--transport", "http", "--port", str(port), "--workers", "2",
+         "--json-response"],
+        cwd=PROJECT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    call = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "data_analysis_get_summary_statistics", "arguments": {"column": "temperature"}}
+    }
+    headers = {"Accept": "application/json, text/event-stream"}
+    url = f"http://127.0.0.1:{port}/mcp/"
+
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                response = httpx.post(url, json=call, headers=headers, timeout=5)
+                response.raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    pytest.fail("The workers did not start")
+                time.sleep(0.2)
+        published = published_directories() - before
+        results = [
+            httpx.post(url, json=call, headers=headers, timeout=5).json()
+            for _ in range(4)
+        ]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    expected = json.loads(json.dumps(DataAnalysisTool.get_summary_statistics("temperature")))
+    assert len(published) == 1
+    for result in [response.json()] + results:
+        assert json.loads(result["result"]["content"][0]["text"]) == pytest.approx(expected)
+    # The parent removes the published columns when it stops
+    assert not published & published_directories()